@@ -8,6 +8,13 @@ Purpose: This Python script provides access to secure information and system det
 * Retrieves the user's home directory.
 * Retrieves the system username.
 * Retrieves the directory structure from 1Password.
+* Caches the 1Password item in-process so repeated lookups in one run never start `op` again.
+* Decodes every JSON-valued field of the item in one pass with `load_all_structures()`.
+* Optionally reads the structures from an encrypted on-disk snapshot (see `secret_snapshot.py`) instead of calling `op`.
+* Provides asyncio variants (`load_all_structures_async()`, `get_chronos_directory_structure_async()`) so the
+  1Password lookup can overlap with other start-up work. Concurrent async callers share one fetch, and the cache
+  lock is only taken in worker threads, never on the event loop.
+* Reads the structures through a pluggable backend (1Password, a local JSON file or environment variables, see `secret_backends.py`).
 
 **Benefits:**
 
@@ -20,6 +27,11 @@ Purpose: This Python script provides access to secure information and system det
 2. Call the `get_user_directory()` function to retrieve the user's home directory.
 3. Call the `get_system_username()` function to retrieve the system username.
 4. Call the `get_chronos_directory_structure()` function to retrieve the directory structure from 1Password.
+5. Call the `load_all_structures()` function to retrieve every structure (keyed by its 1Password label) from one fetch.
+6. Call `set_cache_ttl()` to change how long the 1Password item is cached (CHRONOS_SECRET_CACHE_TTL, default 300 seconds),
+   `invalidate_cache()` to force the next lookup to call `op` again and `get_cache_stats()` to read the hit/miss counters.
+7. Await `get_chronos_directory_structure_async()` inside an event loop to run the lookup concurrently with other I/O.
+8. Set CHRONOS_SECRET_BACKEND (op, json or env) or call `set_secret_backend()` to read the structures without 1Password.
 
 **Usage:**
 
@@ -28,15 +40,34 @@ import all_access
 user_home = all_access.get_user_directory()
 system_username = all_access.get_system_username()
 directory_structure = all_access.get_chronos_directory_structure()
+all_structures = all_access.load_all_structures()
 
 Author: Beau Magnum
 
 Date: 2024-04-03
 
 """
+import asyncio
+import copy
 import json
 import os
 import subprocess
+import threading
+import time
+from Security import secret_backends # 1Password, JSON-file and environment-variable sources for the structures
+from Security import secret_snapshot # Encrypted on-disk copy of the resolved structures, enabled by CHRONOS_SNAPSHOT_KEY
+from Utilities.environment_settings import float_setting # An invalid CHRONOS_SECRET_CACHE_TTL falls back to the default instead of failing the import
+from Utilities.subprocess_runner import StageBudgetExceeded # Raised when 'op' does not answer within its time budget
+
+# --- In-process cache for the 1Password item ---
+# Every lookup used to spawn its own 'op item get', which can take a second or more and trigger a biometric prompt.
+CACHE_TTL_SECONDS = float_setting('CHRONOS_SECRET_CACHE_TTL', 300) # How long the fetched item stays valid, None or 0 disables expiry/caching
+
+_cache_lock = threading.Lock() # Held while fetching so concurrent callers wait for one 'op' call instead of starting their own
+_cache = {'structures': None, 'expires_at': 0.0}
+_cache_stats = {'hits': 0, 'misses': 0}
+_async_fetches = {} # Event loop -> the fetch task its async callers share
+_backend = None # Selected lazily from CHRONOS_SECRET_BACKEND unless set_secret_backend() is called
 
 def get_user_directory():
     return os.path.expanduser("~") 
@@ -45,34 +76,130 @@ def get_system_username():
     home_directory = get_user_directory()
     return os.path.basename(home_directory)
 
+def set_cache_ttl(seconds):
+    global CACHE_TTL_SECONDS
+    CACHE_TTL_SECONDS = seconds # None keeps the item for the lifetime of the process, 0 disables the cache
+    invalidate_cache()
+
+def invalidate_cache():
+    with _cache_lock:
+        _cache['structures'] = None
+        _cache['expires_at'] = 0.0
+
+def get_cache_stats():
+    with _cache_lock:
+        return dict(_cache_stats, cached=_cache['structures'] is not None)
+
+def set_secret_backend(backend):
+    global _backend
+    _backend = secret_backends.get_backend(backend) if isinstance(backend, str) or backend is None else backend
+    invalidate_cache() # Structures cached from the previous backend must not leak into the new one
+
+def get_secret_backend():
+    global _backend
+    if _backend is None:
+        _backend = secret_backends.get_backend()
+    return _backend
+
+def _resolve_placeholders(structures):
+    # Replace the placeholder with the actual user's home directory.
+    user_home = get_user_directory()
+    for details in structures.values():
+        for key, value in details.items():
+            if isinstance(value, str):
+                details[key] = value.replace('{home_directory}', user_home.strip('/'))
+    return structures
+
+def _fetch_structures(backend):
+    return _resolve_placeholders(backend.fetch_structures()) # Decoded once per fetch, not once per lookup
+
+def _cache_is_fresh(now):
+    return _cache['structures'] is not None and (CACHE_TTL_SECONDS is None or now < _cache['expires_at'])
+
+def _store_in_cache(structures, now):
+    if CACHE_TTL_SECONDS is None or CACHE_TTL_SECONDS > 0:
+        _cache['structures'] = structures
+        _cache['expires_at'] = now + (CACHE_TTL_SECONDS or 0)
+
+def load_all_structures():
+    with _cache_lock:
+        now = time.monotonic()
+        if _cache_is_fresh(now):
+            _cache_stats['hits'] += 1
+            return copy.deepcopy(_cache['structures']) # Callers may edit their copy without touching the cache
+
+        _cache_stats['misses'] += 1
+        # Errors propagate without caching anything, so the next call retries
+        backend = get_secret_backend()
+        if backend.use_snapshot:
+            structures = secret_snapshot.load_or_refresh(lambda: _fetch_structures(backend)) # Only calls 'op' when the snapshot is disabled, stale or missing
+        else:
+            structures = _fetch_structures(backend) # Local backends are already fast, no snapshot needed
+        _store_in_cache(structures, now)
+        return copy.deepcopy(structures)
+
+def _load_fresh_from_cache():
+    with _cache_lock:
+        if _cache_is_fresh(time.monotonic()):
+            _cache_stats['hits'] += 1
+            return copy.deepcopy(_cache['structures'])
+        return None
+
+def _store_fetched(structures, now):
+    with _cache_lock:
+        _cache_stats['misses'] += 1
+        _store_in_cache(structures, now)
+
+async def _fetch_structures_async():
+    backend = get_secret_backend()
+    if backend.use_snapshot and secret_snapshot.is_snapshot_enabled():
+        return await asyncio.to_thread(load_all_structures) # The snapshot refresh blocks on a file lock, keep it off the event loop
+
+    now = time.monotonic()
+    structures = _resolve_placeholders(await backend.fetch_structures_async())
+    await asyncio.to_thread(_store_fetched, structures, now) # _cache_lock is a threading lock, never wait on it on the event loop
+    return structures
+
+async def load_all_structures_async():
+    structures = await asyncio.to_thread(_load_fresh_from_cache)
+    if structures is not None:
+        return structures
+
+    # Concurrent callers on one event loop await the same fetch instead of each starting an 'op' call of their own
+    loop = asyncio.get_running_loop()
+    fetch = _async_fetches.get(loop)
+    if fetch is None:
+        fetch = _async_fetches[loop] = loop.create_task(_fetch_structures_async())
+        fetch.add_done_callback(lambda _: _async_fetches.pop(loop, None)) # Errors are not kept, so the next call retries
+    return copy.deepcopy(await asyncio.shield(fetch)) # A cancelled caller does not cancel the fetch the others wait for
+
+def _select_structure(structures, structure_type):
+    if structure_type not in structures: # 'label' is the named used by 1Password Beau set the label to 'directories_and_files'
+        raise ValueError(f"Directory and file names not found for {structure_type} in the '{get_secret_backend().name}' secret backend.")
+    return structures[structure_type]
+
+def _report_lookup_error(error):
+    if isinstance(error, StageBudgetExceeded):
+        print(f"Error retrieving directory structure: {error}")
+    elif isinstance(error, subprocess.CalledProcessError):
+        print(f"Error retrieving directory structure from 1Password: {error}")
+    elif isinstance(error, json.JSONDecodeError):
+        print(f"Error parsing JSON data: {error}")
+    elif isinstance(error, OSError):
+        print(f"Error reading directory structure: {error}")
+    else:
+        print(error)
+
 def get_chronos_directory_structure(structure_type):
     try:
-        # Retrieve the secure note from 1Password
-        output = subprocess.check_output(
-            ["op", "item", "get", "chronos_script_data", "--format=json"],
-            text=True
-        )
-        
-        data = json.loads(output) # Load the JSON data from 1Password's secure note
-
-        # Parse the details from the 1Password's secure note. If ADDING ADDITIONAL FIELDS to chronos_script_data, this is the code that needs to be reproduced 
-        for field in data.get('fields', []):
-            if field.get('label') == structure_type: # 'label' is the named used by 1Password Beau set the label to 'directories_and_files'
-                details = json.loads(field['value'])
-                break
-        else:
-            raise ValueError("Directory and file names not found for {structure_type} in 1Password's secure note.")
-        
-        # Replace the placeholder with the actual user's home directory.
-        user_home = get_user_directory()
-        for key, value in details.items():
-            details[key] = value.replace('{home_directory}', user_home.strip('/'))
-        
-        return details
-    except subprocess.CalledProcessError as e:
-        print(f"Error retrieving directory structure from 1Password: {e}")
-    except json.JSONDecodeError as e:
-        print(f"Error parsing JSON data: {e}")
-    except ValueError as e:
-        print(e)
+        structures = load_all_structures() # If ADDING ADDITIONAL FIELDS to chronos_script_data, they are picked up here automatically
+        return _select_structure(structures, structure_type)
+    except (subprocess.SubprocessError, OSError, ValueError) as e: # json.JSONDecodeError is a ValueError
+        _report_lookup_error(e)
 
+async def get_chronos_directory_structure_async(structure_type):
+    try:
+        structures = await load_all_structures_async()
+        return _select_structure(structures, structure_type)
+    except (subprocess.SubprocessError, OSError, ValueError) as e:
+        _report_lookup_error(e)
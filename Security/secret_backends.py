@@ -0,0 +1,130 @@
+"""
+File Name: secret_backends.py
+
+Purpose: Interchangeable sources for the chronos directory structures, so the converters can run (and be
+benchmarked) on machines without 1Password.
+
+**Functionality:**
+
+* `OnePasswordBackend` - the original `op item get chronos_script_data` lookup.
+* `JsonFileBackend` - reads a local JSON file, either a `{label: structure}` mapping or an exported 1Password item.
+* `EnvironmentBackend` - reads one JSON structure per CHRONOS_SECRET_<LABEL> environment variable.
+* Every backend can also be awaited with `fetch_structures_async()`; the 1Password one uses asyncio subprocesses.
+* `get_backend()` selects one from configuration (CHRONOS_SECRET_BACKEND = op | json | env, default op).
+
+**Instructions:**
+
+1. For the JSON backend set CHRONOS_SECRET_BACKEND=json and CHRONOS_SECRET_FILE=/path/to/structures.json.
+2. For the environment backend set CHRONOS_SECRET_BACKEND=env and, for example,
+   CHRONOS_SECRET_CODEBASE_DIRECTORIES_AND_FILES='{"local_codebase_directory": "...", "output_pdf": "..."}'.
+3. `all_access.set_secret_backend()` overrides the configured backend from Python.
+
+Author: Beau Magnum
+
+Date: 2026-10-18
+
+"""
+import asyncio
+import json
+from abc import ABC, abstractmethod
+import os
+import subprocess
+import sys
+from Utilities.subprocess_runner import run_command, run_command_async # Timeouts and retries for the 'op' call
+
+OP_TIMEOUT_SECONDS = 60 # Long enough for a biometric prompt, short enough to notice a hung 'op'
+
+class SecretBackend(ABC):
+    name = 'base'
+    use_snapshot = False # Only slow backends are worth mirroring into the encrypted snapshot
+
+    @abstractmethod
+    def fetch_structures(self):
+        # Returns {label: structure} with the '{home_directory}' placeholders still in place
+        ...
+
+    async def fetch_structures_async(self):
+        return await asyncio.to_thread(self.fetch_structures) # Local backends only do quick file or environment reads
+
+def decode_item_fields(data):
+    # Every field of a 1Password item whose value is a JSON object is a structure, keyed by its 'label'
+    structures = {}
+    for field in data.get('fields', []):
+        label, value = field.get('label'), field.get('value')
+        if not label or not isinstance(value, str) or not value.lstrip().startswith('{'):
+            continue # Plain fields (notes, passwords, ...) are not directory structures
+        decode_structure(structures, label, value)
+    return structures
+
+def decode_structure(structures, label, value):
+    # A field that only looks like JSON (a note starting with '{') is skipped, so it cannot break every other lookup
+    try:
+        structures[label] = json.loads(value)
+    except ValueError as e:
+        print(f"Warning: skipping secret field '{label}', it is not valid JSON: {e}", file=sys.stderr)
+
+class OnePasswordBackend(SecretBackend):
+    name = 'op'
+    use_snapshot = True
+
+    def __init__(self, item_name='chronos_script_data'):
+        self.item_name = item_name
+
+    def fetch_structures(self):
+        # Retrieve the secure note from 1Password
+        output = run_command(
+            ["op", "item", "get", self.item_name, "--format=json"],
+            stage="1Password lookup", timeout=OP_TIMEOUT_SECONDS, retries=1,
+            stdout=subprocess.PIPE, text=True, check=True
+        ).stdout
+        return decode_item_fields(json.loads(output)) # Load the JSON data from 1Password's secure note
+
+    async def fetch_structures_async(self):
+        _, output, _ = await run_command_async(
+            ["op", "item", "get", self.item_name, "--format=json"],
+            stage="1Password lookup", timeout=OP_TIMEOUT_SECONDS, retries=1, check=True
+        )
+        return decode_item_fields(json.loads(output))
+
+class JsonFileBackend(SecretBackend):
+    name = 'json'
+
+    def __init__(self, path=None):
+        self.path = path or os.environ.get('CHRONOS_SECRET_FILE')
+        if not self.path:
+            raise ValueError("The JSON secret backend needs a file path (set CHRONOS_SECRET_FILE).")
+
+    def fetch_structures(self):
+        with open(os.path.expanduser(self.path), 'r') as file:
+            data = json.load(file)
+        if not isinstance(data, dict):
+            raise ValueError(f"{self.path} must hold a JSON object ({{label: structure}} or a 1Password item), not {type(data).__name__}.")
+        if isinstance(data.get('fields'), list): # An item exported with 'op item get ... --format=json'
+            return decode_item_fields(data)
+        return data
+
+class EnvironmentBackend(SecretBackend):
+    name = 'env'
+
+    def __init__(self, prefix='CHRONOS_SECRET_'):
+        self.prefix = prefix
+
+    def fetch_structures(self):
+        structures = {}
+        for variable, value in os.environ.items():
+            label = variable[len(self.prefix):].lower()
+            if variable.startswith(self.prefix) and value.lstrip().startswith('{'): # Skips settings such as CHRONOS_SECRET_FILE
+                decode_structure(structures, label, value)
+        return structures
+
+BACKENDS = {
+    OnePasswordBackend.name: OnePasswordBackend,
+    JsonFileBackend.name: JsonFileBackend,
+    EnvironmentBackend.name: EnvironmentBackend,
+}
+
+def get_backend(name=None):
+    name = name or os.environ.get('CHRONOS_SECRET_BACKEND', OnePasswordBackend.name)
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown secret backend '{name}', expected one of: {', '.join(BACKENDS)}")
+    return BACKENDS[name]()
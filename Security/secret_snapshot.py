@@ -0,0 +1,111 @@
+"""
+File Name: secret_snapshot.py
+
+Purpose: Keeps an encrypted on-disk snapshot of the directory structures resolved from 1Password, so scheduled
+runs of the chronos converters can start without waiting on the 1Password CLI.
+
+**Functionality:**
+
+* Encrypts the resolved structures with `openssl enc -aes-256-cbc -pbkdf2`, keyed by the CHRONOS_SNAPSHOT_KEY
+  environment variable. Without that variable the snapshot is disabled and every run asks 1Password as before.
+* Stores an expiry time inside the encrypted payload (CHRONOS_SNAPSHOT_TTL, default 86400 seconds).
+* Refreshes a stale or missing snapshot under a cross-process file lock, so concurrent runs do not all call `op`.
+
+**Instructions:**
+
+1. Set CHRONOS_SNAPSHOT_KEY (for example from your shell profile or the scheduler's environment).
+2. Optionally set CHRONOS_SNAPSHOT_PATH to move the snapshot away from ~/.chronos/secret_snapshot.enc.
+3. `all_access.load_all_structures()` uses the snapshot automatically; call `delete_snapshot()` to force a refresh.
+
+Author: Beau Magnum
+
+Date: 2026-10-18
+
+"""
+import contextlib
+import fcntl
+import json
+import os
+import subprocess
+import time
+from Utilities.environment_settings import float_setting # An invalid CHRONOS_SNAPSHOT_TTL falls back to the default instead of failing the import
+from Utilities.subprocess_runner import run_command
+
+SNAPSHOT_KEY_VARIABLE = 'CHRONOS_SNAPSHOT_KEY' # Name of the environment variable holding the passphrase, never the passphrase itself
+SNAPSHOT_TTL_SECONDS = float_setting('CHRONOS_SNAPSHOT_TTL', 86400)
+
+def get_snapshot_path():
+    default_path = os.path.join(os.path.expanduser("~"), '.chronos', 'secret_snapshot.enc')
+    return os.environ.get('CHRONOS_SNAPSHOT_PATH', default_path)
+
+def is_snapshot_enabled():
+    return bool(os.environ.get(SNAPSHOT_KEY_VARIABLE))
+
+def _openssl(arguments, payload):
+    # The passphrase is handed over through the environment ('env:'), so it never appears in the process list
+    command = ["openssl", "enc", "-aes-256-cbc", "-pbkdf2", "-salt", "-pass", f"env:{SNAPSHOT_KEY_VARIABLE}"] + arguments
+    return run_command(command, stage="secret snapshot encryption", timeout=30, input=payload, capture_output=True, check=True).stdout
+
+def read_snapshot():
+    # Returns the structures stored in the snapshot, or None if it is disabled, missing, unreadable or expired
+    path = get_snapshot_path()
+    if not is_snapshot_enabled() or not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'rb') as file:
+            payload = json.loads(_openssl(["-d"], file.read()))
+    except (OSError, subprocess.SubprocessError, json.JSONDecodeError) as e: # SubprocessError covers StageBudgetExceeded
+        print(f"Ignoring unreadable secret snapshot {path}: {e}")
+        return None
+    if payload.get('expires_at', 0) <= time.time():
+        return None
+    return payload['structures']
+
+def write_snapshot(structures):
+    path = get_snapshot_path()
+    os.makedirs(os.path.dirname(path), mode=0o700, exist_ok=True)
+    payload = json.dumps({'expires_at': time.time() + SNAPSHOT_TTL_SECONDS, 'structures': structures}).encode()
+    encrypted = _openssl([], payload)
+
+    # Write to a private temporary file and rename it, so readers never see a half-written snapshot
+    temporary_path = f"{path}.{os.getpid()}.tmp"
+    file_descriptor = os.open(temporary_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(file_descriptor, 'wb') as file:
+        file.write(encrypted)
+    os.replace(temporary_path, path)
+
+def delete_snapshot():
+    with contextlib.suppress(FileNotFoundError):
+        os.remove(get_snapshot_path())
+
+@contextlib.contextmanager
+def snapshot_lock():
+    # Exclusive advisory lock shared by every process using the same snapshot path
+    lock_path = get_snapshot_path() + '.lock'
+    os.makedirs(os.path.dirname(lock_path), mode=0o700, exist_ok=True)
+    with open(lock_path, 'w') as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+def load_or_refresh(refresh):
+    # 'refresh' is called (at most once across concurrent runs) when the snapshot is stale or missing
+    if not is_snapshot_enabled():
+        return refresh()
+
+    structures = read_snapshot()
+    if structures is not None:
+        return structures
+
+    with snapshot_lock():
+        structures = read_snapshot() # Another run may have refreshed the snapshot while we waited for the lock
+        if structures is not None:
+            return structures
+        structures = refresh()
+        try:
+            write_snapshot(structures)
+        except (OSError, subprocess.SubprocessError) as e:
+            print(f"Error writing secret snapshot: {e}") # The run can still continue with the fresh structures
+        return structures
@@ -0,0 +1,41 @@
+"""
+File Name: environment_settings.py
+
+Purpose: Reads numeric settings (time-to-live, deadlines, limits) from environment variables without letting a
+typo crash every script that imports the module reading them.
+
+**Functionality:**
+
+* `float_setting()` returns the variable as a number, or the default when it is unset or empty.
+* A value that is not a number, or is negative, is reported once with the variable name and the default is used.
+
+**Instructions:**
+
+1. `CACHE_TTL_SECONDS = float_setting('CHRONOS_SECRET_CACHE_TTL', 300)`
+
+Author: Beau Magnum
+
+Date: 2026-10-18
+
+"""
+import math
+import os
+import sys
+
+_reported = set() # (variable, value) pairs already warned about; limits are read again for every command
+def float_setting(variable, default):
+    value = os.environ.get(variable, '').strip()
+    if not value:
+        return default
+    try:
+        number = float(value)
+    except ValueError:
+        number = None
+    if number is None or math.isnan(number) or number < 0:
+        if (variable, value) in _reported:
+            return default
+        _reported.add((variable, value))
+        fallback = 'leaving it unset' if default is None else f"using {default}"
+        print(f"Warning: ignoring {variable}={value!r}, expected a non-negative number; {fallback}", file=sys.stderr)
+        return default
+    return number
@@ -0,0 +1,142 @@
+"""
+File Name: subprocess_runner.py
+
+Purpose: One place to start external programs (`op`, `git`, `pandoc`, `openssl`) with a time budget, so a stalled
+network pull or conversion can no longer block a scheduled job forever.
+
+**Functionality:**
+
+* Applies a per-call timeout and an overall run deadline (CHRONOS_RUN_DEADLINE seconds, unset = no deadline).
+* Retries failed or timed-out calls with exponential backoff, without ever sleeping past the deadline. `retry_if`
+  limits the retries to the failures that can go away (a network error rather than a merge conflict).
+* Optionally caps the child's memory and CPU time (CHRONOS_SUBPROCESS_MEMORY_MB, CHRONOS_SUBPROCESS_CPU_SECONDS,
+  or per call). The caps are set by `ulimit -v` / `ulimit -t` in a /bin/sh that then execs the command, not by a
+  preexec_fn, so no Python code runs between fork and exec and the runner is safe to call from worker threads.
+* An invalid CHRONOS_RUN_DEADLINE or limit is reported and ignored instead of failing every import.
+* Raises `StageBudgetExceeded`, naming the stage and the budget it ran out of, when a call cannot finish in time.
+
+**Instructions:**
+
+1. Call `run_command([...], stage="git pull", timeout=300, retries=2, retry_if=is_transient_git_error, check=True)` instead of `subprocess.run`.
+2. Await `run_command_async(...)` from asyncio code; it returns (returncode, stdout, stderr).
+3. Call `set_run_deadline(seconds)` at the start of a run to bound the whole run.
+
+Author: Beau Magnum
+
+Date: 2026-10-18
+
+"""
+import asyncio
+import os
+import subprocess
+import time
+from Utilities.environment_settings import float_setting # A typo in a deadline or limit is reported instead of breaking the import
+
+class StageBudgetExceeded(subprocess.SubprocessError):
+    def __init__(self, stage, reason, elapsed):
+        self.stage = stage
+        self.reason = reason
+        self.elapsed = elapsed
+        super().__init__(f"Stage '{stage}' exceeded its budget after {elapsed:.1f}s: {reason}")
+
+class RunBudget:
+    def __init__(self, total_seconds=None):
+        self.started_at = time.monotonic()
+        self.deadline = self.started_at + total_seconds if total_seconds else None
+
+    def remaining(self):
+        if self.deadline is None:
+            return None
+        return self.deadline - time.monotonic()
+
+_run_budget = RunBudget(float_setting('CHRONOS_RUN_DEADLINE', None))
+
+def set_run_deadline(seconds):
+    global _run_budget
+    _run_budget = RunBudget(seconds) # Counts from now, None removes the deadline
+    return _run_budget
+
+def get_run_budget():
+    return _run_budget
+
+def _limit_resources(command, memory_limit_mb, cpu_limit_seconds):
+    # Returns the command wrapped in a shell that sets the caps and execs it, or the command itself when there is nothing to cap
+    memory_limit_mb = memory_limit_mb or float_setting('CHRONOS_SUBPROCESS_MEMORY_MB', None)
+    cpu_limit_seconds = cpu_limit_seconds or float_setting('CHRONOS_SUBPROCESS_CPU_SECONDS', None)
+    if os.name != 'posix' or not (memory_limit_mb or cpu_limit_seconds):
+        return list(command) # The limits are skipped where there is no POSIX shell
+    limits = []
+    if memory_limit_mb:
+        limits.append(f"ulimit -v {int(memory_limit_mb * 1024)}") # In KiB
+    if cpu_limit_seconds:
+        limits.append(f"ulimit -t {max(1, int(cpu_limit_seconds))}")
+    return ["/bin/sh", "-c", ' && '.join(limits) + ' && exec "$@"', "sh", *command] # The command is passed as arguments, never parsed by the shell; a missing program exits with 127
+
+def _attempt_timeout(stage, timeout, budget, started_at):
+    # The timeout for the next attempt is the per-call timeout, cut short by whatever is left of the run deadline
+    remaining = budget.remaining()
+    if remaining is not None and remaining <= 0:
+        raise StageBudgetExceeded(stage, "the run deadline was reached", time.monotonic() - started_at)
+    if timeout is None:
+        return remaining
+    return timeout if remaining is None else min(timeout, remaining)
+
+def _backoff_delay(backoff, attempt, budget):
+    delay = backoff * (2 ** attempt)
+    remaining = budget.remaining()
+    return delay if remaining is None else max(0.0, min(delay, remaining))
+
+def _should_retry(error, retry_if):
+    # Timeouts are always worth another attempt; a failed command only when retry_if (None = every failure) says so
+    return not isinstance(error, subprocess.CalledProcessError) or retry_if is None or retry_if(error)
+
+def run_command(command, *, stage, timeout=None, retries=0, backoff=1.0, retry_if=None, memory_limit_mb=None,
+                cpu_limit_seconds=None, budget=None, check=False, **kwargs):
+    # Extra keyword arguments (cwd, input, stdout, text, ...) are passed straight to subprocess.run
+    budget = budget or _run_budget
+    limited_command = _limit_resources(command, memory_limit_mb, cpu_limit_seconds)
+    started_at = time.monotonic()
+    for attempt in range(retries + 1):
+        attempt_timeout = _attempt_timeout(stage, timeout, budget, started_at)
+        try:
+            return subprocess.run(limited_command, timeout=attempt_timeout, check=check, **kwargs)
+        except subprocess.TimeoutExpired:
+            error = StageBudgetExceeded(stage, f"no result within {attempt_timeout:.1f}s (attempt {attempt + 1} of {retries + 1})",
+                                        time.monotonic() - started_at)
+        except subprocess.CalledProcessError as e:
+            e.cmd = command # Not the ulimit wrapper
+            error = e # Handed back to the caller's own error handling once the retries are used up
+        if not _should_retry(error, retry_if):
+            break # A deterministic failure fails the same way on every attempt
+        if attempt < retries:
+            time.sleep(_backoff_delay(backoff, attempt, budget))
+    raise error
+
+async def run_command_async(command, *, stage, timeout=None, retries=0, backoff=1.0, retry_if=None, memory_limit_mb=None,
+                            cpu_limit_seconds=None, budget=None, check=False, input=None):
+    # asyncio twin of run_command, always captures the output and returns (returncode, stdout, stderr)
+    budget = budget or _run_budget
+    limited_command = _limit_resources(command, memory_limit_mb, cpu_limit_seconds)
+    started_at = time.monotonic()
+    for attempt in range(retries + 1):
+        attempt_timeout = _attempt_timeout(stage, timeout, budget, started_at)
+        process = await asyncio.create_subprocess_exec(
+            *limited_command, stdin=asyncio.subprocess.PIPE if input is not None else None,
+            stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE)
+        try:
+            stdout, stderr = await asyncio.wait_for(process.communicate(input), attempt_timeout)
+            if check and process.returncode != 0:
+                raise subprocess.CalledProcessError(process.returncode, command, stdout, stderr)
+            return process.returncode, stdout, stderr
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+            error = StageBudgetExceeded(stage, f"no result within {attempt_timeout:.1f}s (attempt {attempt + 1} of {retries + 1})",
+                                        time.monotonic() - started_at)
+        except subprocess.CalledProcessError as e:
+            error = e
+        if not _should_retry(error, retry_if):
+            break # A deterministic failure fails the same way on every attempt
+        if attempt < retries:
+            await asyncio.sleep(_backoff_delay(backoff, attempt, budget))
+    raise error
@@ -0,0 +1,136 @@
+"""
+File Name: __main__.py
+
+Purpose: One entry point for both Chronos exports. Running `python -m chronos` replaces launching
+`convert_codeBase-to-pdf.py` and `convert_wiki-to-pdf.py` as two processes, each with its own start-up,
+1Password fetch and serial `git pull`.
+
+**Functionality:**
+
+* Fetches the secret structures once, while reportlab and pandoc warm up.
+* Runs the codebase and wiki pipelines in two worker threads: each pulls its repository and then renders it,
+  so the two pulls run at the same time and one render can start while the other repository is still pulling.
+* Prints one timing summary for the whole run.
+
+**Instructions:**
+
+1. From the repository root: `python -m chronos`
+2. `--only codebase` or `--only wiki` runs one pipeline; the codebase options match `convert_codeBase-to-pdf.py`.
+
+Author: Beau Magnum
+
+Date: 2026-10-18
+
+"""
+import argparse # Allows python to read the command-line options
+import asyncio # Allows python to run the secret lookup and the warm-ups at the same time
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor # The converters are re-entrant, so both pipelines share this process
+from chronos.codebase_converter import CodebaseOptions, build_codebase, get_latest_codebase_content, unsupported_options_error, warm_up_reportlab
+from chronos.wiki_converter import WikiConversionError, WikiOptions, build_wiki, get_latest_wiki_content, warm_up_pandoc
+from Security.all_access import load_all_structures_async # One fetch for both pipelines
+
+PIPELINES = ('codebase', 'wiki')
+
+async def prepare_run(pipelines):
+    async def timed_structures():
+        started_at = time.perf_counter()
+        structures = await load_all_structures_async()
+        return structures, time.perf_counter() - started_at
+
+    warm_ups = []
+    if 'codebase' in pipelines:
+        warm_ups.append(asyncio.to_thread(warm_up_reportlab))
+    if 'wiki' in pipelines:
+        warm_ups.append(warm_up_pandoc())
+    (structures, secret_seconds), *_ = await asyncio.gather(timed_structures(), *warm_ups)
+    return structures, secret_seconds
+
+def run_pipeline(pull, build):
+    # Worker thread: pull, then render; returns (pull seconds, ArtifactMetadata)
+    started_at = time.perf_counter()
+    pull()
+    pull_seconds = time.perf_counter() - started_at
+    return pull_seconds, build()
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(prog='python -m chronos', description="Build the Chronos codebase PDF and wiki document in one run.")
+    parser.add_argument('--only', choices=PIPELINES, help="Run only one of the two pipelines")
+    parser.add_argument('--backend', choices=['platypus', 'stream', 'markdown', 'text', 'jsonl'],
+                        help="Codebase output backend, as in convert_codeBase-to-pdf.py ('stream' when a stream-only option is given)")
+    parser.add_argument('--incremental', action='store_true', help="Only lay out codebase files and convert wiki pages whose content changed")
+    parser.add_argument('--jobs', type=int, default=1, help="Lay out codebase pages with the 'stream' backend (or chunk them for 'jsonl'), and convert wiki pages with '--incremental' or the markdown/ast engines, in this many workers; "
+                                                                    "the reportlab ('platypus') layout is never parallel")
+    parser.add_argument('--shard-tokens', type=int, metavar='TOKENS', help="Split the codebase PDF into parts of at most this many estimated tokens")
+    parser.add_argument('--shards', type=int, default=1, help="Number of codebase PDFs when '--shard-tokens' is given, as in convert_codeBase-to-pdf.py")
+    budget = parser.add_mutually_exclusive_group()
+    budget.add_argument('--budget-tokens', type=int, metavar='TOKENS', help="Export only the highest-priority codebase files that fit this budget")
+    budget.add_argument('--budget-bytes', type=int, metavar='BYTES', help="Like '--budget-tokens', with the budget in bytes")
+    parser.add_argument('--wiki-format', choices=['html', 'jsonl'], default='html', help="Wiki output format, as '--format' in convert_wiki-to-pdf.py")
+    parser.add_argument('--wiki-engine', choices=['pandoc', 'markdown', 'ast'], default='pandoc', help="Wiki HTML renderer, as '--engine' in convert_wiki-to-pdf.py")
+    parser.add_argument('--working-tree', action='store_true', help="Read both repositories from disk instead of git snapshots")
+    parser.add_argument('--no-cache', action='store_true', help="Always render, even if an output for the current git tree is cached")
+    arguments = parser.parse_args()
+    error = unsupported_options_error(arguments.backend, arguments.incremental, arguments.jobs, arguments.shard_tokens)
+    if error and arguments.only != 'wiki':
+        parser.error(f"codebase: {error}")
+    return arguments
+
+def print_summary(secret_seconds, results, total_seconds):
+    print(f"\n{'stage':<18}{'seconds':>9}  detail")
+    print(f"{'secrets':<18}{secret_seconds:>9.2f}")
+    for name, (pull_seconds, metadata) in results.items():
+        print(f"{name + ' pull':<18}{pull_seconds:>9.2f}")
+        if isinstance(metadata, Exception):
+            print(f"{name + ' render':<18}{'':>9}  failed: {metadata}")
+        elif metadata.from_cache:
+            print(f"{name + ' render':<18}{metadata.seconds:>9.2f}  restored from the artifact cache -> {metadata.output_path}")
+        else:
+            print(f"{name + ' render':<18}{metadata.seconds:>9.2f}  {metadata.input_count} files -> {metadata.output_path}")
+    print(f"{'total':<18}{total_seconds:>9.2f}")
+
+def main():
+    arguments = parse_arguments()
+    started_at = time.perf_counter()
+    pipelines = [arguments.only] if arguments.only else list(PIPELINES)
+    structures, secret_seconds = asyncio.run(prepare_run(pipelines))
+    for name in pipelines:
+        if f"{name}_directories_and_files" not in structures:
+            sys.exit(f"Directory and file names not found for {name}_directories_and_files in the secret backend.")
+
+    jobs = {}
+    if 'codebase' in pipelines:
+        codebase = structures['codebase_directories_and_files']
+        options = CodebaseOptions(backend=arguments.backend, incremental=arguments.incremental, jobs=arguments.jobs,
+                                  working_tree=arguments.working_tree, use_cache=not arguments.no_cache, pull=False,
+                                  shard_tokens=arguments.shard_tokens, shards=arguments.shards,
+                                  budget_tokens=arguments.budget_tokens, budget_bytes=arguments.budget_bytes)
+        jobs['codebase'] = (lambda: get_latest_codebase_content(codebase['local_codebase_directory']),
+                            lambda: build_codebase(codebase['local_codebase_directory'], codebase['output_pdf'], options))
+    if 'wiki' in pipelines:
+        wiki = structures['wiki_directories_and_files']
+        wiki_output = os.path.join(str(wiki['google_drive']), str(wiki['output_pdf']))
+        wiki_options = WikiOptions(working_tree=arguments.working_tree, use_cache=not arguments.no_cache, pull=False,
+                                   output_format=arguments.wiki_format, engine=arguments.wiki_engine,
+                                   incremental=arguments.incremental, jobs=arguments.jobs)
+        jobs['wiki'] = (lambda: get_latest_wiki_content(wiki['local_wiki_directory']),
+                        lambda: build_wiki(wiki['local_wiki_directory'], wiki_output, wiki_options))
+
+    results = {}
+    with ThreadPoolExecutor(max_workers=len(jobs)) as executor:
+        futures = {name: executor.submit(run_pipeline, pull, build) for name, (pull, build) in jobs.items()}
+        for name, future in futures.items():
+            try:
+                results[name] = future.result()
+            except (WikiConversionError, subprocess.SubprocessError, OSError, ValueError) as e: # One failing pipeline does not stop the other
+                results[name] = (0.0, e)
+
+    print_summary(secret_seconds, results, time.perf_counter() - started_at)
+    if any(isinstance(metadata, Exception) for _, metadata in results.values()):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""
+File Name: artifact_cache.py
+
+Purpose: Remembers which git tree every converter output was built from, so a run whose inputs did not change
+finishes without rendering, and outputs built from older trees can be restored instantly.
+
+**Functionality:**
+
+* `get_tree_sha()` returns the tree SHA of HEAD, or None when the working tree has local changes
+  (a dirty tree is not the content of any commit, so it is never served from or stored in the cache).
+* `key_untracked_inputs()` folds the content of untracked listed inputs into that key for '--working-tree' builds,
+  since HEAD's tree does not contain them and editing them must not restore a stale output.
+* `ArtifactCache` stores one copy of each output per (tree SHA, build options), with a small JSON sidecar.
+* Least recently used artifacts are evicted once the cache grows past CHRONOS_ARTIFACT_CACHE_MAX_MB (default 500).
+
+**Instructions:**
+
+1. `tree_sha = get_tree_sha(repository_directory)`
+2. `cache.restore(tree_sha, options, output_path)` before building; `cache.store(tree_sha, options, output_path)` after.
+3. `resolve_tree_sha(repository_directory, 'HEAD~3')` finds the tree of an older revision for `restore()`; it raises
+   `UnknownRevision` when git does not know the revision.
+
+Author: Beau Magnum
+
+Date: 2026-10-18
+
+"""
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+from dataclasses import dataclass
+from chronos.segment_cache import get_cache_root
+from Utilities.environment_settings import float_setting # An invalid CHRONOS_ARTIFACT_CACHE_MAX_MB falls back to the default
+from Utilities.subprocess_runner import run_command
+
+GIT_TIMEOUT_SECONDS = 30
+
+class UnknownRevision(ValueError):
+    pass
+
+@dataclass
+class ArtifactMetadata:
+    # What a converter returns: where the output is and how it was produced
+    kind: str # 'codebase' or 'wiki'
+    output_path: str
+    tree_sha: str # None when built from a working tree with local edits
+    from_cache: bool # True when the output was restored instead of rendered
+    input_count: int # Files or pages rendered, None for cache restores
+    seconds: float
+
+def resolve_tree_sha(repository_directory, revision='HEAD'):
+    try:
+        result = run_command(["git", "rev-parse", "--verify", "--quiet", f"{revision}^{{tree}}"], stage="git rev-parse",
+                             timeout=GIT_TIMEOUT_SECONDS, cwd=repository_directory, capture_output=True, text=True, check=True)
+    except subprocess.CalledProcessError as e:
+        raise UnknownRevision(f"Unknown revision '{revision}' in {repository_directory}") from e
+    return result.stdout.strip()
+
+def get_tree_sha(repository_directory):
+    try:
+        status = run_command(["git", "status", "--porcelain", "--untracked-files=no"], stage="git status", timeout=GIT_TIMEOUT_SECONDS,
+                             cwd=repository_directory, capture_output=True, text=True, check=True)
+        if status.stdout.strip():
+            return None # Local edits: the inputs are not any commit's tree
+        return resolve_tree_sha(repository_directory)
+    except (OSError, subprocess.SubprocessError, UnknownRevision) as e: # UnknownRevision: a repository without commits
+        print(f"Not using the artifact cache, could not read the git tree of {repository_directory}: {e}")
+        return None
+
+def key_untracked_inputs(repository_directory, tree_sha, paths):
+    # Returns tree_sha, or a key that also covers the listed files git does not track ('git status' above ignores them)
+    if not tree_sha:
+        return None
+    try:
+        tracked = run_command(["git", "ls-files", "-z"], stage="git ls-files", timeout=GIT_TIMEOUT_SECONDS,
+                              cwd=repository_directory, capture_output=True, text=True, check=True).stdout.split('\0')
+    except (OSError, subprocess.SubprocessError) as e:
+        print(f"Not using the artifact cache, could not list the tracked files of {repository_directory}: {e}")
+        return None
+    tracked = {os.path.normpath(path) for path in tracked if path}
+    untracked = sorted({os.path.normpath(path) for path in paths} - tracked)
+    digest = hashlib.sha256(tree_sha.encode())
+    for path in untracked:
+        try:
+            with open(os.path.join(repository_directory, path), 'rb') as file:
+                content_hash = hashlib.sha256(file.read()).hexdigest()
+        except FileNotFoundError:
+            content_hash = 'missing' # Creating the file later changes the key as well
+        digest.update(f"\0{path}\0{content_hash}".encode())
+    return digest.hexdigest() if untracked else tree_sha
+
+class ArtifactCache:
+    def __init__(self, name, cache_directory=None, max_bytes=None):
+        self.cache_directory = cache_directory or os.path.join(get_cache_root(), 'artifacts', name)
+        self.max_bytes = max_bytes or float_setting('CHRONOS_ARTIFACT_CACHE_MAX_MB', 500) * 1024 * 1024
+        os.makedirs(self.cache_directory, exist_ok=True)
+
+    def _key(self, tree_sha, options):
+        return hashlib.sha256(json.dumps({'tree': tree_sha, 'options': options}, sort_keys=True).encode()).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.cache_directory, key + '.artifact')
+
+    def lookup(self, tree_sha, options):
+        # Returns the cached artifact path, or None on a miss
+        if not tree_sha:
+            return None
+        path = self._path(self._key(tree_sha, options))
+        if not os.path.exists(path):
+            return None
+        os.utime(path) # Least-recently-used order is kept in the file modification times
+        return path
+
+    def restore(self, tree_sha, options, destination):
+        path = self.lookup(tree_sha, options)
+        if path is None:
+            return False
+        os.makedirs(os.path.dirname(os.path.abspath(destination)), exist_ok=True)
+        shutil.copyfile(path, destination)
+        return True
+
+    def store(self, tree_sha, options, artifact_path):
+        if not tree_sha or not os.path.exists(artifact_path):
+            return
+        key = self._key(tree_sha, options)
+        file_descriptor, temporary_path = tempfile.mkstemp(dir=self.cache_directory, suffix='.tmp') # Unique per thread and process
+        os.close(file_descriptor)
+        shutil.copyfile(artifact_path, temporary_path)
+        os.replace(temporary_path, self._path(key))
+        with open(os.path.join(self.cache_directory, key + '.json'), 'w') as file:
+            json.dump({'tree': tree_sha, 'options': options, 'source': os.path.abspath(artifact_path)}, file)
+        self.evict()
+
+    def entries(self):
+        # Metadata of every cached artifact, most recently used first
+        entries = []
+        for file_name in os.listdir(self.cache_directory):
+            if file_name.endswith('.artifact'):
+                key = file_name[:-len('.artifact')]
+                try:
+                    with open(os.path.join(self.cache_directory, key + '.json')) as file:
+                        metadata = json.load(file)
+                    stat = os.stat(self._path(key))
+                except (OSError, ValueError):
+                    continue
+                entries.append(dict(metadata, key=key, size=stat.st_size, last_used=stat.st_mtime))
+        return sorted(entries, key=lambda entry: entry['last_used'], reverse=True)
+
+    def evict(self):
+        total = 0
+        for entry in self.entries():
+            total += entry['size']
+            if total > self.max_bytes:
+                for suffix in ('.artifact', '.json'):
+                    try:
+                        os.remove(os.path.join(self.cache_directory, entry['key'] + suffix))
+                    except FileNotFoundError:
+                        pass
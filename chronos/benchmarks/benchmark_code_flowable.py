@@ -0,0 +1,39 @@
+"""
+File Name: benchmark_code_flowable.py
+
+Purpose: Compares how long reportlab takes to lay out one large source file with `Preformatted` and with
+`CodeBlock`, at growing file sizes, to show that CodeBlock grows linearly and Preformatted does not.
+
+Usage:
+      python -m chronos.benchmarks.benchmark_code_flowable [line counts...]
+"""
+import io
+import sys
+import time
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.platypus import SimpleDocTemplate, Preformatted
+from chronos.code_flowable import CodeBlock
+
+DEFAULT_LINE_COUNTS = [2000, 8000, 32000]
+
+def make_source(line_count):
+    return '\n'.join(f"    result_{index} = compute(value_{index}, factor={index % 17})  # generated line" for index in range(line_count))
+
+def time_build(flowable_class, content):
+    code_style = getSampleStyleSheet()['Code']
+    doc = SimpleDocTemplate(io.BytesIO(), pagesize=(1500, 3600), leftMargin=50) # Same page size as convert_code_to_pdf
+    started_at = time.perf_counter()
+    doc.build([flowable_class(content, code_style)])
+    return time.perf_counter() - started_at
+
+def main():
+    line_counts = [int(argument) for argument in sys.argv[1:]] or DEFAULT_LINE_COUNTS
+    print(f"{'lines':>8} {'Preformatted':>14} {'CodeBlock':>11} {'speed-up':>9}")
+    for line_count in line_counts:
+        content = make_source(line_count)
+        preformatted_seconds = time_build(Preformatted, content)
+        code_block_seconds = time_build(CodeBlock, content)
+        print(f"{line_count:>8} {preformatted_seconds:>13.2f}s {code_block_seconds:>10.2f}s {preformatted_seconds / code_block_seconds:>8.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+File Name: benchmark_pdf_backends.py
+
+Purpose: Compares the reportlab (platypus) codebase export with the streaming PDF writer and the Markdown bundle
+on a synthetic codebase, reporting wall-clock time, throughput and peak Python memory for each backend.
+
+Usage:
+      python -m chronos.benchmarks.benchmark_pdf_backends [file count] [lines per file]
+"""
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from chronos.codebase_converter import convert_code_to_pdf
+from chronos.pdf_stream_writer import write_codebase_pdf
+from chronos.text_bundle import write_codebase_bundle
+
+def make_codebase(directory, file_count, lines_per_file):
+    file_list = []
+    for file_index in range(file_count):
+        file_path = f"module_{file_index}.py"
+        with open(os.path.join(directory, file_path), 'w') as file:
+            file.write('\n'.join(f"def function_{line}(value):  return value * {line}  # module {file_index}" for line in range(lines_per_file)))
+        file_list.append(file_path)
+    return file_list
+
+def measure(build, file_list, output_pdf, directory):
+    tracemalloc.start()
+    started_at = time.perf_counter()
+    build(file_list, output_pdf, directory)
+    seconds = time.perf_counter() - started_at
+    peak_bytes = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return seconds, peak_bytes
+
+def main():
+    file_count = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    lines_per_file = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    with tempfile.TemporaryDirectory() as directory:
+        file_list = make_codebase(directory, file_count, lines_per_file)
+        total_megabytes = sum(os.path.getsize(os.path.join(directory, path)) for path in file_list) / 1e6
+        print(f"{file_count} files x {lines_per_file} lines ({total_megabytes:.1f} MB)")
+        for name, build, extension in [('platypus', convert_code_to_pdf, '.pdf'), ('stream', write_codebase_pdf, '.pdf'),
+                                       ('markdown', write_codebase_bundle, '.md')]:
+            seconds, peak_bytes = measure(build, file_list, os.path.join(directory, name + extension), directory)
+            print(f"{name:>9}: {seconds:6.2f}s  {total_megabytes / seconds:6.1f} MB/s  peak memory {peak_bytes / 1e6:7.1f} MB")
+
+if __name__ == "__main__":
+    main()
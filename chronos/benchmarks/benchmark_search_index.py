@@ -0,0 +1,54 @@
+"""
+File Name: benchmark_search_index.py
+
+Purpose: Measures the local BM25 index on a synthetic corpus: how long a full build and a no-change update take,
+and the median latency of a few queries, so the query-time figures can be reproduced.
+
+Usage:
+      python -m chronos.benchmarks.benchmark_search_index [file count] [functions per file] [runs]
+"""
+import os
+import statistics
+import sys
+import tempfile
+import time
+from chronos.git_snapshot import WorkingTree
+from chronos.search_index import SearchIndex, code_documents
+
+QUERIES = ['artifact cache eviction', 'compute value', 'load_all_structures', 'missingterm']
+
+def make_corpus(directory, file_count, functions_per_file):
+    paths = []
+    for file_index in range(file_count):
+        path = f"module_{file_index}.py"
+        functions = [f"def compute_value_{index}(value, factor={index % 17}):\n"
+                     f"    # Artifact cache eviction step {index} of module {file_index}\n"
+                     f"    return load_all_structures()[value] * factor\n" for index in range(functions_per_file)]
+        with open(os.path.join(directory, path), 'w') as source:
+            source.write('\n\n'.join(functions))
+        paths.append(path)
+    return paths
+
+def timed(function):
+    started_at = time.perf_counter()
+    result = function()
+    return time.perf_counter() - started_at, result
+
+def main():
+    file_count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    functions_per_file = int(sys.argv[2]) if len(sys.argv) > 2 else 40
+    runs = int(sys.argv[3]) if len(sys.argv) > 3 else 20
+    with tempfile.TemporaryDirectory() as directory:
+        paths = make_corpus(directory, file_count, functions_per_file)
+        reader = WorkingTree(directory)
+        with SearchIndex(os.path.join(directory, 'index.sqlite')) as index:
+            build_seconds, _ = timed(lambda: index.update('codebase', reader, paths, code_documents))
+            update_seconds, _ = timed(lambda: index.update('codebase', reader, paths, code_documents))
+            document_count = index.connection.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+            print(f"{file_count} files, {document_count} documents: build {build_seconds:.2f}s, no-change update {update_seconds:.2f}s")
+            for query in QUERIES:
+                timings = [timed(lambda: index.query(query))[0] for _ in range(runs)]
+                print(f"{query!r:>28}: median {statistics.median(timings) * 1000:6.2f} ms over {runs} runs")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+File Name: benchmark_wiki_engines.py
+
+Purpose: Compares the pandoc wiki export with the in-process Python-Markdown engine on a synthetic wiki,
+reporting the first run (pandoc start-up, Markdown instance creation) and the median of the repeated runs.
+The 'incremental' rows convert every page once (first run) and then assemble from the page cache; the 'xN' rows
+convert every page on every run, in N workers. The 'ast' row parses every page once and then only writes the
+combined AST.
+
+Usage:
+      python -m chronos.benchmarks.benchmark_wiki_engines [page count] [sections per page] [runs] [jobs]
+"""
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from chronos.git_snapshot import WorkingTree
+from chronos.segment_cache import SegmentCache
+from chronos.wiki_ast import write_wiki_ast
+from chronos.wiki_converter import TOC_DEPTH, WIKI_TITLE, generate_pdf
+from chronos.wiki_pages import write_wiki_pages
+
+def make_wiki(directory, page_count, sections_per_page):
+    file_list = []
+    for page_index in range(page_count):
+        file_name = f"Page-{page_index}.md"
+        sections = [f"# Page {page_index}\n\nIntroduction to page {page_index} with a [link](Page-{(page_index + 1) % page_count}).\n"]
+        for section_index in range(sections_per_page):
+            sections.append(f"## Overview {section_index}\n\nSome *text* about `section {section_index}`.\n\n"
+                            f"| key | value |\n|-----|-------|\n| a | {section_index} |\n\n"
+                            f"```python\ndef section_{section_index}():\n    return {page_index}\n```\n\n"
+                            f"### Details {section_index}\n\n- first\n- second\n")
+        with open(os.path.join(directory, file_name), 'w') as page:
+            page.write('\n'.join(sections))
+        file_list.append(file_name)
+    return file_list
+
+def measure(render, runs):
+    timings = []
+    for _ in range(runs):
+        started_at = time.perf_counter()
+        render()
+        timings.append(time.perf_counter() - started_at)
+    return timings[0], statistics.median(timings[1:] or timings)
+
+def main():
+    page_count = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    sections_per_page = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    runs = int(sys.argv[3]) if len(sys.argv) > 3 else 5
+    jobs = int(sys.argv[4]) if len(sys.argv) > 4 else os.cpu_count()
+    with tempfile.TemporaryDirectory() as directory:
+        file_list = make_wiki(directory, page_count, sections_per_page)
+        reader = WorkingTree(directory)
+        total_megabytes = sum(os.path.getsize(os.path.join(directory, file_name)) for file_name in file_list) / 1e6
+        print(f"{page_count} pages x {sections_per_page} sections ({total_megabytes:.1f} MB), {runs} runs")
+        output_path = os.path.join(directory, 'wiki.html')
+
+        def pages(engine, page_cache=None, page_jobs=1):
+            return lambda: write_wiki_pages(file_list, output_path, directory, engine, WIKI_TITLE, TOC_DEPTH, reader, page_cache,
+                                            page_cache is not None, page_jobs)
+
+        engines = [('markdown', pages('markdown')), (f'markdown x{jobs}', pages('markdown', page_jobs=jobs)),
+                   ('markdown incremental', pages('markdown', SegmentCache(os.path.join(directory, 'markdown_pages'))))]
+        if shutil.which('pandoc'):
+            engines[:0] = [('pandoc', lambda: generate_pdf(file_list, directory, output_path, reader)),
+                           (f'pandoc x{jobs}', pages('pandoc', page_jobs=jobs)),
+                           ('pandoc incremental', pages('pandoc', SegmentCache(os.path.join(directory, 'pandoc_pages')))),
+                           ('ast', lambda: write_wiki_ast(file_list, output_path, directory, WIKI_TITLE, TOC_DEPTH, reader,
+                                                          SegmentCache(os.path.join(directory, 'ast_pages'))))]
+        else:
+            print("pandoc is not installed, benchmarking the markdown engine only")
+        for name, render in engines:
+            first_seconds, median_seconds = measure(render, runs)
+            print(f"{name:>20}: first {first_seconds:6.2f}s  median {median_seconds:6.2f}s  {total_megabytes / median_seconds:6.1f} MB/s")
+
+if __name__ == "__main__":
+    main()
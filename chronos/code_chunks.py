@@ -0,0 +1,168 @@
+"""
+File Name: code_chunks.py
+
+Purpose: Exports the codebase as retrieval-ready JSONL: one record per chunk of code instead of one monolithic
+document. Python files are cut at function and class boundaries with `ast`; other files at blank lines outside
+braces. Chunks are cached by blob SHA, so refreshing the corpus only chunks the files that changed.
+
+**Functionality:**
+
+* Every record carries path, start_line/end_line (1-based, inclusive), blob_sha (the git blob SHA of the file),
+  tokens (estimated), kind ('function', 'class', 'module' or 'block'), name and text.
+* Python: every top-level function and class (decorators included) is one chunk, the statements between them are
+  grouped into 'module' chunks. A class larger than MAX_CHUNK_TOKENS is cut at its methods instead.
+* Other languages: blocks separated by blank lines at brace depth 0, merged up to TARGET_CHUNK_TOKENS.
+* Files are chunked in a process pool (in this process with jobs=1); chunks of unchanged blobs come from
+  ~/.cache/chronos/code_chunks.
+
+**Instructions:**
+
+1. `write_codebase_chunks(file_list, 'codebase.chunks.jsonl', local_codebase_directory, reader=snapshot)`
+2. Or run 'convert_codeBase-to-pdf.py --backend jsonl [--jobs N]'.
+
+Author: Beau Magnum
+
+Date: 2026-10-18
+
+"""
+import ast
+import hashlib
+import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from chronos.git_snapshot import WorkingTree
+from chronos.segment_cache import SegmentCache, get_cache_root
+from chronos.sharding import estimate_tokens
+
+CHUNK_FORMAT_VERSION = 1 # Bump when the chunking rules change, so cached chunks are not reused
+TARGET_CHUNK_TOKENS = 400 # Non-Python blocks are merged up to this size
+MAX_CHUNK_TOKENS = 1500 # Larger chunks are cut further (classes at their methods, blocks at line boundaries)
+
+def corpus_path(output_pdf):
+    return os.path.splitext(output_pdf)[0] + '.chunks.jsonl'
+
+def git_blob_sha(content):
+    # The SHA git gives this content, the same for snapshot and working-tree reads
+    return hashlib.sha1(b'blob %d\0' % len(content) + content).hexdigest()
+
+def _chunk(lines, start_line, end_line, kind, name=None):
+    text = ''.join(lines[start_line - 1:end_line])
+    return {'start_line': start_line, 'end_line': end_line, 'kind': kind, 'name': name, 'text': text, 'tokens': estimate_tokens(text)}
+
+def _split_by_lines(lines, start_line, end_line, kind, name=None):
+    # Last resort for a chunk that is too large: consecutive line ranges of at most MAX_CHUNK_TOKENS
+    chunks, chunk_start, size = [], start_line, 0
+    for line_number in range(start_line, end_line + 1):
+        line_tokens = estimate_tokens(lines[line_number - 1])
+        if size and size + line_tokens > MAX_CHUNK_TOKENS:
+            chunks.append(_chunk(lines, chunk_start, line_number - 1, kind, name))
+            chunk_start, size = line_number, 0
+        size += line_tokens
+    chunks.append(_chunk(lines, chunk_start, end_line, kind, name))
+    return chunks
+
+def _node_start(node):
+    return min([node.lineno] + [decorator.lineno for decorator in getattr(node, 'decorator_list', [])])
+
+def _chunk_body(lines, body, first_line, last_line, prefix=''):
+    # Definitions become their own chunks; the statements between them are grouped into 'module' chunks
+    chunks, pending_start = [], first_line
+    for node in body:
+        if not isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            continue
+        start_line = _node_start(node)
+        if pending_start < start_line and ''.join(lines[pending_start - 1:start_line - 1]).strip():
+            chunks.append(_chunk(lines, pending_start, start_line - 1, 'module', prefix or None))
+        name = prefix + node.name
+        kind = 'class' if isinstance(node, ast.ClassDef) else 'function'
+        chunk = _chunk(lines, start_line, node.end_lineno, kind, name)
+        if chunk['tokens'] <= MAX_CHUNK_TOKENS:
+            chunks.append(chunk)
+        elif kind == 'class':
+            chunks.extend(_chunk_body(lines, node.body, start_line, node.end_lineno, name + '.'))
+        else:
+            chunks.extend(_split_by_lines(lines, start_line, node.end_lineno, kind, name))
+        pending_start = node.end_lineno + 1
+    if pending_start <= last_line and ''.join(lines[pending_start - 1:last_line]).strip():
+        chunks.extend(_split_by_lines(lines, pending_start, last_line, 'module', prefix or None))
+    return chunks
+
+def chunk_python(text):
+    lines = text.splitlines(keepends=True)
+    tree = ast.parse(text) # SyntaxError falls back to chunk_blocks
+    return _chunk_body(lines, tree.body, 1, len(lines))
+
+def chunk_blocks(text):
+    # Blank lines at brace depth 0 end a block; small blocks are merged up to TARGET_CHUNK_TOKENS
+    lines = text.splitlines(keepends=True)
+    blocks, block_start, depth = [], 1, 0
+    for line_number, line in enumerate(lines, start=1):
+        depth = max(0, depth + line.count('{') - line.count('}'))
+        if not line.strip() and depth == 0:
+            if block_start < line_number:
+                blocks.append((block_start, line_number - 1))
+            block_start = line_number + 1
+    if block_start <= len(lines):
+        blocks.append((block_start, len(lines)))
+
+    chunks, chunk_start, chunk_end, size = [], None, None, 0
+    for start_line, end_line in blocks:
+        block_tokens = estimate_tokens(''.join(lines[start_line - 1:end_line]))
+        if chunk_start is not None and size + block_tokens > TARGET_CHUNK_TOKENS:
+            chunks.extend(_split_by_lines(lines, chunk_start, chunk_end, 'block'))
+            chunk_start, size = None, 0
+        chunk_start = start_line if chunk_start is None else chunk_start
+        chunk_end = end_line
+        size += block_tokens
+    if chunk_start is not None:
+        chunks.extend(_split_by_lines(lines, chunk_start, chunk_end, 'block'))
+    return chunks
+
+def chunk_file(file_path, text):
+    # Runs in a worker process; returns the chunks of one file without path or blob SHA
+    if file_path.endswith('.py'):
+        try:
+            return chunk_python(text)
+        except (SyntaxError, ValueError):
+            pass # Not valid Python (or a different Python version): chunk it like any other file
+    return chunk_blocks(text)
+
+def chunk_cache_key(file_path, blob_sha):
+    chunker = 'python' if file_path.endswith('.py') else 'blocks'
+    return hashlib.sha256(f"{CHUNK_FORMAT_VERSION}\0{chunker}\0{TARGET_CHUNK_TOKENS}\0{MAX_CHUNK_TOKENS}\0{blob_sha}".encode()).hexdigest()
+
+def chunk_files(files, jobs=None):
+    # [(file_path, text)] -> the chunks of every file, in order; jobs=1 chunks in this process, None uses every core
+    if jobs == 1 or not files:
+        return [chunk_file(file_path, text) for file_path, text in files]
+    with ProcessPoolExecutor(max_workers=jobs or os.cpu_count(), mp_context=multiprocessing.get_context('spawn')) as executor: # Never fork from a worker thread
+        chunk_size = max(1, len(files) // ((jobs or os.cpu_count()) * 4))
+        return list(executor.map(chunk_file, *zip(*files), chunksize=chunk_size))
+
+def write_codebase_chunks(file_paths, output_path, local_codebase_directory, reader=None, jobs=None, chunk_cache=None):
+    # Returns (files chunked, files reused from the chunk cache)
+    reader = reader or WorkingTree(local_codebase_directory)
+    chunk_cache = chunk_cache or SegmentCache(os.path.join(get_cache_root(), 'code_chunks'))
+    cached, misses = {}, []
+    blob_shas = {}
+    for file_path in file_paths:
+        content = reader.read(file_path)[0]
+        blob_shas[file_path] = git_blob_sha(content)
+        records = chunk_cache.load(chunk_cache_key(file_path, blob_shas[file_path]))
+        if records is None:
+            misses.append((file_path, content.decode('utf-8', errors='replace')))
+        else:
+            cached[file_path] = [json.loads(record) for record in records]
+
+    fresh = {}
+    for (file_path, _), chunks in zip(misses, chunk_files(misses, jobs)):
+        chunk_cache.store(chunk_cache_key(file_path, blob_shas[file_path]), [json.dumps(chunk).encode() for chunk in chunks])
+        fresh[file_path] = chunks
+
+    with open(output_path, 'w', encoding='utf-8') as corpus:
+        for file_path in file_paths:
+            for chunk in cached[file_path] if file_path in cached else fresh[file_path]:
+                corpus.write(json.dumps(dict(path=file_path, blob_sha=blob_shas[file_path], **chunk)) + '\n')
+    chunk_cache.prune()
+    return len(misses), len(cached)
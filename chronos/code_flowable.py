@@ -0,0 +1,81 @@
+"""
+File Name: code_flowable.py
+
+Purpose: A reportlab flowable for source code whose page splits cost time proportional to the lines on the page,
+not to the lines left in the file.
+
+**Functionality:**
+
+* `CodeBlock` keeps one shared list of lines and draws only the offset range [start, end) it was given.
+* Splitting at a page boundary returns two views of the same list, so nothing is re-joined or copied
+  (reportlab's `Preformatted.split` re-joins and re-splits the remaining text on every page, which is quadratic).
+* Draws the same way `Preformatted` does, so it is a drop-in replacement in `convert_code_to_pdf`.
+
+**Instructions:**
+
+1. `story.append(CodeBlock(content, styles['Code']))` instead of `Preformatted(content, styles['Code'])`.
+2. See `chronos/benchmarks/benchmark_code_flowable.py` for a timing comparison against `Preformatted`.
+
+Author: Beau Magnum
+
+Date: 2026-10-18
+
+"""
+from copy import deepcopy
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from reportlab.platypus.flowables import Flowable
+
+def _trim_empty_lines(lines):
+    # Same tidy-up Preformatted does: blank lines at the start and end of the text are dropped
+    start, end = 0, len(lines)
+    while start < end and not lines[start].strip():
+        start += 1
+    while end > start and not lines[end - 1].strip():
+        end -= 1
+    return lines[start:end]
+
+class CodeBlock(Flowable):
+    def __init__(self, text, style, lines=None, start=0, end=None):
+        # 'lines', 'start' and 'end' are only passed by split(); callers hand over the text
+        self.style = style
+        self.lines = lines if lines is not None else _trim_empty_lines(text.split('\n'))
+        self.start = start
+        self.end = len(self.lines) if end is None else end
+
+    def __repr__(self):
+        return f"CodeBlock(lines {self.start}-{self.end} of {len(self.lines)})"
+
+    def wrap(self, availWidth, availHeight):
+        self.width = availWidth
+        self.height = self.style.leading * (self.end - self.start)
+        return (self.width, self.height)
+
+    def minWidth(self):
+        style = self.style
+        return max((stringWidth(line, style.fontName, style.fontSize) for line in self.lines[self.start:self.end]), default=0)
+
+    def split(self, availWidth, availHeight):
+        if availHeight < self.style.leading:
+            return []
+
+        split_at = self.start + int(availHeight / self.style.leading)
+        if split_at >= self.end:
+            return [self]
+
+        style = self.style
+        if style.firstLineIndent != 0:
+            style = deepcopy(style)
+            style.firstLineIndent = 0
+        # Both halves share self.lines, only the offsets differ
+        return [CodeBlock(None, self.style, self.lines, self.start, split_at), CodeBlock(None, style, self.lines, split_at, self.end)]
+
+    def draw(self):
+        style = self.style
+        self.canv.addLiteral('%CodeBlock')
+        if style.textColor:
+            self.canv.setFillColor(style.textColor)
+        text_object = self.canv.beginText(style.leftIndent, self.height - style.fontSize)
+        text_object.setFont(style.fontName, style.fontSize, style.leading)
+        for index in range(self.start, self.end):
+            text_object.textLine(self.lines[index])
+        self.canv.drawText(text_object)
@@ -0,0 +1,232 @@
+"""
+File Name: codebase_converter.py
+
+Purpose: Importable, re-entrant version of the codebase export behind `convert_codeBase-to-pdf.py`. Nothing here
+changes process-wide state (no `os.chdir`), so several repositories can be built at once from worker threads. A
+relative output path is resolved against the repository directory, where the script used to change into.
+
+**Functionality:**
+
+* `build_codebase()` pulls the repository, pins a snapshot, serves the output from the artifact cache when the
+  tree is unchanged and otherwise renders it with the selected backend. It returns an `ArtifactMetadata`.
+* `restore_codebase()` copies the output cached for an older revision into place.
+* `CodebaseOptions` gathers the settings the command line exposes. '--incremental', '--jobs' and '--shard-tokens'
+  only exist for the 'stream' PDF backend ('jsonl' also takes '--jobs'): without a backend they select it, with
+  another backend they are rejected. Only the stream writer runs in parallel, reportlab's layout never does.
+
+**Instructions:**
+
+from chronos.codebase_converter import CodebaseOptions, build_codebase
+
+metadata = build_codebase('/path/to/repository', '/path/to/output.pdf', CodebaseOptions(backend='stream', incremental=True))
+
+Author: Beau Magnum
+
+Date: 2026-10-18
+
+"""
+import os
+import re # Allows python to use regular expressions for pattern matching. In this case, we use it to extract filenames from the 'codeBase-list.md' file
+import subprocess # Allows python to execute external commands, in this case, we use it to pull the latest codebase from GitHub
+import time
+from dataclasses import dataclass
+from reportlab.lib.styles import getSampleStyleSheet # Allows python to use the default styles for the PDF
+from reportlab.pdfbase import pdfmetrics # Allows python to load font metrics ahead of the layout
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer # Allows python to create a simple document template, paragraphs, and space in the PDF
+from chronos.artifact_cache import ArtifactCache, ArtifactMetadata, key_untracked_inputs, resolve_tree_sha # Finished PDFs keyed by the git tree they were built from
+from chronos.code_chunks import corpus_path, write_codebase_chunks # Retrieval-ready JSONL chunks ('--backend jsonl')
+from chronos.code_flowable import CodeBlock # Code flowable that splits across pages without re-copying the remaining lines
+from chronos.file_selection import CodebaseEntry, ExcerptReader, parse_priority, select_files # '--budget-tokens' / '--budget-bytes'
+from chronos.git_snapshot import WorkingTree, is_transient_git_error, open_reader # Inputs read from one pinned commit through 'git cat-file --batch'
+from chronos.parallel_render import write_codebase_pdf_parallel # Renders files in worker processes and merges the parts ('--jobs')
+from chronos.pdf_stream_writer import write_codebase_pdf # Streaming backend that writes each page to disk as the files are read
+from chronos.segment_cache import SegmentCache # Laid-out pages of unchanged files, reused by '--incremental' builds
+from chronos.sharding import manifest_path_for, write_codebase_shards # Several PDFs under a token budget, plus a manifest ('--shard-tokens')
+from chronos.text_bundle import BUNDLE_FORMATS, bundle_path, write_codebase_bundle # Markdown/text output without a layout step
+from Utilities.subprocess_runner import StageBudgetExceeded, run_command # Timeouts, retries and the CHRONOS_RUN_DEADLINE budget for external commands
+
+GIT_PULL_TIMEOUT_SECONDS = 300 # A single 'git pull' attempt is abandoned after this long
+CODEBASE_FORMAT_VERSION = 1 # Bump when a backend changes its output, so outputs cached by older code are not restored
+
+def stream_only_options(incremental, jobs, shard_tokens):
+    # The options only the 'stream' PDF backend honours in full: it lays files out one by one, so it can reuse, shard and parallelise them
+    return [name for name, given in (('--incremental', incremental), ('--jobs', jobs > 1), ('--shard-tokens', shard_tokens)) if given]
+
+def unsupported_options_error(backend, incremental, jobs, shard_tokens):
+    # Returns why 'backend' cannot honour the options, or None; an option is never silently ignored
+    unsupported = stream_only_options(incremental, jobs, shard_tokens)
+    if backend == 'jsonl':
+        unsupported = [name for name in unsupported if name != '--jobs'] # Chunking runs in worker processes, and unchanged files always reuse their chunks
+    if backend in (None, 'stream') or not unsupported:
+        return None
+    hint = ", use '--backend stream'" if backend == 'platypus' else ''
+    return f"the '{backend}' backend does not support {', '.join(unsupported)}{hint}"
+
+@dataclass
+class CodebaseOptions:
+    backend: str = None # 'platypus' (reportlab layout), 'stream' (plain Courier pages written straight to disk), 'markdown', 'text' or 'jsonl'; None picks 'stream' for the stream-only options, 'platypus' otherwise
+    incremental: bool = False # Reuse the laid-out pages of unchanged files (stream backend)
+    jobs: int = 1 # Worker processes for laying out pages (stream backend) or chunking files (jsonl); 1 runs serially
+    revision: str = 'HEAD'
+    working_tree: bool = False # Read files from disk instead of a git snapshot
+    use_cache: bool = True # Serve the output from the artifact cache when the tree did not change
+    pull: bool = True
+    shard_tokens: int = None # Split the output into PDFs of at most this many (estimated) tokens (stream backend)
+    shards: int = 1 # Number of shards to split into when sharding (more if the budget needs them, fewer only if there are fewer pieces)
+    budget_tokens: int = None # Export only the highest-priority files that fit this many (estimated) tokens
+    budget_bytes: int = None # ... or this many bytes
+
+    def __post_init__(self):
+        error = unsupported_options_error(self.backend, self.incremental, self.jobs, self.shard_tokens)
+        if error:
+            raise ValueError(error)
+        stream_only = stream_only_options(self.incremental, self.jobs, self.shard_tokens)
+        if self.backend is None:
+            self.backend = 'stream' if stream_only else 'platypus'
+            if stream_only:
+                print(f"Writing the codebase PDF with the 'stream' backend instead of 'platypus', which does not support {', '.join(stream_only)}")
+
+    @property
+    def is_bundle(self):
+        return self.backend in BUNDLE_FORMATS or self.backend == 'jsonl' # The PDF options ('incremental', 'shard_tokens') are rejected for a bundle
+
+    def output_path(self, output_pdf):
+        if self.backend == 'jsonl':
+            return corpus_path(output_pdf)
+        return bundle_path(output_pdf, self.backend) if self.is_bundle else output_pdf
+
+# --- Git pull for updating codebase on local computer ---
+def get_latest_codebase_content(local_codebase_directory):
+    try:
+        # Run the git pull command inside the codebase location, retrying transient network failures
+        run_command(["git", "pull"], stage="git pull (codebase)", timeout=GIT_PULL_TIMEOUT_SECONDS, retries=2,
+                    retry_if=is_transient_git_error, cwd=local_codebase_directory, check=True, stderr=subprocess.PIPE, text=True)
+    except subprocess.CalledProcessError as e:
+        print(f"Error updating codebase: {e}\n{e.stderr.strip()}") # Print an error message (and git's own) if the git pull command fails
+    except StageBudgetExceeded as e:
+        print(f"Error updating codebase, continuing with the local copy: {e}")
+
+def extract_filenames_from_codebase_list(local_codebase_directory, reader=None, with_priorities=False):
+    file_list = []
+    link_pattern = re.compile(r'\s*\[.*\]\((.*)\)')  # Extracts the filename from a Markdown link, in this case '[Display_Text](filename)'
+    reader = reader or WorkingTree(local_codebase_directory) # A RepositorySnapshot reads the list at the same commit as the files
+
+    for line in reader.read_text('codeBase-list.md').splitlines():
+        match = link_pattern.search(line) # Check if the line matches the link pattern
+        if match:
+            if with_priorities: # Optional 'priority: N' after the link, used by the budget selection
+                file_list.append(CodebaseEntry(match.group(1), parse_priority(line[match.end():])))
+            else:
+                file_list.append(match.group(1)) # If there is a match, extract the filename and add it to the list
+    return file_list # Return the list of filenames extracted from the 'codeBase-list.md' file
+
+def convert_code_to_pdf(file_paths, output_pdf, local_codebase_directory, reader=None):
+    reader = reader or WorkingTree(local_codebase_directory)
+    doc = SimpleDocTemplate(output_pdf, pagesize=(1500, 3600), leftMargin=50)
+    story = []
+    styles = getSampleStyleSheet()
+    code_style = styles['Code']
+
+    for file_path in file_paths:
+        full_path = os.path.join(local_codebase_directory, file_path)
+        content = reader.read_text(file_path)
+
+        story.append(Paragraph(f"File: {full_path}", styles['Heading1']))
+        story.append(Spacer(1, 12))
+
+        code_block = CodeBlock(content, code_style) # Linear in file length, unlike Preformatted's page splits
+        story.append(code_block)
+        story.append(Spacer(1, 12))
+
+    doc.build(story)
+
+def warm_up_reportlab():
+    getSampleStyleSheet() # Builds the styles convert_code_to_pdf uses
+    pdfmetrics.stringWidth("warm-up", 'Courier', 10) # Loads the Courier metrics used by the 'Code' style
+
+def render_codebase(options, file_list, output_pdf, local_codebase_directory, reader):
+    if options.backend == 'jsonl':
+        chunked, reused = write_codebase_chunks(file_list, output_pdf, local_codebase_directory, reader, jobs=options.jobs)
+        print(f"Chunked {chunked} of {len(file_list)} files, reused the chunks of {reused} unchanged files")
+        return
+    if options.is_bundle:
+        write_codebase_bundle(file_list, output_pdf, local_codebase_directory, reader, options.backend)
+        return
+
+    segment_cache = SegmentCache() if options.incremental else None
+    if options.shard_tokens:
+        manifest_path = write_codebase_shards(file_list, output_pdf, local_codebase_directory, options.shard_tokens, options.shards,
+                                              segment_cache=segment_cache, reader=reader)
+        print(f"Wrote {len(file_list)} files in token-budgeted shards, listed in {manifest_path}")
+    elif options.jobs > 1:
+        laid_out, reused = write_codebase_pdf_parallel(file_list, output_pdf, local_codebase_directory, jobs=options.jobs,
+                                                       segment_cache_directory=segment_cache and segment_cache.cache_directory, reader=reader)
+        print(f"Laid out {laid_out} of {len(file_list)} files with {options.jobs} workers, reused {reused} from the build cache")
+    elif segment_cache or options.backend == 'stream':
+        write_codebase_pdf(file_list, output_pdf, local_codebase_directory, segment_cache=segment_cache, reader=reader)
+        if segment_cache:
+            print(f"Laid out {segment_cache.misses} of {len(file_list)} files, reused {segment_cache.hits} from the build cache")
+    else:
+        convert_code_to_pdf(file_list, output_pdf, local_codebase_directory, reader)
+
+    if segment_cache:
+        segment_cache.prune()
+
+def select_within_budget(options, local_codebase_directory, reader):
+    # Returns the file list and the reader to render from (serving excerpts of oversize files)
+    unit, budget = ('tokens', options.budget_tokens) if options.budget_tokens else ('bytes', options.budget_bytes)
+    entries = extract_filenames_from_codebase_list(local_codebase_directory, reader, with_priorities=True)
+    file_list, excerpts, skipped = select_files(entries, reader, budget, unit)
+    print(f"Selected {len(file_list)} of {len(entries)} files for a budget of {budget} {unit} "
+          f"({len(excerpts)} as head/tail excerpts, {len(skipped)} left out)")
+    if skipped:
+        print("Left out: " + ', '.join(skipped))
+    return file_list, ExcerptReader(reader, excerpts)
+
+def list_files_to_render(options, local_codebase_directory, reader):
+    if options.budget_tokens or options.budget_bytes:
+        return select_within_budget(options, local_codebase_directory, reader)
+    return extract_filenames_from_codebase_list(local_codebase_directory, reader), reader
+
+def artifact_options(options, local_codebase_directory):
+    # Everything besides the git tree that changes the bytes of the PDF ('jobs' and 'incremental' do not)
+    cache_options = {'backend': options.backend, 'format': CODEBASE_FORMAT_VERSION, 'local_codebase_directory': local_codebase_directory}
+    if options.budget_tokens or options.budget_bytes:
+        cache_options.update(budget_tokens=options.budget_tokens, budget_bytes=options.budget_bytes)
+    return cache_options
+
+def restore_codebase(local_codebase_directory, output_pdf, revision, options=None):
+    # Copies the PDF cached for an older revision into place; returns None if there is none
+    options = options or CodebaseOptions()
+    output_pdf = options.output_path(os.path.normpath(os.path.join(local_codebase_directory, output_pdf))) # .md or .txt for a bundle; relative to the repository
+    started_at = time.perf_counter()
+    tree_sha = resolve_tree_sha(local_codebase_directory, revision) # Raises UnknownRevision
+    if not ArtifactCache('codebase').restore(tree_sha, artifact_options(options, local_codebase_directory), output_pdf):
+        return None
+    return ArtifactMetadata('codebase', output_pdf, tree_sha, True, None, time.perf_counter() - started_at)
+
+def build_codebase(local_codebase_directory, output_pdf, options=None):
+    options = options or CodebaseOptions()
+    output_pdf = options.output_path(os.path.normpath(os.path.join(local_codebase_directory, output_pdf))) # A relative path is relative to the repository, as when the script changed into it
+    started_at = time.perf_counter()
+    artifact_cache = ArtifactCache('codebase')
+    cache_options = artifact_options(options, local_codebase_directory)
+
+    if options.pull:
+        get_latest_codebase_content(local_codebase_directory)
+    with open_reader(local_codebase_directory, options.revision, options.working_tree) as reader: # Pinned after the pull, so every file comes from one commit
+        tree_sha = reader.tree_sha
+        if isinstance(reader, WorkingTree): # HEAD's tree does not contain untracked listed files, so their content joins the key
+            tree_sha = key_untracked_inputs(local_codebase_directory, tree_sha, ['codeBase-list.md'] + extract_filenames_from_codebase_list(local_codebase_directory, reader))
+        if options.backend == 'stream' and options.shard_tokens: # Several output files: not kept in the artifact cache
+            file_list, reader = list_files_to_render(options, local_codebase_directory, reader)
+            render_codebase(options, file_list, output_pdf, local_codebase_directory, reader)
+            return ArtifactMetadata('codebase', manifest_path_for(output_pdf), tree_sha, False, len(file_list), time.perf_counter() - started_at)
+        if options.use_cache and artifact_cache.restore(tree_sha, cache_options, output_pdf): # No-op fast path: nothing came down since this PDF was built
+            print(f"Codebase unchanged (tree {tree_sha[:12]}), restored {output_pdf} from the artifact cache")
+            return ArtifactMetadata('codebase', output_pdf, tree_sha, True, None, time.perf_counter() - started_at)
+
+        file_list, reader = list_files_to_render(options, local_codebase_directory, reader)
+        render_codebase(options, file_list, output_pdf, local_codebase_directory, reader)
+    artifact_cache.store(tree_sha, cache_options, output_pdf)
+    return ArtifactMetadata('codebase', output_pdf, tree_sha, False, len(file_list), time.perf_counter() - started_at)
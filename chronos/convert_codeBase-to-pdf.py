@@ -10,6 +10,9 @@ Functionality:
 * Extracts filenames and orders them based on the structure defined in codeBase-list.md.
 * Utilizes Pandoc to convert the Markdown files into a single, well-structured PDF.
 * Uploads the generated PDF to Google Drive.
+* The conversion itself lives in `chronos/codebase_converter.py`, so other scripts can import and run it.
+* `--backend markdown` / `--backend text` write one .md or .txt bundle instead of a PDF, for AI ingestion.
+* `--backend jsonl` writes the code as retrieval-ready chunks (see `chronos/code_chunks.py`).
 
 **Benefits:**
 
@@ -25,66 +28,76 @@ Date Last Updated: 05/12/2024
 
 """
 
-import os 
-import re # Allows python to use regular expressions for pattern matching. In this case, we use it to extract filenames from the 'codeBase-list.md' file
-import sys # Allows python to interact with the system, in this case, we use it to access command-line arguments
-import subprocess # Allows python to execute external commands, in this case, we use it to pull the latest codebase from GitHub
-from reportlab.lib.styles import getSampleStyleSheet # Allows python to use the default styles for the PDF
-from reportlab.pdfgen import canvas # Allows python to generate a PDF file
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Preformatted, Spacer # Allows python to create a simple document template, paragraphs, and space in the PDF
-from Security.all_access import get_system_username, get_chronos_directory_structure  # Importing the all_access.py file from the Security folder. Which has personal details from the user
-
-# --- Git pull for updating codebase on local computer ---
-def get_latest_codebase_content(local_codebase_directory):
-    
-    # Determine what computer the user is using by the system username
-    username = get_system_username() # function located inside 'all_access.py' file, needed to access the user's home directory
-
-    os.chdir(local_codebase_directory) # Change directory to the codebase location
-    try:
-        subprocess.run(["git", "pull"], check=True) # Run the git pull command to update the codebase on the local computer
-    except subprocess.CalledProcessError as e:
-        print(f"Error updating codebase: {e}") # Print an error message if the git pull command fails
-        
-def extract_filenames_from_codebase_list(local_codebase_directory):
-    file_list = []
-    link_pattern = re.compile(r'\s*\[.*\]\((.*)\)')  # Extracts the filename from a Markdown link, in this case '[Display_Text](filename)'
-    
-    with open(os.path.join(local_codebase_directory, 'codeBase-list.md'), 'r') as file: # Open the 'codeBase-list.md' file in read mode
-        for line in file:
-            match = link_pattern.search(line) # Check if the line matches the link pattern
-            if match:
-                file_list.append(match.group(1)) # If there is a match, extract the filename and add it to the list
-    return file_list # Return the list of filenames extracted from the 'codeBase-list.md' file
-
-def convert_code_to_pdf(file_paths, output_pdf, local_codebase_directory):
-    doc = SimpleDocTemplate(output_pdf, pagesize=(1500, 3600), leftMargin=50)
-    story = []
-    styles = getSampleStyleSheet()
-    code_style = styles['Code']
-
-    for file_path in file_paths:
-        full_path = os.path.join(local_codebase_directory, file_path)
-        with open(full_path, 'r') as file:
-            content = file.read()
-        
-        story.append(Paragraph(f"File: {full_path}", styles['Heading1']))
-        story.append(Spacer(1, 12))
-        
-        preformatted_text = Preformatted(content, code_style)
-        story.append(preformatted_text)
-        story.append(Spacer(1, 12))
-    
-    doc.build(story)
+import argparse # Allows python to read the command-line options, in this case, which PDF backend to use
+import asyncio # Allows python to run the 1Password lookup and the reportlab warm-up at the same time
+import sys # Allows python to interact with the system, in this case, we use it to exit with an error message
+from chronos.artifact_cache import UnknownRevision # Raised by '--from-tree' for a revision git does not know
+from chronos.codebase_converter import CodebaseOptions, build_codebase, restore_codebase, unsupported_options_error, warm_up_reportlab # The conversion itself, importable without running this script
+from Security.all_access import get_chronos_directory_structure_async  # Importing the all_access.py file from the Security folder. Which has personal details from the user
+
+# --- Start-up: overlap the 1Password lookup with reportlab's warm-up ---
+async def prepare_run():
+    # git pull needs local_codebase_directory from 1Password, so only the warm-up can run alongside the lookup
+    directory_structure, _ = await asyncio.gather(
+        get_chronos_directory_structure_async('codebase_directories_and_files'),
+        asyncio.to_thread(warm_up_reportlab),
+    )
+    return directory_structure
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(description="Convert the Chronos codebase listed in codeBase-list.md into one PDF.")
+    parser.add_argument('--backend', choices=['platypus', 'stream', 'markdown', 'text', 'jsonl'],
+                        help="'platypus' (the default) lays the PDF out with reportlab, 'stream' (the default with the stream-only options) writes plain Courier pages straight to disk (constant memory, much faster), "
+                             "'markdown' and 'text' write one .md or .txt bundle with no layout at all (fastest), "
+                             "'jsonl' writes retrieval-ready code chunks, one JSON record per line")
+    parser.add_argument('--incremental', action='store_true',
+                        help="Only lay out files whose content changed since the last run ('stream' only)")
+    parser.add_argument('--jobs', type=int, default=1,
+                        help="Lay out the 'stream' backend's pages (or, for 'jsonl', chunk files) in this many worker processes, 1 runs serially. "
+                             "Only the stream writer runs in parallel: the reportlab ('platypus') layout is always a single process")
+    parser.add_argument('--shard-tokens', type=int, metavar='TOKENS',
+                        help="Write several PDFs of at most this many estimated tokens each, plus a manifest ('stream' only, never served from the artifact cache)")
+    parser.add_argument('--shards', type=int, default=1,
+                        help="Number of PDFs to write when '--shard-tokens' is given (more if the budget needs them, fewer only if there are fewer files and line ranges)")
+    budget = parser.add_mutually_exclusive_group()
+    budget.add_argument('--budget-tokens', type=int, metavar='TOKENS',
+                        help="Export only the highest-priority files that fit this many estimated tokens (oversize files as excerpts)")
+    budget.add_argument('--budget-bytes', type=int, metavar='BYTES', help="Like '--budget-tokens', with the budget in bytes")
+    parser.add_argument('--revision', default='HEAD',
+                        help="Build from this commit of the codebase repository (read from git objects, default HEAD)")
+    parser.add_argument('--working-tree', action='store_true',
+                        help="Read the files from the working tree instead of a git snapshot, to include uncommitted edits")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="Always render (and re-cache), even if a PDF for the current git tree is already cached")
+    parser.add_argument('--from-tree', metavar='REVISION',
+                        help="Restore the cached PDF built from an older revision (commit, tag or tree SHA) instead of building")
+    arguments = parser.parse_args()
+    error = unsupported_options_error(arguments.backend, arguments.incremental, arguments.jobs, arguments.shard_tokens)
+    if error:
+        parser.error(error)
+    return arguments
 
 def main():
-    directory_structure = get_chronos_directory_structure('codebase_directories_and_files')
+    arguments = parse_arguments()
+    directory_structure = asyncio.run(prepare_run())
     local_codebase_directory = directory_structure['local_codebase_directory']
     output_pdf = directory_structure['output_pdf']
 
-    get_latest_codebase_content(local_codebase_directory)
-    file_list = extract_filenames_from_codebase_list(local_codebase_directory)
-    convert_code_to_pdf(file_list, output_pdf, local_codebase_directory)
+    options = CodebaseOptions(backend=arguments.backend, incremental=arguments.incremental, jobs=arguments.jobs,
+                              revision=arguments.revision, working_tree=arguments.working_tree, use_cache=not arguments.no_cache,
+                              shard_tokens=arguments.shard_tokens, shards=arguments.shards,
+                              budget_tokens=arguments.budget_tokens, budget_bytes=arguments.budget_bytes)
+    if arguments.from_tree:
+        try:
+            metadata = restore_codebase(local_codebase_directory, output_pdf, arguments.from_tree, options)
+        except UnknownRevision as e:
+            sys.exit(str(e))
+        if metadata is None:
+            sys.exit(f"No cached codebase output for {arguments.from_tree}")
+        print(f"Restored the codebase output for {arguments.from_tree} to {metadata.output_path}")
+        return
+
+    build_codebase(local_codebase_directory, output_pdf, options)
 
 if __name__ == "__main__":
     main()
@@ -11,6 +11,12 @@ GitHub Wiki repository.
   `_Sidebar.md` file.
 * Utilizes Pandoc to convert your Markdown files into a single, well-structured PDF.
 * Uploads the generated PDF to your Google Drive (future functionality).
+* The conversion itself lives in `chronos/wiki_converter.py`, so other scripts can import and run it.
+* `--format jsonl` writes one JSON record per heading section instead (see `chronos/wiki_sections.py`).
+* `--engine markdown` renders the HTML in-process instead of with pandoc (see `chronos/wiki_markdown.py`).
+* `--engine ast` parses each page once into a cached pandoc AST and writes the combined AST once (see `chronos/wiki_ast.py`).
+* `--incremental` converts and caches every page on its own, so only changed pages are converted (see `chronos/wiki_pages.py`).
+* `--jobs N` converts the pages in N workers with `--incremental`, `--engine markdown` or `--engine ast`.
 
 **Benefits:**
 
@@ -35,88 +41,78 @@ Usage:
 """
 
 
+import argparse # Allows python to read the command-line options, in this case, whether to use the artifact cache
+import asyncio # Allows python to run the 1Password lookup and the pandoc warm-up at the same time
 import os # Allows python to use os commands, similar to the way commands are executed in the terminal
-import re # Allows python to use regular expressions for pattern matching. In this case, we use it to extract filenames from the '_Sidebar.md' file
 import sys
-import subprocess # Allows python to run other programs within the script, in this case "pandoc", the document conversion software
-from Security.all_access import get_system_username, get_chronos_directory_structure  # Importing the all_access.py file from the Security folder the ".." is used to go up one directory
-
-# --- Git pull for updating wiki on local computer ---
-def get_latest_wiki_content(local_wiki_directory):
-    
-    # Determine what computer the user is using by the system username
-    username = get_system_username() # function located inside 'all_access.py' file, needed to access the user's home directory
-
-    os.chdir(local_wiki_directory) # Change directory to the wiki location
-    try:
-        subprocess.run(["git", "pull"], check=True) # Run the git pull command to update the wiki on the local computer
-    except subprocess.CalledProcessError as e:
-        print(f"Error updating wiki: {e}") # Print an error message if the git pull command fails 
-
-
-def extract_filenames_from_sidebar(local_wiki_directory):
-    file_list = []
-    link_pattern = re.compile(r'\s*\[.*\]\((.*)\)')  # Extracts the filename from a Markdown link, in this case '[Display_Text](filename)'
-
-    with open(os.path.join(local_wiki_directory, '_Sidebar.md'), 'r') as sidebar_file: # Open the '_Sidebar.md' file
-        for line in sidebar_file: # Loop through each line in the file
-            match = link_pattern.search(line) # Search for a link pattern in the line
-            if match:
-                filename = match.group(1) + '.md' # Extract the filename from the link and add the '.md'file extension to the end
-                                # group(0) would be everything in the link_pattern, group(1) designates everything in the first set of parentheses.
-                file_list.append(filename)
-                
-    return file_list # Return the list of filenames
-            
-def md_to_pdf_intermediate_patch(local_wiki_directory, file_list):  # This function converts the Markdown file into an HTML format, which better converts to PDF than md.
-    primary_markdown_file = file_list[0]
-    
-    with open(os.path.join(local_wiki_directory, primary_markdown_file), 'r+') as f:
-        primary_markdown_content = f.read() # Read the content of the primary markdown file
-        f.seek(0,0) # Move the file pointer back to the beginning of the file
-        f.write("---\ntitle: 'Choronos-HoM Wiki'\n---\n" + primary_markdown_file) # Write the title to the beginning of the file
-
-# --- Generate a PDF format using "Pandoc" ---
-def generate_pdf(file_list, local_wiki_directory, output_pdf, googleDrive): # Using padoc to convert the markdown files to a PDF
-
-    ordered_markdown_files = file_list # Ensure Correct Ordering of Files Based on '_Sidebar.md'  
-
-    pandoc_command = [
-
-        "pandoc",
-        "--to", "html5", # Convert to HTML5 format
-        "-o", os.path.join(str(googleDrive), str(output_pdf)),  # Output file path
-        "--toc", 
-        "--toc-depth=4",  # Include headings up to level 4 in the ToC
-    ]
-
-    pandoc_command.extend(ordered_markdown_files) # Add the ordered markdown files to the command
-    
-    try:
-        subprocess.run(pandoc_command, cwd=local_wiki_directory)  # Run the pandoc command in the wiki directory
-    except FileNotFoundError as e:
-        missing_file = str(e).split("'")[1]  # Extract the missing file name from the error message
-        print(f"Error: The file '{missing_file}' is missing. Please create the file and try again.")
-        sys.exit(1)  # Terminate the script with a non-zero exit code to indicate an error
-    except subprocess.CalledProcessError as e:
-        print(f"Error running Pandoc: {e}")
-        sys.exit(1)
+from chronos.artifact_cache import UnknownRevision # Raised by '--from-tree' for a revision git does not know
+from chronos.wiki_converter import WikiConversionError, WikiOptions, build_wiki, restore_wiki, warm_up_pandoc # The conversion itself, importable without running this script
+from Security.all_access import get_chronos_directory_structure_async  # Importing the all_access.py file from the Security folder the ".." is used to go up one directory
+
+# --- Start-up: overlap the 1Password lookup with pandoc's warm-up ---
+async def prepare_run():
+    # git pull needs local_wiki_directory from 1Password, so only the warm-up can run alongside the lookup
+    directory_structure, _ = await asyncio.gather(
+        get_chronos_directory_structure_async('wiki_directories_and_files'),
+        warm_up_pandoc(),
+    )
+    return directory_structure
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(description="Convert the Chronos GitHub wiki, in _Sidebar.md order, into one document.")
+    parser.add_argument('--format', choices=['html', 'jsonl'], default='html',
+                        help="'html' converts the wiki into one document with pandoc, 'jsonl' writes one record per heading section for retrieval")
+    parser.add_argument('--engine', choices=['pandoc', 'markdown', 'ast'], default='pandoc',
+                        help="HTML renderer: the pandoc binary, Python-Markdown in this process (used automatically when pandoc is missing), "
+                             "or 'ast': pandoc with every page's parsed AST cached, so only changed pages are parsed again")
+    parser.add_argument('--incremental', action='store_true',
+                        help="Convert the pages one by one and reuse the cached conversion of every page whose content did not change")
+    parser.add_argument('--jobs', type=int, default=1,
+                        help="Convert the pages in this many workers (pandoc processes, or processes running the markdown engine); "
+                             "needs '--incremental', '--engine markdown' or '--engine ast'")
+    parser.add_argument('--revision', default='HEAD',
+                        help="Convert this commit of the wiki repository (read from git objects, default HEAD)")
+    parser.add_argument('--working-tree', action='store_true',
+                        help="Read the pages from the working tree instead of a git snapshot, to include uncommitted edits")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="Always convert (and re-cache), even if the output for the current git tree is already cached")
+    parser.add_argument('--from-tree', metavar='REVISION',
+                        help="Restore the cached output built from an older revision (commit, tag or tree SHA) instead of converting")
+    arguments = parser.parse_args()
+    if arguments.jobs > 1 and arguments.format == 'html' and arguments.engine == 'pandoc' and not arguments.incremental:
+        parser.error("--jobs converts pages one by one: add '--incremental', or use '--engine markdown' or '--engine ast'")
+    return arguments
 
 def main():
+    arguments = parse_arguments()
+
     # Get directory structure and file names from 1Password
-    directory_structure = get_chronos_directory_structure('wiki_directories_and_files')
+    directory_structure = asyncio.run(prepare_run())
     
     # Accessing values
     local_wiki_directory = directory_structure['local_wiki_directory']
     output_pdf = directory_structure['output_pdf']
     google_drive = directory_structure['google_drive']    
-    
-    user_directory = get_system_username() # Get the system username
-    
-    get_latest_wiki_content(local_wiki_directory) # Updates the wiki on the local computer
-    file_list = extract_filenames_from_sidebar(local_wiki_directory) # Stores the returned file_list
-    md_to_pdf_intermediate_patch(local_wiki_directory, file_list) # convert the markdown files to an HTML format
-    generate_pdf(file_list, local_wiki_directory, output_pdf, google_drive) # Generate the PDF file
+    output_path = os.path.join(str(google_drive), str(output_pdf))
+
+    options = WikiOptions(revision=arguments.revision, working_tree=arguments.working_tree, use_cache=not arguments.no_cache,
+                          output_format=arguments.format, engine=arguments.engine, incremental=arguments.incremental,
+                          jobs=arguments.jobs)
+    if arguments.from_tree:
+        try:
+            metadata = restore_wiki(local_wiki_directory, output_path, arguments.from_tree, options)
+        except UnknownRevision as e:
+            sys.exit(str(e))
+        if metadata is None:
+            sys.exit(f"No cached wiki output for {arguments.from_tree}")
+        print(f"Restored the wiki output for {arguments.from_tree} to {metadata.output_path}")
+        return
+
+    try:
+        build_wiki(local_wiki_directory, output_path, options)
+    except WikiConversionError as e:
+        print(f"Error: {e}")
+        sys.exit(1)  # Terminate the script with a non-zero exit code to indicate an error
     
 # --- Main Execution ---
 if __name__ == "__main__":
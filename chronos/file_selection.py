@@ -0,0 +1,130 @@
+"""
+File Name: file_selection.py
+
+Purpose: Keeps the codebase export inside a byte or token budget without hand-editing codeBase-list.md.
+Entries in the list can carry a priority; the most important files are exported whole, oversize files as a
+head/tail excerpt, and whatever does not fit is left out.
+
+**Functionality:**
+
+* `parse_priority()` reads an optional priority from a codeBase-list.md line, written after the link:
+  `* [Display_Text](path/to/file.py) <!-- priority: 5 -->` (an HTML comment, so GitHub does not show it)
+  or `* [Display_Text](path/to/file.py) priority=5`. Entries without one have DEFAULT_PRIORITY.
+* `select_files()` takes the entries from the highest priority down (codeBase-list.md order breaks ties).
+  A file that fits the remaining budget is taken whole; one that does not is replaced by its first and last lines.
+* `ExcerptReader` wraps a RepositorySnapshot or WorkingTree and serves the excerpts in place of the full files,
+  so every backend (platypus, stream, '--jobs', '--shard-tokens') renders the selection unchanged.
+
+**Instructions:**
+
+1. Add priorities to codeBase-list.md where the default order is not right.
+2. Run 'convert_codeBase-to-pdf.py --budget-tokens 400000' (or '--budget-bytes 1500000').
+
+Author: Beau Magnum
+
+Date: 2026-10-18
+
+"""
+import hashlib
+import re
+from dataclasses import dataclass
+from chronos.sharding import estimate_tokens
+
+DEFAULT_PRIORITY = 1
+EXCERPT_HEAD_LINES = 80 # Lines kept from the start of an oversize file (imports, module docstring, main classes)
+EXCERPT_TAIL_LINES = 20 # Lines kept from its end (entry points, __main__)
+MINIMUM_EXCERPT_LINES = 10 # Smaller excerpts than this are not worth their heading
+
+PRIORITY_PATTERN = re.compile(r'priority\s*[:=]\s*(-?\d+(?:\.\d+)?)', re.IGNORECASE)
+
+@dataclass
+class CodebaseEntry:
+    path: str
+    priority: float = DEFAULT_PRIORITY
+
+def parse_priority(text):
+    match = PRIORITY_PATTERN.search(text)
+    return float(match.group(1)) if match else DEFAULT_PRIORITY
+
+def measure(text, unit):
+    return estimate_tokens(text) if unit == 'tokens' else len(text.encode('utf-8'))
+
+def make_excerpt(text, head_lines, tail_lines):
+    lines = text.splitlines(keepends=True)
+    omitted = len(lines) - head_lines - tail_lines
+    if omitted <= 0:
+        return text
+    head = ''.join(lines[:head_lines])
+    if not head.endswith('\n'):
+        head += '\n'
+    marker = f"\n# ... {omitted} lines omitted to fit the export budget ...\n\n"
+    return head + marker + ''.join(lines[len(lines) - tail_lines:])
+
+def fit_excerpt(text, remaining, unit):
+    # Largest head/tail excerpt (halving from the default size) that fits the remaining budget, or None
+    head_lines, tail_lines = EXCERPT_HEAD_LINES, EXCERPT_TAIL_LINES
+    while head_lines + tail_lines >= MINIMUM_EXCERPT_LINES:
+        excerpt = make_excerpt(text, head_lines, tail_lines)
+        if measure(excerpt, unit) <= remaining:
+            return excerpt
+        head_lines, tail_lines = head_lines // 2, tail_lines // 2
+    return None
+
+def select_files(entries, reader, budget, unit='tokens'):
+    # Returns (file_list in codeBase-list.md order, {path: excerpt text}, [skipped paths])
+    remaining = budget
+    chosen, excerpts, skipped = set(), {}, []
+    ranked = sorted(range(len(entries)), key=lambda index: (-entries[index].priority, index))
+    for index in ranked:
+        path = entries[index].path
+        text = reader.read_text(path)
+        size = measure(text, unit)
+        if size <= remaining:
+            chosen.add(path)
+            remaining -= size
+            continue
+        excerpt = fit_excerpt(text, remaining, unit)
+        if excerpt is None:
+            skipped.append(path)
+            continue
+        chosen.add(path)
+        excerpts[path] = excerpt
+        remaining -= measure(excerpt, unit)
+    file_list = [entry.path for entry in entries if entry.path in chosen]
+    return file_list, excerpts, skipped
+
+class ExcerptReader:
+    # Same read()/read_text() interface as the reader it wraps, with the excerpts in place of the full files
+    def __init__(self, reader, excerpts):
+        self.reader = reader
+        self.excerpts = excerpts
+
+    @property
+    def repository_directory(self):
+        return self.reader.repository_directory
+
+    @property
+    def tree_sha(self):
+        return self.reader.tree_sha
+
+    @property
+    def commit_sha(self):
+        return getattr(self.reader, 'commit_sha', None)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def read(self, path):
+        if path not in self.excerpts:
+            return self.reader.read(path)
+        content = self.excerpts[path].encode('utf-8')
+        return content, hashlib.sha256(content).hexdigest()
+
+    def read_text(self, path):
+        return self.read(path)[0].decode('utf-8', errors='replace')
+
+    def close(self):
+        self.reader.close()
@@ -0,0 +1,161 @@
+"""
+File Name: git_snapshot.py
+
+Purpose: Reads the converters' inputs straight from git objects at one pinned commit, instead of opening files in
+a working tree that a pull (or an editor) can change halfway through a build.
+
+**Functionality:**
+
+* `RepositorySnapshot` resolves a revision to a commit once, lists its files with `git ls-tree` and streams blobs
+  from one long-lived `git cat-file --batch` process.
+* Every file comes with its blob SHA, which the build caches use directly as the content key.
+* `is_transient_git_error()` tells a network failure of 'git pull' (worth a retry) from a conflict or a bad
+  repository (not worth one).
+* `WorkingTree` offers the same `read()` / `tree_sha` interface over plain files, for builds that must include
+  uncommitted edits ('--working-tree').
+
+**Instructions:**
+
+1. `with RepositorySnapshot(local_codebase_directory) as snapshot:`
+2. `content_bytes, blob_sha = snapshot.read('path/in/repo.py')`
+3. `open_reader()` picks a snapshot, or the working tree when asked to (or when the directory is not a git repository).
+
+Author: Beau Magnum
+
+Date: 2026-10-18
+
+"""
+import errno
+import hashlib
+import os
+import posixpath
+import subprocess
+import threading
+from chronos.artifact_cache import get_tree_sha
+from Utilities.subprocess_runner import run_command
+
+GIT_TIMEOUT_SECONDS = 60
+GIT_TRANSIENT_ERRORS = ('Could not resolve host', 'Connection timed out', 'Connection refused', 'Connection reset',
+                        'Operation timed out', 'The remote end hung up', 'early EOF', 'unable to access', 'RPC failed')
+
+def is_transient_git_error(error):
+    # git's exit code (1 or 128) is the same for network failures and for conflicts or a bad repository, only its message tells them apart
+    return any(message in (error.stderr or '') for message in GIT_TRANSIENT_ERRORS)
+
+def normalize_repository_path(path):
+    # Manifest links may be written as './dir/file' or '/dir/file'; git trees use 'dir/file'
+    return posixpath.normpath(path.replace(os.sep, '/')).lstrip('/')
+
+def _missing(path):
+    return FileNotFoundError(errno.ENOENT, "No such file in the repository snapshot", path)
+
+class RepositorySnapshot:
+    def __init__(self, repository_directory, revision='HEAD'):
+        self.repository_directory = repository_directory
+        self.commit_sha = self._git("rev-parse", "--verify", f"{revision}^{{commit}}").strip()
+        self.tree_sha = self._git("rev-parse", f"{self.commit_sha}^{{tree}}").strip()
+        self._entries = None
+        self._process = None
+        self._lock = threading.Lock() # One request/response at a time on the cat-file pipes
+
+    def __getstate__(self):
+        # Worker processes get the pinned commit and open their own cat-file process when they first read
+        state = self.__dict__.copy()
+        state.update(_process=None, _lock=None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _git(self, *arguments):
+        return run_command(["git", *arguments], stage=f"git {arguments[0]}", timeout=GIT_TIMEOUT_SECONDS,
+                           cwd=self.repository_directory, capture_output=True, text=True, check=True).stdout
+
+    def list_files(self):
+        # {path: blob SHA} for every file in the pinned commit
+        if self._entries is None:
+            entries = {}
+            for record in self._git("ls-tree", "-r", "-z", "--full-tree", self.commit_sha).split('\0'):
+                if record:
+                    metadata, path = record.split('\t', 1)
+                    _, object_type, object_sha = metadata.split()
+                    if object_type == 'blob':
+                        entries[path] = object_sha
+            self._entries = entries
+        return self._entries
+
+    def blob_sha(self, path):
+        object_sha = self.list_files().get(normalize_repository_path(path))
+        if object_sha is None:
+            raise _missing(path)
+        return object_sha
+
+    def _cat_file(self, object_sha):
+        with self._lock:
+            if self._process is None or self._process.poll() is not None:
+                self._process = subprocess.Popen(["git", "cat-file", "--batch"], cwd=self.repository_directory,
+                                                 stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+            self._process.stdin.write(object_sha.encode() + b'\n')
+            self._process.stdin.flush()
+            header = self._process.stdout.readline().split() # '<sha> <type> <size>' or '<sha> missing'
+            if len(header) != 3:
+                raise _missing(object_sha)
+            content = self._process.stdout.read(int(header[2]))
+            self._process.stdout.read(1) # Every object is followed by a newline
+            return content
+
+    def read(self, path):
+        # Returns (content bytes, blob SHA) of 'path' at the pinned commit
+        object_sha = self.blob_sha(path)
+        return self._cat_file(object_sha), object_sha
+
+    def read_text(self, path):
+        return self.read(path)[0].decode('utf-8', errors='replace')
+
+    def close(self):
+        if self._process is not None:
+            self._process.stdin.close()
+            self._process.wait()
+            self._process.stdout.close()
+            self._process = None
+
+class WorkingTree:
+    def __init__(self, directory):
+        self.repository_directory = directory
+
+    @property
+    def tree_sha(self):
+        return get_tree_sha(self.repository_directory) # None when there are local edits
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+    def read(self, path):
+        with open(os.path.join(self.repository_directory, path), 'rb') as file:
+            content = file.read()
+        return content, hashlib.sha256(content).hexdigest()
+
+    def read_text(self, path):
+        return self.read(path)[0].decode('utf-8', errors='replace')
+
+    def close(self):
+        pass
+
+def open_reader(directory, revision='HEAD', working_tree=False):
+    if working_tree:
+        return WorkingTree(directory)
+    try:
+        return RepositorySnapshot(directory, revision)
+    except (OSError, subprocess.SubprocessError) as e:
+        print(f"Reading {directory} from the working tree instead of a git snapshot: {e}")
+        return WorkingTree(directory)
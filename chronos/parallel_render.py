@@ -0,0 +1,68 @@
+"""
+File Name: parallel_render.py
+
+Purpose: Lays out the codebase PDF in several worker processes. Each file is rendered to its own intermediate PDF
+in a process pool, then `pdf_concat.concatenate_pdfs()` merges the parts in codeBase-list.md order. The merge runs
+in the parent process, and how the layout scales with cores has not been measured.
+
+**Functionality:**
+
+* `render_section_pdf()` is the worker: one file in, one intermediate PDF (without page numbers) out.
+* Workers share the on-disk segment cache when one is given, so '--jobs' and '--incremental' combine.
+* The merge adds one bookmark per file and page numbers for the whole document.
+* Workers are started with 'spawn': 'python -m chronos' runs the build in a worker thread, and forking a threaded
+  process can copy a lock that another thread holds.
+
+**Instructions:**
+
+1. `write_codebase_pdf_parallel(file_list, output_pdf, local_codebase_directory, jobs=8)`
+2. Or run 'convert_codeBase-to-pdf.py --jobs 8'.
+
+Author: Beau Magnum
+
+Date: 2026-10-18
+
+"""
+import multiprocessing
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from chronos.pdf_concat import concatenate_pdfs
+from chronos.git_snapshot import WorkingTree
+from chronos.pdf_stream_writer import CodeLayout, StreamingPdfWriter, file_heading, file_pages
+from chronos.segment_cache import SegmentCache
+
+_worker_readers = {} # One reader per worker process, so a snapshot starts one cat-file process per worker, not per file
+
+def _worker_reader(reader):
+    # Every task brings its own unpickled copy of the reader; the first copy a worker sees is the one it keeps
+    key = (type(reader).__name__, reader.repository_directory, getattr(reader, 'commit_sha', None))
+    return _worker_readers.setdefault(key, reader)
+
+def render_section_pdf(reader, file_path, heading, part_pdf, layout, segment_cache_directory=None):
+    # Runs in a worker process; returns True if the pages came from the segment cache
+    reader = _worker_reader(reader)
+    segment_cache = SegmentCache(segment_cache_directory) if segment_cache_directory else None
+    pages = file_pages(reader, file_path, heading, layout, segment_cache)
+    with StreamingPdfWriter(part_pdf, layout, number_pages=False) as writer:
+        for page in pages:
+            writer.add_page(page)
+    return bool(segment_cache and segment_cache.hits)
+
+def write_codebase_pdf_parallel(file_paths, output_pdf, local_codebase_directory, layout=CodeLayout(), jobs=None, segment_cache_directory=None,
+                                reader=None):
+    # Returns (files laid out, files reused from the segment cache)
+    jobs = jobs or os.cpu_count()
+    reader = reader or WorkingTree(local_codebase_directory)
+    count = len(file_paths)
+    with tempfile.TemporaryDirectory(prefix='chronos-parts-') as parts_directory:
+        headings = [file_heading(local_codebase_directory, file_path) for file_path in file_paths]
+        part_paths = [os.path.join(parts_directory, f"{index:06d}.pdf") for index in range(count)]
+        with ProcessPoolExecutor(max_workers=jobs, mp_context=multiprocessing.get_context('spawn')) as executor: # Never fork from a worker thread
+            chunk_size = max(1, count // (jobs * 4)) # Fewer round trips for codebases with hundreds of small files
+            cache_hits = list(executor.map(render_section_pdf, [reader] * count, file_paths, headings, part_paths, [layout] * count,
+                                           [segment_cache_directory] * count, chunksize=chunk_size))
+
+        concatenate_pdfs(list(zip(part_paths, headings)), output_pdf, layout)
+    reused = sum(cache_hits)
+    return count - reused, reused
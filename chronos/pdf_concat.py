@@ -0,0 +1,83 @@
+"""
+File Name: pdf_concat.py
+
+Purpose: Merges the per-file PDFs written by `StreamingPdfWriter` into one document, with one bookmark per
+section and page numbers that run across the whole output.
+
+**Functionality:**
+
+* `read_page_streams()` follows the xref table, page tree and /Contents arrays of a StreamingPdfWriter PDF and
+  returns each page's content stream, still compressed. It is not a general PDF parser.
+* `concatenate_pdfs()` copies those streams into a new StreamingPdfWriter without decompressing them, then adds
+  the bookmarks and the running page numbers.
+
+**Instructions:**
+
+1. Write each part with `StreamingPdfWriter(part_path, number_pages=False)`, so the parts carry no page numbers.
+2. `concatenate_pdfs([(part_path, bookmark_title), ...], output_pdf)`
+
+Author: Beau Magnum
+
+Date: 2026-10-18
+
+"""
+import re
+from chronos.pdf_stream_writer import CodeLayout, StreamingPdfWriter
+
+_REFERENCE = re.compile(rb'(\d+) 0 R')
+
+class PdfPartReader:
+    def __init__(self, path):
+        with open(path, 'rb') as file:
+            self.data = file.read()
+        self.offsets = self._read_xref()
+
+    def _read_xref(self):
+        start = int(re.search(rb'startxref\s+(\d+)\s+%%EOF\s*$', self.data).group(1))
+        header = re.compile(rb'xref\s+0 (\d+)\s+').match(self.data, start)
+        count, position = int(header.group(1)), header.end()
+        offsets = {}
+        for object_id in range(count):
+            entry = self.data[position + object_id * 20:position + object_id * 20 + 18] # Every xref entry is exactly 20 bytes
+            if entry.endswith(b'n'):
+                offsets[object_id] = int(entry[:10])
+        return offsets
+
+    def _object(self, object_id):
+        # Returns (dictionary bytes, stream bytes or None) for an object of this file
+        start = self.offsets[object_id]
+        body_start = self.data.index(b'obj\n', start) + 4
+        stream_marker = self.data.find(b'\nstream\n', body_start, self.data.index(b'endobj', body_start))
+        if stream_marker < 0:
+            return self.data[body_start:self.data.index(b'\nendobj', body_start)], None
+        dictionary = self.data[body_start:stream_marker]
+        length = int(re.search(rb'/Length (\d+)', dictionary).group(1))
+        stream_start = stream_marker + len(b'\nstream\n')
+        return dictionary, self.data[stream_start:stream_start + length]
+
+    def page_streams(self):
+        trailer = self.data[self.data.rindex(b'trailer'):]
+        root_id = int(re.search(rb'/Root (\d+) 0 R', trailer).group(1))
+        pages_id = int(re.search(rb'/Pages (\d+) 0 R', self._object(root_id)[0]).group(1))
+        kids = re.search(rb'/Kids \[([^\]]*)\]', self._object(pages_id)[0]).group(1)
+        for page_id in _REFERENCE.findall(kids):
+            contents = re.search(rb'/Contents \[([^\]]*)\]', self._object(int(page_id))[0]).group(1)
+            streams = []
+            for content_id in _REFERENCE.findall(contents):
+                dictionary, stream = self._object(int(content_id))
+                streams.append((stream, b'/FlateDecode' in dictionary))
+            yield streams
+
+def read_page_streams(path):
+    return list(PdfPartReader(path).page_streams())
+
+def concatenate_pdfs(sections, output_pdf, layout=CodeLayout()):
+    # 'sections' is a list of (part_path, bookmark_title); returns the number of pages written
+    with StreamingPdfWriter(output_pdf, layout) as writer:
+        for part_path, title in sections:
+            first_page = writer.page_count
+            for streams in PdfPartReader(part_path).page_streams():
+                (content, compressed), = streams # Parts are written without page numbers, so one stream per page
+                writer.add_page(content, compressed)
+            writer.add_bookmark(title, first_page)
+        return writer.page_count
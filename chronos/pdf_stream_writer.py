@@ -0,0 +1,225 @@
+"""
+File Name: pdf_stream_writer.py
+
+Purpose: A minimal PDF writer for the codebase export. Pages are written straight to disk as each file is read,
+instead of building a reportlab story for the whole codebase before `doc.build`.
+
+**Functionality:**
+
+* Uses the standard, non-embedded Courier fonts, so there is no font subsetting or text measuring to do.
+* `layout_code_pages()` turns one file into page content streams (heading, wrapped monospaced lines).
+* `StreamingPdfWriter` writes each page as soon as it is added and keeps only object offsets in memory,
+  then writes the page tree, the bookmarks (one per file), the xref table and the trailer on `close()`.
+* `write_codebase_pdf()` is the drop-in alternative to `convert_code_to_pdf` ('--backend stream').
+
+**Instructions:**
+
+1. `write_codebase_pdf(file_list, output_pdf, local_codebase_directory, reader=snapshot)`
+2. Every file starts on a new page, so each file's pages only depend on that file. That is what lets
+   `segment_cache.SegmentCache` reuse the pages of unchanged files across runs.
+
+Author: Beau Magnum
+
+Date: 2026-10-18
+
+"""
+import os
+import zlib
+from dataclasses import dataclass
+from chronos.git_snapshot import WorkingTree
+from chronos.segment_cache import segment_key
+
+@dataclass(frozen=True)
+class CodeLayout:
+    # Matches the platypus backend: same page size and margins, 'Code' style text, 'Heading1' sized file headings
+    page_width: float = 1500
+    page_height: float = 3600
+    left_margin: float = 50
+    right_margin: float = 72
+    top_margin: float = 72
+    bottom_margin: float = 72
+    code_indent: float = 36
+    font_size: float = 8
+    leading: float = 8.8
+    heading_size: float = 18
+    heading_leading: float = 22
+    tab_size: int = 4
+
+    @property
+    def characters_per_line(self):
+        usable_width = self.page_width - self.left_margin - self.right_margin - self.code_indent
+        return max(1, int(usable_width / (0.6 * self.font_size))) # Every Courier glyph is 600/1000 of the font size wide
+
+    @property
+    def lines_per_page(self):
+        usable_height = self.page_height - self.top_margin - self.bottom_margin
+        return max(1, int(usable_height / self.leading))
+
+def _pdf_string(text):
+    # Literal string in WinAnsiEncoding, which the standard fonts use; unmappable characters become '?'
+    encoded = text.encode('cp1252', errors='replace')
+    return b'(' + encoded.replace(b'\\', b'\\\\').replace(b'(', b'\\(').replace(b')', b'\\)').replace(b'\r', b'') + b')'
+
+def _pdf_text_string(text):
+    # Bookmark titles are PDF "text strings": UTF-16BE with a byte order mark handles any file name
+    return b'<' + ('\ufeff' + text).encode('utf-16-be').hex().upper().encode() + b'>'
+
+def _wrap_lines(text, layout):
+    width = layout.characters_per_line
+    for line in text.split('\n'):
+        line = line.rstrip('\r').expandtabs(layout.tab_size)
+        if len(line) <= width:
+            yield line
+            continue
+        for start in range(0, len(line), width):
+            yield line[start:start + width]
+
+def _page_stream(lines, layout, heading=None):
+    parts = [b'BT']
+    top = layout.page_height - layout.top_margin
+    if heading is not None:
+        parts.append(b'/F2 %g Tf %g %g Td %s Tj' % (layout.heading_size, layout.left_margin, top - layout.heading_size, _pdf_string(heading)))
+        parts.append(b'ET BT')
+        top -= layout.heading_leading + 12 # The platypus backend puts a 12pt spacer under each heading
+    parts.append(b'/F1 %g Tf %g TL %g %g Td' % (layout.font_size, layout.leading, layout.left_margin + layout.code_indent, top))
+    for line in lines:
+        parts.append(_pdf_string(line) + b" '") # ' moves to the next line, then shows the string
+    parts.append(b'ET')
+    return b'\n'.join(parts)
+
+def layout_code_pages(heading, text, layout=CodeLayout()):
+    # Returns one content stream (bytes) per page; the first page starts with the file heading
+    heading_lines = int((layout.heading_leading + 12) / layout.leading) + 1
+    pages, page_lines = [], []
+    capacity = layout.lines_per_page - heading_lines
+    for line in _wrap_lines(text, layout):
+        if len(page_lines) >= capacity:
+            pages.append(_page_stream(page_lines, layout, heading if not pages else None))
+            page_lines, capacity = [], layout.lines_per_page
+        page_lines.append(line)
+    pages.append(_page_stream(page_lines, layout, heading if not pages else None))
+    return pages
+
+class StreamingPdfWriter:
+    def __init__(self, path, layout=CodeLayout(), number_pages=True, compress=True):
+        self.layout = layout
+        self.number_pages = number_pages
+        self.compress = compress
+        self.file = open(path, 'wb')
+        self.offsets = {} # Object number -> byte offset, the only per-object state kept in memory
+        self.object_count = 0
+        self.page_ids = []
+        self.bookmarks = [] # (title, page index)
+
+        self.file.write(b'%PDF-1.4\n%\xe2\xe3\xcf\xd3\n')
+        self.catalog_id = self._new_id() # Catalog and page tree are written last, once every page is known
+        self.pages_id = self._new_id()
+        self.regular_font_id = self._write_object(b'<< /Type /Font /Subtype /Type1 /BaseFont /Courier /Encoding /WinAnsiEncoding >>')
+        self.bold_font_id = self._write_object(b'<< /Type /Font /Subtype /Type1 /BaseFont /Courier-Bold /Encoding /WinAnsiEncoding >>')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @property
+    def page_count(self):
+        return len(self.page_ids)
+
+    def _new_id(self):
+        self.object_count += 1
+        return self.object_count
+
+    def _write_object(self, body, object_id=None):
+        object_id = object_id or self._new_id()
+        self.offsets[object_id] = self.file.tell()
+        self.file.write(b'%d 0 obj\n' % object_id + body + b'\nendobj\n')
+        return object_id
+
+    def _write_stream(self, data, compressed=False):
+        # 'compressed' streams are already Flate-encoded (copied from another PDF) and are written as they are
+        if self.compress and not compressed:
+            data, compressed = zlib.compress(data), True
+        if compressed:
+            return self._write_object(b'<< /Length %d /Filter /FlateDecode >>\nstream\n' % len(data) + data + b'\nendstream')
+        return self._write_object(b'<< /Length %d >>\nstream\n' % len(data) + data + b'\nendstream')
+
+    def _page_number_stream(self, number):
+        layout = self.layout
+        label = _pdf_string(f"Page {number}")
+        return b'BT /F1 %g Tf %g %g Td %s Tj ET' % (layout.font_size, layout.page_width - layout.right_margin - 60, layout.bottom_margin / 2, label)
+
+    def add_page(self, content, compressed=False):
+        content_ids = [self._write_stream(content, compressed)]
+        if self.number_pages:
+            content_ids.append(self._write_stream(self._page_number_stream(self.page_count + 1)))
+        contents = b' '.join(b'%d 0 R' % content_id for content_id in content_ids)
+        page_id = self._write_object(
+            b'<< /Type /Page /Parent %d 0 R /MediaBox [0 0 %g %g] /Resources << /Font << /F1 %d 0 R /F2 %d 0 R >> >> /Contents [%s] >>'
+            % (self.pages_id, self.layout.page_width, self.layout.page_height, self.regular_font_id, self.bold_font_id, contents))
+        self.page_ids.append(page_id)
+        return self.page_count - 1
+
+    def add_bookmark(self, title, page_index):
+        self.bookmarks.append((title, page_index))
+
+    def _write_outlines(self):
+        if not self.bookmarks:
+            return None
+        outlines_id = self._new_id()
+        item_ids = [self._new_id() for _ in self.bookmarks]
+        for position, (title, page_index) in enumerate(self.bookmarks):
+            links = b''
+            if position > 0:
+                links += b' /Prev %d 0 R' % item_ids[position - 1]
+            if position < len(item_ids) - 1:
+                links += b' /Next %d 0 R' % item_ids[position + 1]
+            self._write_object(b'<< /Title %s /Parent %d 0 R%s /Dest [%d 0 R /XYZ 0 %g 0] >>'
+                               % (_pdf_text_string(title), outlines_id, links, self.page_ids[page_index], self.layout.page_height),
+                               item_ids[position])
+        self._write_object(b'<< /Type /Outlines /First %d 0 R /Last %d 0 R /Count %d >>' % (item_ids[0], item_ids[-1], len(item_ids)), outlines_id)
+        return outlines_id
+
+    def close(self):
+        if self.file.closed:
+            return
+        outlines_id = self._write_outlines()
+        kids = b' '.join(b'%d 0 R' % page_id for page_id in self.page_ids)
+        self._write_object(b'<< /Type /Pages /Kids [%s] /Count %d >>' % (kids, self.page_count), self.pages_id)
+        outline_entry = b' /Outlines %d 0 R /PageMode /UseOutlines' % outlines_id if outlines_id else b''
+        self._write_object(b'<< /Type /Catalog /Pages %d 0 R%s >>' % (self.pages_id, outline_entry), self.catalog_id)
+
+        xref_offset = self.file.tell()
+        self.file.write(b'xref\n0 %d\n0000000000 65535 f \n' % (self.object_count + 1))
+        for object_id in range(1, self.object_count + 1):
+            self.file.write(b'%010d 00000 n \n' % self.offsets[object_id])
+        self.file.write(b'trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (self.object_count + 1, self.catalog_id, xref_offset))
+        self.file.close()
+
+def file_pages(reader, file_path, heading, layout=CodeLayout(), segment_cache=None):
+    # Returns the pages of one file, laid out fresh or taken from the segment cache.
+    # 'reader' is a RepositorySnapshot or WorkingTree; its content hash (the blob SHA for snapshots) keys the cache
+    content_bytes, content_hash = reader.read(file_path)
+    if segment_cache is None:
+        return layout_code_pages(heading, content_bytes.decode('utf-8', errors='replace'), layout)
+
+    key = segment_key(heading, content_hash, layout)
+    pages = segment_cache.load(key)
+    if pages is None:
+        pages = layout_code_pages(heading, content_bytes.decode('utf-8', errors='replace'), layout)
+        segment_cache.store(key, pages)
+    return pages
+
+def file_heading(local_codebase_directory, file_path):
+    return f"File: {os.path.join(local_codebase_directory, file_path)}"
+
+def write_codebase_pdf(file_paths, output_pdf, local_codebase_directory, layout=CodeLayout(), segment_cache=None, reader=None):
+    reader = reader or WorkingTree(local_codebase_directory)
+    with StreamingPdfWriter(output_pdf, layout) as writer:
+        for file_path in file_paths:
+            heading = file_heading(local_codebase_directory, file_path)
+            first_page = writer.page_count
+            for page in file_pages(reader, file_path, heading, layout, segment_cache): # Only this file's pages are in memory at any time
+                writer.add_page(page)
+            writer.add_bookmark(heading, first_page)
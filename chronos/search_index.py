@@ -0,0 +1,221 @@
+"""
+File Name: search_index.py
+
+Purpose: Answers "where is X discussed" from a local BM25 index over the Chronos wiki and codebase, instead of
+scrolling through the exported PDF. The index is a SQLite file, so a query only reads the postings of its terms.
+
+**Functionality:**
+
+* The corpus is exactly what the exports contain: the pages `extract_filenames_from_sidebar()` returns and the
+  files `extract_filenames_from_codebase_list()` returns, read from a pinned git snapshot.
+* Wiki pages are indexed per heading section (`wiki_sections.split_page()`), code per chunk (`code_chunks.chunk_file()`),
+  so a hit points at a section or a line range rather than a whole file.
+* Identifiers are also indexed by their parts ('get_tree_sha' matches 'tree', 'loadAllStructures' matches 'structures').
+* Updates are incremental: a file whose content hash did not change is not re-indexed, and files that left the
+  lists are removed. A listed file that does not exist is reported, skipped and dropped from the index, so one
+  stale link does not abort the update.
+* The index lives in ~/.cache/chronos/search/index.sqlite (CHRONOS_CACHE_DIR moves it).
+
+**Instructions:**
+
+1. `python -m chronos.search_index build` (1Password supplies the two repository directories)
+2. `python -m chronos.search_index query "artifact cache eviction" [--limit 10]`
+
+Author: Beau Magnum
+
+Date: 2026-10-18
+
+"""
+import argparse # Allows python to read the command-line options
+import math
+import os
+import re
+import sqlite3
+import sys
+import time
+from collections import Counter
+from chronos.code_chunks import CHUNK_FORMAT_VERSION, chunk_file
+from chronos.codebase_converter import extract_filenames_from_codebase_list
+from chronos.git_snapshot import open_reader
+from chronos.segment_cache import get_cache_root
+from chronos.wiki_converter import TOC_DEPTH, extract_filenames_from_sidebar
+from chronos.wiki_sections import SECTION_FORMAT_VERSION, split_page
+from Security.all_access import load_all_structures # The repository locations, for 'build'
+
+BM25_K1 = 1.2 # Term-frequency saturation
+BM25_B = 0.75 # Document-length normalisation
+INDEX_FORMAT_VERSION = 1 # Bump when tokenize() or the document units change; the index is then rebuilt
+STORED_VERSION = f"{INDEX_FORMAT_VERSION}.{CHUNK_FORMAT_VERSION}.{SECTION_FORMAT_VERSION}" # New chunking or sectioning rules change the documents too
+
+WORD_PATTERN = re.compile(r'[A-Za-z0-9_]+')
+IDENTIFIER_PART_PATTERN = re.compile(r'[A-Z]+(?![a-z])|[A-Z]?[a-z]+|[0-9]+')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS sources (corpus TEXT, path TEXT, content_hash TEXT, PRIMARY KEY (corpus, path));
+CREATE TABLE IF NOT EXISTS documents (id INTEGER PRIMARY KEY, corpus TEXT, path TEXT, location TEXT, length INTEGER, text TEXT);
+CREATE TABLE IF NOT EXISTS postings (term TEXT, document_id INTEGER, frequency INTEGER);
+CREATE INDEX IF NOT EXISTS postings_by_term ON postings (term);
+CREATE INDEX IF NOT EXISTS postings_by_document ON postings (document_id);
+CREATE INDEX IF NOT EXISTS documents_by_source ON documents (corpus, path);
+"""
+
+def get_index_path():
+    return os.path.join(get_cache_root(), 'search', 'index.sqlite')
+
+def tokenize(text):
+    tokens = []
+    for word in WORD_PATTERN.findall(text):
+        lowered = word.lower()
+        tokens.append(lowered)
+        parts = [part.lower() for piece in word.split('_') for part in IDENTIFIER_PART_PATTERN.findall(piece)]
+        if len(parts) > 1:
+            tokens.extend(part for part in parts if part != lowered)
+    return tokens
+
+class SearchIndex:
+    def __init__(self, index_path=None):
+        self.index_path = index_path or get_index_path()
+        os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+        self.connection = sqlite3.connect(self.index_path)
+        self.connection.executescript(SCHEMA)
+        version = self.connection.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+        if version is None or version[0] != STORED_VERSION:
+            self.connection.executescript("DELETE FROM sources; DELETE FROM documents; DELETE FROM postings;")
+            self.connection.execute("INSERT OR REPLACE INTO meta VALUES ('version', ?)", (STORED_VERSION,))
+            self.connection.commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self.connection.close()
+
+    def _remove_source(self, corpus, path):
+        document_ids = "SELECT id FROM documents WHERE corpus = ? AND path = ?"
+        self.connection.execute(f"DELETE FROM postings WHERE document_id IN ({document_ids})", (corpus, path))
+        self.connection.execute("DELETE FROM documents WHERE corpus = ? AND path = ?", (corpus, path))
+        self.connection.execute("DELETE FROM sources WHERE corpus = ? AND path = ?", (corpus, path))
+
+    def update(self, corpus, reader, paths, split_into_documents):
+        # split_into_documents(path, text) -> [(location, text)]; returns (files indexed, files unchanged, files removed, missing paths)
+        known = dict(self.connection.execute("SELECT path, content_hash FROM sources WHERE corpus = ?", (corpus,)))
+        indexed = unchanged = 0
+        missing = []
+        for path in dict.fromkeys(paths): # Listed twice is indexed once
+            try:
+                content, content_hash = reader.read(path)
+            except FileNotFoundError:
+                missing.append(path) # A manifest link to a file that was moved or deleted
+                continue
+            if known.get(path) == content_hash:
+                unchanged += 1
+                continue
+            self._remove_source(corpus, path)
+            for location, text in split_into_documents(path, content.decode('utf-8', errors='replace')):
+                terms = Counter(tokenize(text))
+                cursor = self.connection.execute("INSERT INTO documents (corpus, path, location, length, text) VALUES (?, ?, ?, ?, ?)",
+                                                 (corpus, path, location, sum(terms.values()), text))
+                self.connection.executemany("INSERT INTO postings VALUES (?, ?, ?)",
+                                            [(term, cursor.lastrowid, frequency) for term, frequency in terms.items()])
+            self.connection.execute("INSERT INTO sources VALUES (?, ?, ?)", (corpus, path, content_hash))
+            indexed += 1
+        listed = set(paths) - set(missing)
+        removed = [path for path in known if path not in listed]
+        for path in removed:
+            self._remove_source(corpus, path)
+        self._store_statistics()
+        self.connection.commit()
+        return indexed, unchanged, len(removed), missing
+
+    def _store_statistics(self):
+        # N and the average document length, kept in meta so a query does not scan the documents table
+        count, average_length = self.connection.execute("SELECT COUNT(*), AVG(length) FROM documents").fetchone()
+        self.connection.executemany("INSERT OR REPLACE INTO meta VALUES (?, ?)",
+                                    [('document_count', str(count)), ('average_length', str(average_length or 0))])
+
+    def query(self, text, limit=10):
+        # Returns [(score, corpus, path, location, document text)], best first
+        meta = dict(self.connection.execute("SELECT key, value FROM meta"))
+        document_count, average_length = int(meta.get('document_count', 0)), float(meta.get('average_length', 0)) or 1.0
+        scores = Counter()
+        for term in set(tokenize(text)):
+            postings = self.connection.execute("SELECT p.document_id, p.frequency, d.length FROM postings p JOIN documents d ON d.id = p.document_id "
+                                               "WHERE p.term = ?", (term,)).fetchall()
+            if not postings:
+                continue
+            inverse_frequency = math.log(1 + (document_count - len(postings) + 0.5) / (len(postings) + 0.5))
+            for document_id, frequency, length in postings:
+                normalised = frequency + BM25_K1 * (1 - BM25_B + BM25_B * length / average_length)
+                scores[document_id] += inverse_frequency * frequency * (BM25_K1 + 1) / normalised
+        results = []
+        for document_id, score in scores.most_common(limit):
+            corpus, path, location, document_text = self.connection.execute(
+                "SELECT corpus, path, location, text FROM documents WHERE id = ?", (document_id,)).fetchone()
+            results.append((score, corpus, path, location, document_text))
+        return results
+
+def code_documents(path, text):
+    return [(f"lines {chunk['start_line']}-{chunk['end_line']}", chunk['text']) for chunk in chunk_file(path, text)]
+
+def wiki_documents(path, text):
+    page = os.path.splitext(path)[0]
+    documents = []
+    for section in split_page(page, text, TOC_DEPTH):
+        location = ' > '.join(section['heading_path']) + (f" (#{section['anchor']})" if section['anchor'] else '')
+        documents.append((location or page, '\n'.join(section['heading_path'] + [section['text']])))
+    return documents
+
+def build_index(index, local_codebase_directory=None, local_wiki_directory=None, working_tree=False):
+    for corpus, directory, list_files, split_into_documents in [
+        ('codebase', local_codebase_directory, extract_filenames_from_codebase_list, code_documents),
+        ('wiki', local_wiki_directory, extract_filenames_from_sidebar, wiki_documents),
+    ]:
+        if directory is None:
+            continue
+        with open_reader(directory, working_tree=working_tree) as reader:
+            indexed, unchanged, removed, missing = index.update(corpus, reader, list_files(directory, reader), split_into_documents)
+        print(f"{corpus}: indexed {indexed} files, {unchanged} unchanged, removed {removed}")
+        if missing:
+            print(f"{corpus}: skipped {len(missing)} listed files that do not exist: {', '.join(missing)}")
+
+def snippet(text, query, width=160):
+    # The first line containing a query term, trimmed to 'width' characters
+    terms = set(tokenize(query))
+    for line in text.splitlines():
+        if terms & set(tokenize(line)):
+            return line.strip()[:width]
+    return text.strip().splitlines()[0][:width] if text.strip() else ''
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(prog='python -m chronos.search_index', description="Local BM25 search over the Chronos wiki and codebase.")
+    commands = parser.add_subparsers(dest='command', required=True)
+    build = commands.add_parser('build', help="Create or incrementally update the index")
+    build.add_argument('--working-tree', action='store_true', help="Index the files on disk instead of the committed snapshot")
+    query = commands.add_parser('query', help="Search the index")
+    query.add_argument('text')
+    query.add_argument('--limit', type=int, default=10)
+    return parser.parse_args()
+
+def main():
+    arguments = parse_arguments()
+    with SearchIndex() as index:
+        if arguments.command == 'build':
+            structures = load_all_structures()
+            build_index(index, structures['codebase_directories_and_files']['local_codebase_directory'],
+                        structures['wiki_directories_and_files']['local_wiki_directory'], arguments.working_tree)
+            return
+
+        started_at = time.perf_counter()
+        results = index.query(arguments.text, arguments.limit)
+        for score, corpus, path, location, text in results:
+            print(f"{score:7.2f}  {corpus:<8} {path}  [{location}]\n         {snippet(text, arguments.text)}")
+        print(f"{len(results)} results in {(time.perf_counter() - started_at) * 1000:.1f} ms")
+        if not results:
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+File Name: segment_cache.py
+
+Purpose: Build cache for the streaming codebase PDF. It stores the laid-out pages of every file, keyed by the
+file's content hash and the layout settings, so a run only lays out the files that changed.
+
+**Functionality:**
+
+* `segment_key()` hashes the heading, the layout (page size, fonts, margins, ...) and the file's content hash
+  (its blob SHA when the build reads from a git snapshot).
+* `SegmentCache.load()` / `store()` read and write one file of page content streams per key.
+* Entries unused for CHRONOS_SEGMENT_CACHE_MAX_AGE_DAYS (default 30) are removed by `prune()`.
+
+**Instructions:**
+
+1. `write_codebase_pdf(..., segment_cache=SegmentCache())`, or run 'convert_codeBase-to-pdf.py --incremental'.
+2. The cache lives in ~/.cache/chronos/codebase_segments unless CHRONOS_CACHE_DIR points elsewhere.
+
+Author: Beau Magnum
+
+Date: 2026-10-18
+
+"""
+import dataclasses
+import hashlib
+import json
+import os
+import tempfile
+import time
+from Utilities.environment_settings import float_setting # An invalid CHRONOS_SEGMENT_CACHE_MAX_AGE_DAYS falls back to the default
+
+SEGMENT_FORMAT_VERSION = 1 # Bump when layout_code_pages changes its output, so old segments are not reused
+
+def get_cache_root():
+    return os.environ.get('CHRONOS_CACHE_DIR', os.path.join(os.path.expanduser("~"), '.cache', 'chronos'))
+
+def segment_key(heading, content_hash, layout):
+    settings = json.dumps({'version': SEGMENT_FORMAT_VERSION, 'heading': heading, 'layout': dataclasses.asdict(layout)}, sort_keys=True)
+    return hashlib.sha256(settings.encode() + b'\0' + content_hash.encode()).hexdigest()
+
+class SegmentCache:
+    def __init__(self, cache_directory=None):
+        self.cache_directory = cache_directory or os.path.join(get_cache_root(), 'codebase_segments')
+        os.makedirs(self.cache_directory, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, key):
+        return os.path.join(self.cache_directory, key[:2], key + '.segments')
+
+    def load(self, key):
+        # Returns the cached page content streams, or None on a miss
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as file:
+                lengths = json.loads(file.readline()) # First line: the byte length of every page, then the pages back to back
+                if not isinstance(lengths, list) or not all(isinstance(length, int) and length >= 0 for length in lengths):
+                    raise ValueError("malformed header")
+                pages = [file.read(length) for length in lengths]
+                truncated = any(len(page) != length for page, length in zip(pages, lengths)) or file.read(1)
+        except (OSError, ValueError):
+            truncated = True
+        if truncated: # A missing, truncated or overlong entry (a disk filled up, a crash) is rebuilt instead of served
+            self.misses += 1
+            return None
+        os.utime(path) # Marks the entry as used, so prune() keeps it
+        self.hits += 1
+        return pages
+
+    def store(self, key, pages):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        file_descriptor, temporary_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp') # Unique per thread and process
+        with os.fdopen(file_descriptor, 'wb') as file:
+            file.write(json.dumps([len(page) for page in pages]).encode() + b'\n')
+            for page in pages:
+                file.write(page)
+        os.replace(temporary_path, path) # Readers never see a half-written entry
+
+    def prune(self, max_age_days=None):
+        if max_age_days is None: # An explicit 0 empties the cache
+            max_age_days = float_setting('CHRONOS_SEGMENT_CACHE_MAX_AGE_DAYS', 30)
+        cutoff = time.time() - max_age_days * 86400
+        for directory, _, file_names in os.walk(self.cache_directory):
+            for file_name in file_names:
+                if file_name.endswith('.tmp'): # Another process may still be writing it
+                    continue
+                path = os.path.join(directory, file_name)
+                try:
+                    if os.path.getmtime(path) < cutoff:
+                        os.remove(path)
+                except FileNotFoundError: # Pruned or replaced by a concurrent run
+                    pass
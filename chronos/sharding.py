@@ -0,0 +1,169 @@
+"""
+File Name: sharding.py
+
+Purpose: Splits the codebase export into several PDFs that each stay under a token budget, because the AI
+assistant the PDFs are uploaded to limits the size of every file it accepts.
+
+**Functionality:**
+
+* `estimate_tokens()` approximates the token count of a file from its length (CHARS_PER_TOKEN characters per token).
+* `plan_shards()` keeps the codeBase-list.md order and cuts it into the fewest shards under the budget, or into the
+  requested number when that is more, choosing the cut points that make the largest shard as small as possible. It
+  only returns fewer shards than requested when there are fewer pieces (files and line ranges) than shards.
+* A file that is larger than the budget on its own is cut into line ranges; every other file stays whole.
+* `write_codebase_shards()` writes 'name.part01.pdf', 'name.part02.pdf', ... with the streaming writer and a
+  'name.manifest.json' that lists the files (and line ranges) in every shard.
+* Sharded builds bypass the artifact cache: they are neither restored from nor stored in it, because one tree gives
+  several output files. '--incremental' still reuses the laid-out pages of unchanged files.
+
+**Instructions:**
+
+1. `write_codebase_shards(file_list, 'codebase.pdf', local_codebase_directory, token_budget=400000, shard_count=2)`
+2. Or run 'convert_codeBase-to-pdf.py --shard-tokens 400000 [--shards 2]'.
+
+Author: Beau Magnum
+
+Date: 2026-10-18
+
+"""
+import glob
+import json
+import math
+import os
+import re
+from dataclasses import dataclass
+from chronos.git_snapshot import WorkingTree
+from chronos.pdf_stream_writer import CodeLayout, StreamingPdfWriter, file_heading, file_pages, layout_code_pages
+
+CHARS_PER_TOKEN = 4 # Rough average for source code with common tokenizers; errs towards more tokens for dense code
+
+@dataclass
+class ShardPiece:
+    file_path: str
+    tokens: int
+    start_line: int = None # 1-based line range when the file had to be cut, None for a whole file
+    end_line: int = None
+
+    @property
+    def is_whole_file(self):
+        return self.start_line is None
+
+def tokens_for_characters(character_count):
+    return math.ceil(character_count / CHARS_PER_TOKEN)
+
+def estimate_tokens(text):
+    return tokens_for_characters(len(text))
+
+def split_file(file_path, text, token_budget):
+    # One piece for a file that fits the budget, otherwise consecutive line ranges that each fit it
+    tokens = estimate_tokens(text)
+    if tokens <= token_budget:
+        return [ShardPiece(file_path, tokens)]
+
+    pieces = []
+    start_line, piece_characters = 1, 0
+    lines = text.splitlines(keepends=True)
+    for line_number, line in enumerate(lines, start=1):
+        if piece_characters and tokens_for_characters(piece_characters + len(line)) > token_budget:
+            pieces.append(ShardPiece(file_path, tokens_for_characters(piece_characters), start_line, line_number - 1))
+            start_line, piece_characters = line_number, 0
+        piece_characters += len(line)
+    pieces.append(ShardPiece(file_path, tokens_for_characters(piece_characters), start_line, len(lines)))
+    return pieces
+
+def _pack(pieces, shard_limit):
+    # Fills shards in list order, starting a new one whenever the next piece would push the current one past the limit
+    shards, load = [[]], 0
+    for piece in pieces:
+        if shards[-1] and load + piece.tokens > shard_limit:
+            shards.append([])
+            load = 0
+        shards[-1].append(piece)
+        load += piece.tokens
+    return shards
+
+def plan_shards(pieces, token_budget, shard_count=1):
+    # Returns a list of shards (lists of pieces) in codeBase-list.md order
+    if not pieces:
+        return [[]]
+    largest_piece = max(piece.tokens for piece in pieces)
+    upper_limit = max(token_budget, largest_piece) # A single line longer than the budget cannot be cut further
+    shard_count = max(shard_count, len(_pack(pieces, upper_limit)))
+
+    # Binary search for the smallest shard size that still fits in shard_count shards, which balances them
+    lower_limit = max(largest_piece, math.ceil(sum(piece.tokens for piece in pieces) / shard_count))
+    while lower_limit < upper_limit:
+        middle = (lower_limit + upper_limit) // 2
+        if len(_pack(pieces, middle)) <= shard_count:
+            upper_limit = middle
+        else:
+            lower_limit = middle + 1
+    return _split_to_count(_pack(pieces, upper_limit), shard_count)
+
+def _split_to_count(shards, shard_count):
+    # Packing under the balanced limit can leave fewer shards than requested; halve the heaviest shard until there are enough
+    while len(shards) < shard_count:
+        candidates = [index for index, shard in enumerate(shards) if len(shard) > 1]
+        if not candidates:
+            break # Every shard is a single piece, nothing is left to split
+        index = max(candidates, key=lambda index: sum(piece.tokens for piece in shards[index]))
+        shard = shards[index]
+        total, load, cut, best_difference = sum(piece.tokens for piece in shard), 0, 1, None
+        for position in range(1, len(shard)): # The cut that leaves the two halves closest in size
+            load += shard[position - 1].tokens
+            if best_difference is None or abs(total - 2 * load) < best_difference:
+                cut, best_difference = position, abs(total - 2 * load)
+        shards[index:index + 1] = [shard[:cut], shard[cut:]]
+    return shards
+
+def piece_heading(local_codebase_directory, piece):
+    heading = file_heading(local_codebase_directory, piece.file_path)
+    return heading if piece.is_whole_file else f"{heading} (lines {piece.start_line}-{piece.end_line})"
+
+def shard_paths(output_pdf, shard_count):
+    root, extension = os.path.splitext(output_pdf)
+    return [f"{root}.part{number:02d}{extension or '.pdf'}" for number in range(1, shard_count + 1)]
+
+def manifest_path_for(output_pdf):
+    return os.path.splitext(output_pdf)[0] + '.manifest.json'
+
+def write_codebase_shards(file_paths, output_pdf, local_codebase_directory, token_budget, shard_count=1, layout=CodeLayout(),
+                          segment_cache=None, reader=None):
+    # Returns the manifest path
+    reader = reader or WorkingTree(local_codebase_directory)
+    pieces = []
+    for file_path in file_paths:
+        pieces.extend(split_file(file_path, reader.read_text(file_path), token_budget))
+    shards = plan_shards(pieces, token_budget, shard_count)
+    pdf_paths = shard_paths(output_pdf, len(shards))
+    manifest_path = manifest_path_for(output_pdf)
+
+    manifest = {'token_budget': token_budget, 'chars_per_token': CHARS_PER_TOKEN, 'tree_sha': reader.tree_sha, 'shards': []}
+    for shard, pdf_path in zip(shards, pdf_paths):
+        with StreamingPdfWriter(pdf_path, layout) as writer:
+            for piece in shard:
+                heading = piece_heading(local_codebase_directory, piece)
+                first_page = writer.page_count
+                if piece.is_whole_file:
+                    pages = file_pages(reader, piece.file_path, heading, layout, segment_cache)
+                else:
+                    lines = reader.read_text(piece.file_path).splitlines(keepends=True)[piece.start_line - 1:piece.end_line]
+                    pages = layout_code_pages(heading, ''.join(lines), layout)
+                for page in pages:
+                    writer.add_page(page)
+                writer.add_bookmark(heading, first_page)
+        manifest['shards'].append({
+            'path': pdf_path,
+            'tokens': sum(piece.tokens for piece in shard),
+            'files': [{'path': piece.file_path, 'tokens': piece.tokens,
+                       'lines': None if piece.is_whole_file else [piece.start_line, piece.end_line]} for piece in shard],
+        })
+
+    with open(manifest_path, 'w') as file:
+        json.dump(manifest, file, indent=2)
+    root, extension = os.path.splitext(output_pdf)
+    part_pattern = re.compile(re.escape(root) + r'\.part\d+' + re.escape(extension or '.pdf') + '$')
+    for stale_path in set(glob.glob(f"{glob.escape(root)}.part*")) - set(pdf_paths): # Left over from a run with more shards
+        if part_pattern.match(stale_path):
+            os.remove(stale_path)
+    return manifest_path
@@ -0,0 +1,61 @@
+"""
+File Name: text_bundle.py
+
+Purpose: Writes the codebase as one Markdown or plain-text bundle instead of a PDF. An AI assistant reads the
+text and throws the page layout away, so the bundle skips the layout step entirely: every file is streamed from
+the reader straight into the output, behind a header naming the file.
+
+**Functionality:**
+
+* 'markdown': a '## File: path' heading and a fenced code block per file, with the language taken from the
+  file extension. The fence is made longer than any backtick run inside the file, so no file can close it early.
+* 'text': a '===== File: path =====' banner per file.
+* The output has the PDF's name with a .md or .txt extension.
+
+**Instructions:**
+
+1. `write_codebase_bundle(file_list, 'codebase.md', local_codebase_directory, reader=snapshot)`
+2. Or run 'convert_codeBase-to-pdf.py --backend markdown' (or '--backend text').
+
+Author: Beau Magnum
+
+Date: 2026-10-18
+
+"""
+import os
+import re
+from chronos.git_snapshot import WorkingTree
+from chronos.pdf_stream_writer import file_heading
+
+BUNDLE_FORMATS = {'markdown': '.md', 'text': '.txt'} # Format: file extension of the bundle
+
+FENCE_LANGUAGES = {
+    '.py': 'python', '.js': 'javascript', '.jsx': 'jsx', '.ts': 'typescript', '.tsx': 'tsx', '.c': 'c', '.h': 'c',
+    '.cpp': 'cpp', '.hpp': 'cpp', '.cs': 'csharp', '.java': 'java', '.kt': 'kotlin', '.swift': 'swift', '.go': 'go',
+    '.rs': 'rust', '.rb': 'ruby', '.php': 'php', '.sh': 'bash', '.sql': 'sql', '.html': 'html', '.css': 'css',
+    '.json': 'json', '.yml': 'yaml', '.yaml': 'yaml', '.toml': 'toml', '.xml': 'xml', '.md': 'markdown',
+}
+
+BACKTICK_RUN = re.compile(r'`{3,}')
+
+def bundle_path(output_pdf, bundle_format):
+    return os.path.splitext(output_pdf)[0] + BUNDLE_FORMATS[bundle_format]
+
+def markdown_section(heading, file_path, text):
+    longest_run = max((len(run) for run in BACKTICK_RUN.findall(text)), default=0)
+    fence = '`' * max(3, longest_run + 1)
+    language = FENCE_LANGUAGES.get(os.path.splitext(file_path)[1].lower(), '')
+    newline = '' if text.endswith('\n') else '\n'
+    return f"## {heading}\n\n{fence}{language}\n{text}{newline}{fence}\n\n"
+
+def text_section(heading, text):
+    newline = '' if text.endswith('\n') else '\n'
+    return f"===== {heading} =====\n{text}{newline}\n"
+
+def write_codebase_bundle(file_paths, output_path, local_codebase_directory, reader=None, bundle_format='markdown'):
+    reader = reader or WorkingTree(local_codebase_directory)
+    with open(output_path, 'w', encoding='utf-8') as bundle:
+        for file_path in file_paths: # One file in memory at a time
+            heading = file_heading(local_codebase_directory, file_path)
+            text = reader.read_text(file_path)
+            bundle.write(markdown_section(heading, file_path, text) if bundle_format == 'markdown' else text_section(heading, text))
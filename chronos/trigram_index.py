@@ -0,0 +1,233 @@
+"""
+File Name: trigram_index.py
+
+Purpose: Instant regex search over the files listed in codeBase-list.md, at the current or any earlier indexed
+commit. A trigram index narrows every query down to the few files that can possibly match before the regex runs.
+
+**Functionality:**
+
+* Every file is indexed once per blob SHA: its case-folded trigrams and its compressed content go into a SQLite
+  file, and an unchanged file is never re-indexed, however many commits are indexed.
+* `required_trigrams()` reads the literal runs a regex must contain (e.g. 'load_all' in r'load_all\\w+\\(')
+  and only files holding all of their trigrams are searched. Patterns without a literal run of three
+  characters fall back to searching every file of the commit.
+* Case-folded trigrams (`fold_case()`: str.casefold(), with the dotted and dotless i folded to 'i') make the same
+  index serve case-sensitive and '--ignore-case' queries. Every pair of characters that re.IGNORECASE treats as
+  equal folds to the same text, so 'STR' still finds 'ſtr'.
+* Matches are reported per line, so '^' and '$' anchor at every line ('\\n' ends a line). A match that spans lines ('foo\\nbar', or '.' with re.DOTALL) is reported after
+  the line matches of its file, with the line it starts on and the whole matched text.
+* The index lives in ~/.cache/chronos/search/trigrams.sqlite (CHRONOS_CACHE_DIR moves it).
+
+**Instructions:**
+
+1. `python -m chronos.trigram_index build [--revision HEAD~20 --revision HEAD]`
+2. `python -m chronos.trigram_index query 'def \\w+_cache' [--revision HEAD~20] [--ignore-case]`
+
+Author: Beau Magnum
+
+Date: 2026-10-18
+
+"""
+import argparse # Allows python to read the command-line options
+import os
+import re
+import sqlite3
+import subprocess
+import sys
+import time
+import zlib
+from chronos.code_chunks import git_blob_sha
+from chronos.codebase_converter import extract_filenames_from_codebase_list
+from chronos.git_snapshot import RepositorySnapshot, WorkingTree
+from chronos.segment_cache import get_cache_root
+from Security.all_access import get_chronos_directory_structure # The codebase location
+try:
+    import re._parser as regex_parser # Python 3.11+
+except ImportError:
+    import sre_parse as regex_parser
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS blobs (blob_sha TEXT PRIMARY KEY, content BLOB);
+CREATE TABLE IF NOT EXISTS trigrams (trigram TEXT, blob_sha TEXT, PRIMARY KEY (trigram, blob_sha)) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS files (commit_sha TEXT, path TEXT, blob_sha TEXT, PRIMARY KEY (commit_sha, path));
+"""
+INDEX_FORMAT_VERSION = 2 # Bump when trigrams() changes; the index is then rebuilt
+CASE_FOLD_EXCEPTIONS = str.maketrans({'\u0130': 'i', '\u0131': 'i'}) # re.IGNORECASE matches 'İ' and 'ı' with 'i', casefold() does not
+
+def get_index_path():
+    return os.path.join(get_cache_root(), 'search', 'trigrams.sqlite')
+
+def fold_case(text):
+    return text.translate(CASE_FOLD_EXCEPTIONS).casefold()
+
+def trigrams(text):
+    text = fold_case(text)
+    return {text[index:index + 3] for index in range(len(text) - 2)}
+
+def _literal_runs(parsed, runs, current):
+    # Appends to 'runs' every sequence of characters the pattern must match literally, in order
+    for operation, argument in parsed:
+        if operation is regex_parser.LITERAL:
+            current.append(chr(argument))
+        elif operation is regex_parser.SUBPATTERN:
+            _literal_runs(argument[-1], runs, current) # A group is matched as part of the sequence
+        else:
+            runs.append(''.join(current))
+            current.clear()
+            if operation in (regex_parser.MAX_REPEAT, regex_parser.MIN_REPEAT) and argument[0] >= 1:
+                _literal_runs(argument[2], runs, []) # Repeated at least once: its own literals are still required
+                runs.append('')
+    runs.append(''.join(current))
+    current.clear()
+
+def required_trigrams(pattern, flags=0):
+    if flags & re.VERBOSE:
+        return set() # Whitespace in a verbose pattern is not literal; search every file
+    runs = []
+    _literal_runs(regex_parser.parse(pattern, flags), runs, [])
+    return set().union(*(trigrams(run) for run in runs if len(run) >= 3))
+
+class TrigramIndex:
+    def __init__(self, index_path=None):
+        self.index_path = index_path or get_index_path()
+        os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+        self.connection = sqlite3.connect(self.index_path)
+        self.connection.executescript(SCHEMA)
+        version = self.connection.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+        if version is None or int(version[0]) != INDEX_FORMAT_VERSION:
+            self.connection.executescript("DELETE FROM blobs; DELETE FROM trigrams; DELETE FROM files; DELETE FROM meta;")
+            self.connection.execute("INSERT INTO meta VALUES ('version', ?)", (str(INDEX_FORMAT_VERSION),))
+            self.connection.commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self.connection.close()
+
+    def index_commit(self, commit_sha, reader, paths):
+        # Returns (blobs indexed, blobs already in the index, missing paths)
+        known = {row[0] for row in self.connection.execute("SELECT blob_sha FROM blobs")}
+        indexed = reused = 0
+        missing = []
+        self.connection.execute("DELETE FROM files WHERE commit_sha = ?", (commit_sha,))
+        for path in dict.fromkeys(paths):
+            try:
+                content = reader.read(path)[0]
+            except FileNotFoundError:
+                missing.append(path) # A manifest link to a file that was moved or deleted
+                continue
+            blob_sha = git_blob_sha(content)
+            self.connection.execute("INSERT INTO files VALUES (?, ?, ?)", (commit_sha, path, blob_sha))
+            if blob_sha in known:
+                reused += 1
+                continue
+            text = content.decode('utf-8', errors='replace')
+            self.connection.execute("INSERT INTO blobs VALUES (?, ?)", (blob_sha, zlib.compress(content)))
+            self.connection.executemany("INSERT INTO trigrams VALUES (?, ?)", [(trigram, blob_sha) for trigram in trigrams(text)])
+            known.add(blob_sha)
+            indexed += 1
+        self.connection.execute("INSERT OR REPLACE INTO meta VALUES ('latest_commit', ?)", (commit_sha,))
+        self.connection.commit()
+        return indexed, reused, missing
+
+    def latest_commit(self):
+        row = self.connection.execute("SELECT value FROM meta WHERE key = 'latest_commit'").fetchone()
+        return row and row[0]
+
+    def candidates(self, commit_sha, required):
+        # {blob_sha: [paths]} of the commit's files that contain every required trigram
+        files = {}
+        if required:
+            placeholders = ','.join('?' * len(required))
+            rows = self.connection.execute(
+                f"SELECT f.blob_sha, f.path FROM files f WHERE f.commit_sha = ? AND f.blob_sha IN "
+                f"(SELECT blob_sha FROM trigrams WHERE trigram IN ({placeholders}) GROUP BY blob_sha HAVING COUNT(*) = ?)",
+                (commit_sha, *required, len(required)))
+        else:
+            rows = self.connection.execute("SELECT blob_sha, path FROM files WHERE commit_sha = ?", (commit_sha,))
+        for blob_sha, path in rows:
+            files.setdefault(blob_sha, []).append(path)
+        return files
+
+    def search(self, commit_sha, pattern, flags=0):
+        # Yields (path, line number, line) for every matching line, then (path, first line number, matched text) for every
+        # match spanning lines; returns nothing for a commit that was never indexed
+        regex = re.compile(pattern, flags)
+        for blob_sha, paths in self.candidates(commit_sha, required_trigrams(pattern, flags)).items():
+            content = zlib.decompress(self.connection.execute("SELECT content FROM blobs WHERE blob_sha = ?", (blob_sha,)).fetchone()[0])
+            text = content.decode('utf-8', errors='replace')
+            lines = text.split('\n') # Only '\n' ends a line, as in the line numbers of the matches spanning lines below
+            if text.endswith('\n'):
+                lines.pop()
+            for line_number, line in enumerate(lines, start=1):
+                line = line[:-1] if line.endswith('\r') else line # CRLF files: '$' matches at the end of the text
+                if regex.search(line): # Each line on its own, so '^' and '$' anchor at line boundaries
+                    for path in sorted(paths):
+                        yield path, line_number, line
+            for match in regex.finditer(text):
+                if '\n' in match.group(): # Invisible to the line-by-line pass above
+                    for path in sorted(paths):
+                        yield path, text.count('\n', 0, match.start()) + 1, match.group()
+
+def get_codebase_directory():
+    return get_chronos_directory_structure('codebase_directories_and_files')['local_codebase_directory']
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(prog='python -m chronos.trigram_index', description="Regex search over the files in codeBase-list.md.")
+    commands = parser.add_subparsers(dest='command', required=True)
+    build = commands.add_parser('build', help="Index the listed files at one or more commits")
+    build.add_argument('--revision', action='append', help="Commit to index (repeatable, default HEAD)")
+    build.add_argument('--working-tree', action='store_true', help="Index the files on disk, including uncommitted edits")
+    query = commands.add_parser('query', help="Search the index with a regular expression")
+    query.add_argument('pattern')
+    query.add_argument('--revision', help="Search this indexed commit (default: the last one indexed)")
+    query.add_argument('--ignore-case', '-i', action='store_true')
+    query.add_argument('--limit', type=int, default=200, help="Stop after this many matching lines")
+    return parser.parse_args()
+
+def main():
+    arguments = parse_arguments()
+    with TrigramIndex() as index:
+        if arguments.command == 'build':
+            local_codebase_directory = get_codebase_directory()
+            for revision in arguments.revision or ['HEAD']:
+                started_at = time.perf_counter()
+                try: # No fallback to the working tree here: it would be indexed under the wrong commit
+                    reader = WorkingTree(local_codebase_directory) if arguments.working_tree else RepositorySnapshot(local_codebase_directory, revision)
+                except subprocess.SubprocessError as e:
+                    sys.exit(f"Cannot read {revision} from {local_codebase_directory}: {e}")
+                with reader:
+                    commit_sha = getattr(reader, 'commit_sha', 'working-tree')
+                    indexed, reused, missing = index.index_commit(commit_sha, reader, extract_filenames_from_codebase_list(local_codebase_directory, reader))
+                print(f"{revision} ({commit_sha[:12]}): indexed {indexed} files, {reused} unchanged, in {time.perf_counter() - started_at:.2f}s")
+                if missing:
+                    print(f"{revision}: skipped {len(missing)} listed files that do not exist: {', '.join(missing)}")
+            return
+
+        started_at = time.perf_counter()
+        if arguments.revision: # Only resolving a revision needs the repository; a plain query reads the index alone
+            try:
+                with RepositorySnapshot(get_codebase_directory(), arguments.revision) as snapshot:
+                    commit_sha = snapshot.commit_sha
+            except subprocess.SubprocessError as e:
+                sys.exit(f"Cannot resolve {arguments.revision}: {e}")
+        else:
+            commit_sha = index.latest_commit()
+        if commit_sha is None:
+            sys.exit("The trigram index is empty, run 'python -m chronos.trigram_index build' first")
+
+        matches = 0
+        for path, line_number, line in index.search(commit_sha, arguments.pattern, re.IGNORECASE if arguments.ignore_case else 0):
+            print(f"{path}:{line_number}: {line.strip()}")
+            matches += 1
+            if matches >= arguments.limit:
+                break
+        print(f"{matches} matching lines at {commit_sha[:12]} in {(time.perf_counter() - started_at) * 1000:.1f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+"""
+File Name: wiki_ast.py
+
+Purpose: Wiki export through pandoc's document AST. Every page is parsed once into pandoc's JSON AST and cached by
+its content hash, the document-wide transformations run as Python filters over the cached ASTs, and pandoc only
+writes the combined AST, so most of the Markdown parsing disappears from a run.
+
+**Functionality:**
+
+* `pandoc --from markdown --to json` per page (in parallel with jobs > 1), cached in ~/.cache/chronos/wiki_ast with
+  the page's heading and id metadata. The key includes the pandoc version, so an upgrade re-parses every page.
+* One filter pass over the combined AST:
+  - anchors: heading ids are re-derived across the whole document ('overview', 'overview-1', ...) and every other
+    colliding id is renamed, as pandoc does for one document;
+  - links: '[setup](Setup-Guide)' and 'Setup-Guide#install' point at the page's heading inside the document
+    instead of a wiki URL that does not exist in the export, and '#anchor' follows a renamed heading;
+  - title: the document title is set in the AST metadata.
+* `pandoc --from json --to html5 --standalone --toc` writes the combined AST once.
+* The JSON AST is read directly instead of through the `pandoc` Python package, which only supports pandoc up to
+  2.19 and fails on newer pandoc ASTs.
+
+**Instructions:**
+
+1. `write_wiki_ast(file_list, 'wiki.html', local_wiki_directory, 'Choronos-HoM Wiki', 4, reader=snapshot)`
+2. Or run 'convert_wiki-to-pdf.py --engine ast [--jobs N]'.
+
+Author: Beau Magnum
+
+Date: 2026-10-18
+
+"""
+import hashlib
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import unquote
+from chronos.code_chunks import git_blob_sha # The same key for snapshot and working-tree reads
+from chronos.git_snapshot import WorkingTree
+from chronos.segment_cache import SegmentCache, get_cache_root
+from chronos.wiki_markdown import pandoc_identifier, unique_identifier
+from chronos.wiki_pages import engine_fingerprint
+from Utilities.subprocess_runner import run_command # Timeouts and the CHRONOS_RUN_DEADLINE budget for pandoc
+
+AST_FORMAT_VERSION = 1 # Bump when the cached metadata or the filters change
+PANDOC_PARSE_TIMEOUT_SECONDS = 300 # Parsing a single page is abandoned after this long
+PANDOC_WRITE_TIMEOUT_SECONDS = 900 # Writing the whole document is abandoned after this long
+
+ATTRIBUTE_POSITION = {'Header': 1, 'Div': 0, 'Span': 0, 'CodeBlock': 0, 'Code': 0, 'Link': 0, 'Image': 0, 'Table': 0, 'Figure': 0}
+
+def ast_cache_key(fingerprint, blob_sha):
+    return hashlib.sha256(f"{AST_FORMAT_VERSION}\0{fingerprint}\0{blob_sha}".encode()).hexdigest()
+
+def walk(node, visit):
+    # Calls visit(element) on every AST element ({'t': ..., 'c': ...}) under node, in document order
+    if isinstance(node, dict):
+        if 't' in node:
+            visit(node)
+        for value in node.values():
+            walk(value, visit)
+    elif isinstance(node, list):
+        for value in node:
+            walk(value, visit)
+
+def stringify(inlines):
+    # The plain text of a list of inlines, as pandoc's stringify builds it for identifiers
+    parts = []
+    for inline in inlines:
+        kind, content = inline['t'], inline.get('c')
+        if kind == 'Str':
+            parts.append(content)
+        elif kind in ('Space', 'SoftBreak', 'LineBreak'):
+            parts.append(' ')
+        elif kind in ('Code', 'Math'):
+            parts.append(content[1])
+        elif kind in ('Quoted', 'Cite', 'Span', 'Link', 'Image'):
+            parts.append(stringify(content[1]))
+        elif kind not in ('Note', 'RawInline'):
+            parts.append(stringify(content)) # Emph, Strong, Underline, Strikeout, Superscript, Subscript, SmallCaps
+    return ''.join(parts)
+
+def page_metadata(ast):
+    # Headings (id, text, and whether pandoc derived the id from the text) and every other id, in document order
+    headings, identifiers, local_identifiers = [], [], set()
+
+    def collect(element):
+        position = ATTRIBUTE_POSITION.get(element['t'])
+        if position is None:
+            return
+        identifier = element['c'][position][0]
+        if element['t'] == 'Header':
+            text = stringify(element['c'][2])
+            auto = unique_identifier(pandoc_identifier(text), local_identifiers) == identifier
+            local_identifiers.add(identifier)
+            headings.append({'id': identifier, 'text': text, 'auto': auto})
+        elif identifier:
+            identifiers.append(identifier)
+
+    walk(ast['blocks'], collect)
+    return {'headings': headings, 'ids': identifiers}
+
+def parse_page(page_text):
+    # Returns (AST JSON text, metadata) of one page
+    result = run_command(["pandoc", "--from", "markdown", "--to", "json"], stage="pandoc (parse page)", timeout=PANDOC_PARSE_TIMEOUT_SECONDS,
+                         input=page_text, capture_output=True, text=True, check=True)
+    return result.stdout, page_metadata(json.loads(result.stdout))
+
+def parse_pages(page_texts, jobs=1):
+    if jobs <= 1 or len(page_texts) <= 1:
+        return [parse_page(page_text) for page_text in page_texts]
+    with ThreadPoolExecutor(max_workers=jobs) as executor: # Every page is its own pandoc process; the threads only wait
+        return list(executor.map(parse_page, page_texts))
+
+def title_inlines(title):
+    inlines = []
+    for word in title.split():
+        inlines.extend([{'t': 'Space'}, {'t': 'Str', 'c': word}])
+    return inlines[1:]
+
+def page_name(target):
+    # 'Setup-Guide', 'Setup Guide' and 'Setup-Guide.md' all name the page stored as Setup-Guide.md
+    name = unquote(target).replace(' ', '-')
+    return name[:-3] if name.endswith('.md') else name
+
+def combine_pages(pages, file_list, title):
+    # pages: [(AST, metadata)] in sidebar order; returns the combined AST after the one filter pass
+    used_identifiers, renamed_by_page, page_anchors = set(), {}, {}
+    names = [page_name(file_name) for file_name in file_list]
+    for name, (_, metadata) in zip(names, pages):
+        renamed = {}
+        for heading in metadata['headings']:
+            identifier = pandoc_identifier(heading['text']) if heading['auto'] else heading['id']
+            renamed.setdefault(heading['id'], unique_identifier(identifier, used_identifiers))
+        for identifier in metadata['ids']:
+            if identifier not in renamed:
+                renamed[identifier] = unique_identifier(identifier, used_identifiers)
+        renamed_by_page.setdefault(name, renamed)
+        if metadata['headings']:
+            page_anchors.setdefault(name, renamed[metadata['headings'][0]['id']])
+
+    def link_target(url, renamed):
+        if url.startswith('#'):
+            return '#' + renamed.get(url[1:], url[1:])
+        if '://' in url or url.startswith('mailto:'):
+            return url
+        name, _, fragment = url.partition('#')
+        name = page_name(name)
+        if name not in renamed_by_page:
+            return url # An image, a file or a page that is not in the sidebar
+        if fragment:
+            return '#' + renamed_by_page[name].get(fragment, fragment)
+        return '#' + page_anchors[name] if name in page_anchors else url
+
+    blocks = []
+    for name, (ast, _) in zip(names, pages):
+        renamed = renamed_by_page[name]
+
+        def rewrite(element):
+            position = ATTRIBUTE_POSITION.get(element['t'])
+            if position is None:
+                return
+            attributes = element['c'][position]
+            attributes[0] = renamed.get(attributes[0], attributes[0])
+            if element['t'] == 'Link':
+                element['c'][2][0] = link_target(element['c'][2][0], renamed)
+
+        walk(ast['blocks'], rewrite)
+        blocks.extend(ast['blocks'])
+    api_version = pages[0][0]['pandoc-api-version'] if pages else []
+    return {'pandoc-api-version': api_version, 'meta': {'title': {'t': 'MetaInlines', 'c': title_inlines(title)}}, 'blocks': blocks}
+
+def write_wiki_ast(file_list, output_path, local_wiki_directory, title, toc_depth, reader=None, ast_cache=None, jobs=1):
+    # Returns (pages parsed, pages reused from the AST cache)
+    reader = reader or WorkingTree(local_wiki_directory)
+    ast_cache = ast_cache or SegmentCache(os.path.join(get_cache_root(), 'wiki_ast'))
+    fingerprint = engine_fingerprint('pandoc')
+    pages, misses = [None] * len(file_list), [] # misses: (position, cache key, page text)
+    for position, file_name in enumerate(file_list):
+        content = reader.read(file_name)[0]
+        key = ast_cache_key(fingerprint, git_blob_sha(content))
+        cached = ast_cache.load(key)
+        if cached is None:
+            misses.append((position, key, content.decode('utf-8', errors='replace')))
+        else:
+            pages[position] = (json.loads(cached[0]), json.loads(cached[1]))
+
+    for (position, key, _), (ast_json, metadata) in zip(misses, parse_pages([page_text for _, _, page_text in misses], jobs)):
+        ast_cache.store(key, [ast_json.encode(), json.dumps(metadata).encode()])
+        pages[position] = (json.loads(ast_json), metadata)
+
+    document = combine_pages(pages, file_list, title)
+    run_command(["pandoc", "--from", "json", "--to", "html5", "--standalone", "--toc", f"--toc-depth={toc_depth}",
+                 "-o", os.path.abspath(output_path)], stage="pandoc (write)", timeout=PANDOC_WRITE_TIMEOUT_SECONDS,
+                input=json.dumps(document), text=True, check=True)
+    ast_cache.prune()
+    return len(misses), len(file_list) - len(misses)
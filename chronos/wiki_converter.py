@@ -0,0 +1,210 @@
+"""
+File Name: wiki_converter.py
+
+Purpose: Importable, re-entrant version of the wiki export behind `convert_wiki-to-pdf.py`. Nothing here changes
+process-wide state (no `os.chdir`, no `sys.exit`), so several wikis can be built at once from worker threads. A
+relative output path is resolved against the wiki directory, where the script used to change into.
+
+**Functionality:**
+
+* `build_wiki()` pulls the wiki, pins a snapshot, serves the output from the artifact cache when the tree is
+  unchanged and otherwise converts the pages in `_Sidebar.md` order with pandoc. It returns an `ArtifactMetadata`.
+* `WikiOptions(engine='markdown')` renders in-process with Python-Markdown (`chronos/wiki_markdown.py`); the
+  pandoc engines fall back to it when no pandoc binary is installed.
+* `WikiOptions(engine='ast')` parses every page once into a cached pandoc AST and writes the filtered, combined
+  AST with a single pandoc call (`chronos/wiki_ast.py`).
+* `WikiOptions(incremental=True)` converts and caches every page on its own (`chronos/wiki_pages.py`), so only
+  changed pages are converted again. `WikiOptions(jobs=N)` converts the pages in N workers in the page-by-page
+  modes (incremental, 'markdown', 'ast'); it never switches the plain pandoc export to page-by-page conversion.
+* `restore_wiki()` copies the output cached for an older revision into place.
+* Conversion failures raise `WikiConversionError` instead of ending the process.
+
+**Instructions:**
+
+from chronos.wiki_converter import WikiOptions, build_wiki
+
+metadata = build_wiki('/path/to/wiki', '/path/to/output.html', WikiOptions(revision='HEAD'))
+
+Author: Beau Magnum
+
+Date: 2026-10-18
+
+"""
+import os
+import shutil # Allows python to check whether the pandoc binary is installed
+import re # Allows python to use regular expressions for pattern matching. In this case, we use it to extract filenames from the '_Sidebar.md' file
+import subprocess # Allows python to run other programs within the script, in this case "pandoc", the document conversion software
+import time
+from dataclasses import dataclass, replace
+from chronos.artifact_cache import ArtifactCache, ArtifactMetadata, key_untracked_inputs, resolve_tree_sha # Finished outputs keyed by the git tree they were built from
+from chronos.git_snapshot import WorkingTree, is_transient_git_error, open_reader # Inputs read from one pinned commit through 'git cat-file --batch'
+from chronos.wiki_ast import AST_FORMAT_VERSION, write_wiki_ast # Cached pandoc ASTs, filtered in Python ('--engine ast')
+from chronos.wiki_markdown import RENDERER_VERSION # The in-process engine ('--engine markdown')
+from chronos.wiki_pages import PAGE_FORMAT_VERSION, engine_fingerprint, write_wiki_pages # Per-page conversion, assembled in Python ('--incremental')
+from chronos.wiki_sections import SECTION_FORMAT_VERSION, sections_path, write_wiki_sections # Heading-sectioned JSONL ('--format jsonl')
+from Utilities.subprocess_runner import StageBudgetExceeded, run_command, run_command_async # Timeouts, retries and the CHRONOS_RUN_DEADLINE budget for external commands
+
+GIT_PULL_TIMEOUT_SECONDS = 300 # A single 'git pull' attempt is abandoned after this long
+PANDOC_TIMEOUT_SECONDS = 900 # The whole-wiki conversion is abandoned after this long
+PANDOC_WARM_UP_TIMEOUT_SECONDS = 30
+WIKI_TITLE = 'Choronos-HoM Wiki'
+TOC_DEPTH = 4 # Include headings up to level 4 in the ToC
+PANDOC_COMMAND_VERSION = 1 # Bump when the pandoc command line of generate_pdf() changes, so documents it built before are not restored
+ARTIFACT_OPTIONS = {'engine': 'pandoc', 'command': PANDOC_COMMAND_VERSION, 'standalone': True, 'toc_depth': TOC_DEPTH, 'title': WIKI_TITLE} # Everything besides the git tree (and the pandoc version) that changes the output
+MARKDOWN_ARTIFACT_OPTIONS = {'engine': 'markdown', 'renderer': RENDERER_VERSION, 'pages': PAGE_FORMAT_VERSION, 'toc_depth': TOC_DEPTH, 'title': WIKI_TITLE}
+PANDOC_PAGES_ARTIFACT_OPTIONS = {'engine': 'pandoc', 'pages': PAGE_FORMAT_VERSION, 'toc_depth': TOC_DEPTH, 'title': WIKI_TITLE}
+AST_ARTIFACT_OPTIONS = {'engine': 'ast', 'filters': AST_FORMAT_VERSION, 'toc_depth': TOC_DEPTH, 'title': WIKI_TITLE}
+SECTIONS_ARTIFACT_OPTIONS = {'engine': 'sections', 'sections': SECTION_FORMAT_VERSION, 'toc_depth': TOC_DEPTH}
+
+class WikiConversionError(Exception):
+    pass
+
+def pandoc_version():
+    try:
+        return engine_fingerprint('pandoc') # e.g. 'pandoc 3.1.9'
+    except (OSError, subprocess.SubprocessError):
+        return None # Without pandoc no pandoc output can be matched, a restore finds nothing
+
+@dataclass
+class WikiOptions:
+    revision: str = 'HEAD'
+    working_tree: bool = False # Read pages from disk instead of a git snapshot
+    use_cache: bool = True # Serve the output from the artifact cache when the tree did not change
+    pull: bool = True
+    output_format: str = 'html' # 'html' (one HTML5 document) or 'jsonl' (one record per section)
+    engine: str = 'pandoc' # HTML renderer: 'pandoc' (the pandoc binary), 'markdown' (in-process) or 'ast' (cached pandoc ASTs)
+    incremental: bool = False # Convert pages one by one and reuse the cached conversion of unchanged pages
+    jobs: int = 1 # Workers for the page-by-page modes; the plain pandoc export is a single pandoc run either way
+
+    def output_path(self, output_path):
+        return sections_path(output_path) if self.output_format == 'jsonl' else output_path
+
+    @property
+    def per_page(self):
+        # True when the pages are converted one by one and the document is assembled in Python
+        return self.engine == 'markdown' or (self.engine == 'pandoc' and self.incremental) # Only ever chosen explicitly
+
+    @property
+    def artifact_options(self):
+        if self.output_format == 'jsonl':
+            return SECTIONS_ARTIFACT_OPTIONS
+        if self.engine == 'markdown':
+            return MARKDOWN_ARTIFACT_OPTIONS # Always assembled from pages, cached or not
+        options = AST_ARTIFACT_OPTIONS if self.engine == 'ast' else PANDOC_PAGES_ARTIFACT_OPTIONS if self.per_page else ARTIFACT_OPTIONS
+        return dict(options, pandoc=pandoc_version()) # An upgraded pandoc renders differently, so its outputs are not reused
+
+# --- Git pull for updating wiki on local computer ---
+def get_latest_wiki_content(local_wiki_directory):
+    try:
+        # Run the git pull command inside the wiki location, retrying transient network failures
+        run_command(["git", "pull"], stage="git pull (wiki)", timeout=GIT_PULL_TIMEOUT_SECONDS, retries=2,
+                    retry_if=is_transient_git_error, cwd=local_wiki_directory, check=True, stderr=subprocess.PIPE, text=True)
+    except subprocess.CalledProcessError as e:
+        print(f"Error updating wiki: {e}\n{e.stderr.strip()}") # Print an error message (and git's own) if the git pull command fails
+    except StageBudgetExceeded as e:
+        print(f"Error updating wiki, continuing with the local copy: {e}")
+
+def extract_filenames_from_sidebar(local_wiki_directory, reader=None):
+    file_list = []
+    link_pattern = re.compile(r'\s*\[.*\]\((.*)\)')  # Extracts the filename from a Markdown link, in this case '[Display_Text](filename)'
+    reader = reader or WorkingTree(local_wiki_directory) # A RepositorySnapshot reads the sidebar at the same commit as the pages
+
+    for line in reader.read_text('_Sidebar.md').splitlines(): # Loop through each line in the '_Sidebar.md' file
+        match = link_pattern.search(line) # Search for a link pattern in the line
+        if match:
+            file_list.append(match.group(1) + '.md') # group(1) is the link target; the pages are stored with the '.md' extension
+    return file_list
+
+# --- Generate the document with "Pandoc" ---
+def generate_pdf(file_list, local_wiki_directory, output_path, reader=None):
+    pandoc_command = [
+        "pandoc",
+        "--to", "html5", # Convert to HTML5 format
+        "--standalone", # A full document: without it pandoc writes a fragment and ignores --toc and the title
+        "-o", os.path.abspath(output_path), # Absolute, because pandoc runs inside the wiki directory
+        "--toc",
+        f"--toc-depth={TOC_DEPTH}",
+        "--metadata", f"title={WIKI_TITLE}", # Title passed as metadata, so the wiki's own files are never modified
+    ]
+
+    try:
+        if reader is None:
+            pandoc_command.extend(file_list) # Pandoc reads the pages itself, in sidebar order
+            combined_markdown = None
+        else:
+            # Pages come from the reader (a pinned git snapshot) and reach pandoc on stdin, joined the way pandoc joins input files
+            pandoc_command.extend(["--from", "markdown"])
+            combined_markdown = '\n\n'.join(reader.read_text(file_name) for file_name in file_list)
+        run_command(pandoc_command, stage="pandoc", timeout=PANDOC_TIMEOUT_SECONDS, cwd=local_wiki_directory, input=combined_markdown,
+                    text=True, check=True)
+    except FileNotFoundError as e:
+        missing_file = e.filename or str(e).split("'")[1]
+        raise WikiConversionError(f"The file '{missing_file}' is missing. Please create the file and try again.") from e
+    except (subprocess.CalledProcessError, StageBudgetExceeded) as e:
+        raise WikiConversionError(f"Error running Pandoc: {e}") from e
+
+def render_wiki_pages(file_list, local_wiki_directory, output_path, options, reader):
+    try:
+        rendered, reused = write_wiki_pages(file_list, output_path, local_wiki_directory, options.engine, WIKI_TITLE, TOC_DEPTH, reader,
+                                            cache_pages=options.incremental, jobs=options.jobs)
+    except (subprocess.CalledProcessError, StageBudgetExceeded) as e:
+        raise WikiConversionError(f"Error running Pandoc: {e}") from e
+    if options.incremental:
+        print(f"Converted {rendered} of {len(file_list)} wiki pages, reused {reused} unchanged pages")
+
+def render_wiki_ast(file_list, local_wiki_directory, output_path, options, reader):
+    try:
+        parsed, reused = write_wiki_ast(file_list, output_path, local_wiki_directory, WIKI_TITLE, TOC_DEPTH, reader, jobs=options.jobs)
+    except (subprocess.CalledProcessError, StageBudgetExceeded) as e:
+        raise WikiConversionError(f"Error running Pandoc: {e}") from e
+    print(f"Parsed {parsed} of {len(file_list)} wiki pages, reused {reused} cached ASTs")
+
+async def warm_up_pandoc():
+    # Starting pandoc once loads its binary into the OS cache, so the real conversion starts faster
+    try:
+        await run_command_async(["pandoc", "--version"], stage="pandoc warm-up", timeout=PANDOC_WARM_UP_TIMEOUT_SECONDS)
+    except (OSError, subprocess.SubprocessError):
+        pass # generate_pdf reports the missing pandoc binary, a slow warm-up only costs the head start
+
+def restore_wiki(local_wiki_directory, output_path, revision, options=None):
+    # Copies the output cached for an older revision into place; returns None if there is none
+    options = options or WikiOptions()
+    output_path = options.output_path(os.path.normpath(os.path.join(local_wiki_directory, output_path))) # Relative to the wiki repository
+    started_at = time.perf_counter()
+    tree_sha = resolve_tree_sha(local_wiki_directory, revision) # Raises UnknownRevision
+    if not ArtifactCache('wiki').restore(tree_sha, options.artifact_options, output_path):
+        return None
+    return ArtifactMetadata('wiki', output_path, tree_sha, True, None, time.perf_counter() - started_at)
+
+def build_wiki(local_wiki_directory, output_path, options=None):
+    options = options or WikiOptions()
+    output_path = options.output_path(os.path.normpath(os.path.join(local_wiki_directory, output_path))) # .sections.jsonl for the JSONL export; a relative path is relative to the wiki, as when the script changed into it
+    if options.output_format == 'html' and options.engine in ('pandoc', 'ast') and shutil.which('pandoc') is None:
+        print("Pandoc is not installed, rendering the wiki with the in-process Markdown engine")
+        options = replace(options, engine='markdown') # Also keys the artifact cache by the engine actually used
+    started_at = time.perf_counter()
+    artifact_cache = ArtifactCache('wiki')
+    artifact_options = options.artifact_options # Runs 'pandoc --version' once per build
+
+    if options.pull:
+        get_latest_wiki_content(local_wiki_directory)
+    with open_reader(local_wiki_directory, options.revision, options.working_tree) as reader: # Pinned after the pull, so every page comes from one commit
+        tree_sha = reader.tree_sha
+        if isinstance(reader, WorkingTree): # HEAD's tree does not contain untracked pages, so their content joins the key
+            tree_sha = key_untracked_inputs(local_wiki_directory, tree_sha, ['_Sidebar.md'] + extract_filenames_from_sidebar(local_wiki_directory, reader))
+        if options.use_cache and artifact_cache.restore(tree_sha, artifact_options, output_path): # No-op fast path: nothing came down since the last build
+            print(f"Wiki unchanged (tree {tree_sha[:12]}), restored {output_path} from the artifact cache")
+            return ArtifactMetadata('wiki', output_path, tree_sha, True, None, time.perf_counter() - started_at)
+
+        file_list = extract_filenames_from_sidebar(local_wiki_directory, reader)
+        if options.output_format == 'jsonl':
+            split, reused = write_wiki_sections(file_list, output_path, local_wiki_directory, TOC_DEPTH, reader)
+            print(f"Split {split} of {len(file_list)} wiki pages into sections, reused {reused} unchanged pages")
+        elif options.engine == 'ast':
+            render_wiki_ast(file_list, local_wiki_directory, output_path, options, reader)
+        elif options.per_page:
+            render_wiki_pages(file_list, local_wiki_directory, output_path, options, reader)
+        else:
+            generate_pdf(file_list, local_wiki_directory, output_path, reader)
+    artifact_cache.store(tree_sha, artifact_options, output_path)
+    return ArtifactMetadata('wiki', output_path, tree_sha, False, len(file_list), time.perf_counter() - started_at)
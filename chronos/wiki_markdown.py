@@ -0,0 +1,82 @@
+"""
+File Name: wiki_markdown.py
+
+Purpose: Renders wiki pages to HTML5 inside the Python process with the `markdown` package, instead of starting a
+pandoc binary for every export. It also keeps the export working on machines where pandoc is not installed.
+
+**Functionality:**
+
+* One `markdown.Markdown` instance per thread (toc, fenced_code and tables extensions) is built once and `reset()`
+  between pages, so the extensions are not loaded again for every page or export.
+* Pages are rendered one at a time. Python-Markdown's toc extension does work proportional to headings x code
+  blocks of whatever it renders, so a whole-wiki document would take quadratic time.
+* Headings get pandoc's identifiers ('Setup Guide' -> 'setup-guide', repeats -> 'overview-1', 'overview-2'), so
+  links into the wiki document work with either engine. `wiki_pages.assemble_document()` makes them unique
+  across pages and builds the table of contents from the headings `render_page()` returns.
+
+**Instructions:**
+
+1. `fragment, headings = render_page(page_text)`
+2. Or run 'convert_wiki-to-pdf.py --engine markdown'.
+
+Author: Beau Magnum
+
+Date: 2026-10-18
+
+"""
+import html
+import re
+import threading
+import markdown # Python-Markdown, the in-process alternative to pandoc
+from markdown.extensions.toc import render_inner_html, strip_tags
+from markdown.treeprocessors import Treeprocessor
+
+RENDERER_VERSION = 1 # Bump when the generated HTML changes, so cached pages and outputs are not reused
+HEADING_TAGS = {'h1', 'h2', 'h3', 'h4', 'h5', 'h6'}
+
+_renderers = threading.local() # A Markdown instance keeps per-document state, so each thread reuses its own
+
+def pandoc_identifier(text):
+    # Pandoc's auto_identifiers rule: keep letters, digits, '_', '-' and '.', spaces to '-', drop everything before the first letter
+    identifier = ''.join(character for character in text.lower() if character.isalnum() or character in '_-.' or character.isspace())
+    return re.sub(r'^[\W\d_]+', '', '-'.join(identifier.split())) or 'section' # [\W\d_] is any character that is not a letter
+
+def unique_identifier(identifier, used_identifiers):
+    # A repeated identifier becomes 'overview-1', 'overview-2', ... as in pandoc
+    candidate, count = identifier, 0
+    while candidate in used_identifiers:
+        count += 1
+        candidate = f"{identifier}-{count}"
+    used_identifiers.add(candidate)
+    return candidate
+
+class PandocHeadingIds(Treeprocessor):
+    # Runs before the toc extension, which keeps ids that are already set and only builds its heading list from them
+    def run(self, root):
+        used_identifiers = {element.get('id') for element in root.iter() if element.get('id')}
+        for element in root.iter():
+            if element.tag in HEADING_TAGS and 'id' not in element.attrib:
+                text = html.unescape(strip_tags(render_inner_html(element, self.md)))
+                element.set('id', unique_identifier(pandoc_identifier(text), used_identifiers))
+
+def get_renderer():
+    renderer = getattr(_renderers, 'markdown', None)
+    if renderer is None:
+        renderer = markdown.Markdown(extensions=['toc', 'fenced_code', 'tables'], output_format='html',
+                                     extension_configs={'toc': {'toc_depth': 6, 'marker': ''}}) # Every level; the ToC depth is applied on assembly
+        renderer.treeprocessors.register(PandocHeadingIds(renderer), 'pandoc_heading_ids', 6) # Priority 6: after inline, before toc (5)
+        _renderers.markdown = renderer
+    return renderer
+
+def flatten_toc_tokens(tokens):
+    flat = []
+    for token in tokens:
+        flat.append({'level': token['level'], 'id': token['id'], 'text': html.unescape(token['name']), 'html': token['html']})
+        flat.extend(flatten_toc_tokens(token['children']))
+    return flat
+
+def render_page(page_text):
+    # Returns (HTML fragment, [{'level', 'id', 'text', 'html'}] of its headings in document order)
+    renderer = get_renderer().reset()
+    fragment = renderer.convert(page_text)
+    return fragment, flatten_toc_tokens(renderer.toc_tokens)
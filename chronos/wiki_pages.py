@@ -0,0 +1,217 @@
+"""
+File Name: wiki_pages.py
+
+Purpose: Incremental wiki build. Every page is converted on its own and cached by its content hash and a
+fingerprint of the renderer, so editing one page re-converts that page only; the document is assembled from the
+cached fragments.
+
+**Functionality:**
+
+* Pages are rendered with pandoc ('pandoc --from markdown --to html5', one process per page) or in-process with
+  `wiki_markdown.render_page()`. The renderer fingerprint is the pandoc version, or the Python-Markdown version
+  and `RENDERER_VERSION`, so an upgraded renderer never serves old fragments.
+* With jobs > 1 the pages that are not cached are converted in parallel: pandoc pages from a thread pool (each
+  page is already its own pandoc process), Markdown pages in a process pool (the engine is pure Python). The pool
+  starts its workers with 'spawn', because the export may run in a worker thread ('python -m chronos') and forking
+  a threaded process can copy a lock that another thread holds.
+* Every cache entry holds the page's HTML fragment and its metadata: the headings (level, id, text, inner HTML)
+  and every other id in the fragment.
+* `assemble_document()` gives the headings pandoc's identifiers across the whole document ('overview',
+  'overview-1', ...), numbers pandoc's code blocks ('cb1', 'cb1-1' for its lines) and footnotes ('fn1', 'fnref1')
+  on through the document, moves every page's footnotes into one section at the end, renames any other colliding
+  id and the links to it, and builds the table of contents from the heading metadata, down to `toc_depth`. No
+  page is re-parsed.
+* The body then matches 'pandoc --standalone --toc' on the whole wiki, up to line wrapping, except where
+  converting pages on their own is the point: reference-style link definitions and footnote labels do not carry
+  over from one page to the next, and '#anchor' links follow the heading of their own page when it was renamed
+  ('intro' -> 'intro-1'), where pandoc points them at the first heading of the document with that id.
+  tests/test_wiki_pages.py checks this against pandoc. The head is a minimal template without pandoc's CSS.
+* Entries live in ~/.cache/chronos/wiki_pages (CHRONOS_CACHE_DIR moves it) and are pruned like code segments.
+
+**Instructions:**
+
+1. `write_wiki_pages(file_list, 'wiki.html', local_wiki_directory, 'pandoc', 'Choronos-HoM Wiki', 4, reader=snapshot)`
+2. Or run 'convert_wiki-to-pdf.py --incremental [--engine markdown] [--jobs N]'.
+
+Author: Beau Magnum
+
+Date: 2026-10-18
+
+"""
+import hashlib
+import html
+import json
+import multiprocessing
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+import markdown
+from markdown.extensions.toc import nest_toc_tokens, strip_tags
+from chronos.code_chunks import git_blob_sha # The same key for snapshot and working-tree reads
+from chronos.git_snapshot import WorkingTree
+from chronos.segment_cache import SegmentCache, get_cache_root
+from chronos.wiki_markdown import RENDERER_VERSION, pandoc_identifier, render_page, unique_identifier
+from Utilities.subprocess_runner import run_command # Timeouts and the CHRONOS_RUN_DEADLINE budget for pandoc
+
+PAGE_FORMAT_VERSION = 2 # Bump when the cached metadata or the assembly changes
+PANDOC_PAGE_TIMEOUT_SECONDS = 300 # The conversion of a single page is abandoned after this long
+PANDOC_VERSION_TIMEOUT_SECONDS = 30
+
+HEADING_PATTERN = re.compile(r'<h([1-6])\b[^>]*?\bid="([^"]*)"[^>]*>(.*?)</h\1>', re.DOTALL)
+ID_PATTERN = re.compile(r'\bid="([^"]*)"')
+ID_REFERENCE_PATTERN = re.compile(r'\b(id="|href="#)([^"]*)"')
+LINK_TAG_PATTERN = re.compile(r'</?a\b[^>]*>')
+CODE_BLOCK_ID_PATTERN = re.compile(r'cb(\d+)(-\d+)?') # pandoc's code blocks and their line anchors ('cb2-14')
+FOOTNOTE_ID_PATTERN = re.compile(r'(fn|fnref)(\d+)')
+FOOTNOTE_LABEL_PATTERN = re.compile(r'(<a href="#fn(\d+)" class="footnote-ref"[^>]*><sup>)\d+(</sup>)')
+FOOTNOTE_SECTION_PATTERN = re.compile(r'\s*<section id="footnotes" class="footnotes footnotes-end-of-document"\s+role="doc-endnotes">'
+                                      r'\s*<hr />\s*<ol>\s*(.*?)\s*</ol>\s*</section>', re.DOTALL)
+FOOTNOTE_SECTION = '<section id="footnotes" class="footnotes footnotes-end-of-document"\nrole="doc-endnotes">\n<hr />\n<ol>\n{items}\n</ol>\n</section>'
+
+DOCUMENT_TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+  <meta charset="utf-8" />
+  <meta name="generator" content="chronos" />
+  <meta name="viewport" content="width=device-width, initial-scale=1.0, user-scalable=yes" />
+  <title>{title}</title>
+</head>
+<body>
+<header id="title-block-header">
+<h1 class="title">{title}</h1>
+</header>
+{toc}
+{body}
+</body>
+</html>
+"""
+
+def engine_fingerprint(engine):
+    if engine == 'markdown':
+        return f"markdown {markdown.__version__} renderer {RENDERER_VERSION}"
+    result = run_command(["pandoc", "--version"], stage="pandoc --version", timeout=PANDOC_VERSION_TIMEOUT_SECONDS,
+                         capture_output=True, text=True, check=True)
+    return result.stdout.splitlines()[0] # e.g. 'pandoc 3.1.9'
+
+def page_cache_key(fingerprint, blob_sha):
+    return hashlib.sha256(f"{PAGE_FORMAT_VERSION}\0{fingerprint}\0{blob_sha}".encode()).hexdigest()
+
+def render_page_pandoc(page_text):
+    result = run_command(["pandoc", "--from", "markdown", "--to", "html5"], stage="pandoc (page)", timeout=PANDOC_PAGE_TIMEOUT_SECONDS,
+                         input=page_text, capture_output=True, text=True, check=True)
+    headings = [{'level': int(level), 'id': identifier, 'text': html.unescape(strip_tags(inner)), 'html': inner}
+                for level, identifier, inner in HEADING_PATTERN.findall(result.stdout)]
+    return result.stdout, headings
+
+def page_metadata(fragment, headings):
+    # 'auto' marks the headings whose id pandoc derived from the text; explicit ids ('# Setup {#install}') are kept
+    local_identifiers = set()
+    for heading in headings:
+        heading['auto'] = unique_identifier(pandoc_identifier(heading['text']), local_identifiers) == heading['id']
+        local_identifiers.add(heading['id'])
+    return {'headings': headings, 'ids': ID_PATTERN.findall(fragment)}
+
+def render_wiki_page(engine, page_text):
+    # Returns (HTML fragment, metadata) of one page
+    fragment, headings = render_page(page_text) if engine == 'markdown' else render_page_pandoc(page_text)
+    return fragment.strip('\n'), page_metadata(fragment, headings)
+
+def convert_pages(engine, page_texts, jobs=1):
+    # Returns [(fragment, metadata)] in the order of page_texts
+    if jobs <= 1 or len(page_texts) <= 1:
+        return [render_wiki_page(engine, page_text) for page_text in page_texts]
+    if engine == 'markdown':
+        executor = ProcessPoolExecutor(max_workers=jobs, mp_context=multiprocessing.get_context('spawn')) # Never fork from a worker thread
+    else:
+        executor = ThreadPoolExecutor(max_workers=jobs) # Threads only wait on the pandoc processes
+    with executor:
+        return list(executor.map(partial(render_wiki_page, engine), page_texts, chunksize=max(1, len(page_texts) // (jobs * 4))))
+
+def rename_identifiers(fragment, renamed):
+    renamed = {old: new for old, new in renamed.items() if old != new}
+    if not renamed:
+        return fragment # The common case: no id of this page is used by an earlier page
+    return ID_REFERENCE_PATTERN.sub(lambda match: f'{match.group(1)}{renamed.get(match.group(2), match.group(2))}"', fragment)
+
+def toc_list(tokens):
+    # Nested <ul> in pandoc's layout: every entry links to its heading and carries a 'toc-' id of its own
+    items = []
+    for token in tokens:
+        children = '\n' + toc_list(token['children']) if token['children'] else ''
+        label = LINK_TAG_PATTERN.sub('', token['html']) # A link inside the ToC link would be invalid HTML
+        items.append(f'<li><a href="#{token["id"]}" id="toc-{token["id"]}">{label}</a>{children}</li>')
+    return '<ul>\n' + '\n'.join(items) + '\n</ul>'
+
+def number_on(identifier, code_blocks, footnotes):
+    # Returns (the id numbered on from the earlier pages, or None, code block number, footnote number)
+    code_block = CODE_BLOCK_ID_PATTERN.fullmatch(identifier)
+    if code_block:
+        number = int(code_block.group(1))
+        return f"cb{number + code_blocks}{code_block.group(2) or ''}", number, 0
+    footnote = FOOTNOTE_ID_PATTERN.fullmatch(identifier)
+    if footnote:
+        number = int(footnote.group(2))
+        return f"{footnote.group(1)}{number + footnotes}", 0, number
+    return None, 0, 0
+
+def assemble_document(pages, title, toc_depth):
+    # pages: [(fragment, metadata)] in sidebar order; returns the standalone HTML5 document
+    used_identifiers, bodies, toc_headings, footnote_items = set(), [], [], []
+    code_blocks = footnotes = 0 # Numbers used by the earlier pages
+    for fragment, metadata in pages:
+        renamed, page_code_blocks, page_footnotes = {}, 0, 0
+        for heading in metadata['headings']:
+            identifier = pandoc_identifier(heading['text']) if heading['auto'] else heading['id']
+            renamed[heading['id']] = unique_identifier(identifier, used_identifiers)
+            if heading['level'] <= toc_depth:
+                toc_headings.append({'level': heading['level'], 'id': renamed[heading['id']], 'html': heading['html']})
+        for identifier in metadata['ids']:
+            if identifier in renamed or identifier == 'footnotes': # The page's footnotes section is merged into the document's
+                continue
+            numbered, code_block, footnote = number_on(identifier, code_blocks, footnotes)
+            page_code_blocks, page_footnotes = max(page_code_blocks, code_block), max(page_footnotes, footnote)
+            renamed[identifier] = numbered or unique_identifier(identifier, used_identifiers)
+            used_identifiers.add(renamed[identifier])
+        code_blocks, footnotes = code_blocks + page_code_blocks, footnotes + page_footnotes
+        fragment = rename_identifiers(fragment, renamed)
+        if page_footnotes:
+            fragment = FOOTNOTE_LABEL_PATTERN.sub(lambda match: f'{match.group(1)}{match.group(2)}{match.group(3)}', fragment)
+            section = FOOTNOTE_SECTION_PATTERN.search(fragment)
+            if section:
+                footnote_items.append(section.group(1))
+                fragment = fragment[:section.start()] + fragment[section.end():]
+        if fragment:
+            bodies.append(fragment)
+    if footnote_items:
+        bodies.append(FOOTNOTE_SECTION.format(items='\n'.join(footnote_items)))
+    toc = f'<nav id="TOC" role="doc-toc">\n{toc_list(nest_toc_tokens(toc_headings))}\n</nav>' if toc_headings else ''
+    return DOCUMENT_TEMPLATE.format(title=html.escape(title), toc=toc, body='\n'.join(bodies))
+
+def write_wiki_pages(file_list, output_path, local_wiki_directory, engine, title, toc_depth, reader=None, page_cache=None,
+                     cache_pages=True, jobs=1):
+    # Returns (pages rendered, pages reused from the page cache); cache_pages=False renders every page without the cache
+    reader = reader or WorkingTree(local_wiki_directory)
+    if cache_pages:
+        page_cache = page_cache or SegmentCache(os.path.join(get_cache_root(), 'wiki_pages'))
+    fingerprint = engine_fingerprint(engine) if page_cache else None
+    pages, misses = [None] * len(file_list), [] # misses: (position, cache key, page text)
+    for position, file_name in enumerate(file_list):
+        content = reader.read(file_name)[0]
+        key = page_cache_key(fingerprint, git_blob_sha(content)) if page_cache else None
+        cached = page_cache.load(key) if page_cache else None
+        if cached is None:
+            misses.append((position, key, content.decode('utf-8', errors='replace')))
+        else:
+            pages[position] = (cached[0].decode(), json.loads(cached[1]))
+
+    for (position, key, _), (fragment, metadata) in zip(misses, convert_pages(engine, [page_text for _, _, page_text in misses], jobs)):
+        pages[position] = (fragment, metadata)
+        if page_cache:
+            page_cache.store(key, [fragment.encode(), json.dumps(metadata).encode()])
+
+    with open(output_path, 'w', encoding='utf-8') as output:
+        output.write(assemble_document(pages, title, toc_depth))
+    if page_cache:
+        page_cache.prune()
+    return len(misses), len(file_list) - len(misses)
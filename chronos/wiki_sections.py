@@ -0,0 +1,126 @@
+"""
+File Name: wiki_sections.py
+
+Purpose: Exports the wiki as retrieval-ready JSONL: one record per section instead of one HTML file with every
+page glued together. Pages are cut at their headings, down to the same depth as the HTML table of contents.
+
+**Functionality:**
+
+* Every record carries page (the wiki page name), heading_path (the headings from the page's top section down to
+  this one), level, anchor (the GitHub wiki link fragment of the heading, or None for the text before the
+  first heading) and text.
+* Headings deeper than the depth limit, and '#' lines inside fenced code blocks, stay part of their section.
+* One streaming pass over the pages in `_Sidebar.md` order; the sections of every page are cached by its blob SHA,
+  so a refresh only re-splits the pages that changed.
+
+**Instructions:**
+
+1. `write_wiki_sections(file_list, 'wiki.sections.jsonl', local_wiki_directory, max_depth=4, reader=snapshot)`
+2. Or run 'convert_wiki-to-pdf.py --format jsonl'.
+
+Author: Beau Magnum
+
+Date: 2026-10-18
+
+"""
+import hashlib
+import json
+import os
+import re
+from chronos.git_snapshot import WorkingTree
+from chronos.segment_cache import SegmentCache, get_cache_root
+
+SECTION_FORMAT_VERSION = 2 # Bump when split_page changes its output, so cached sections are not reused
+
+ATX_HEADING = re.compile(r'^ {0,3}(#{1,6})(?:[ \t]+(.*?))?(?:[ \t]+#+)?[ \t]*$')
+SETEXT_UNDERLINE = re.compile(r'^ {0,3}(=+|-+)[ \t]*$')
+FENCE = re.compile(r'^ {0,3}(`{3,}|~{3,})')
+
+def sections_path(output_path):
+    return os.path.splitext(output_path)[0] + '.sections.jsonl'
+
+def github_anchor(heading, used_anchors):
+    # GitHub's rule: lowercase, drop punctuation except '-' and '_', spaces to '-', '-1', '-2'... for repeats
+    anchor = re.sub(r'[^\w\- ]', '', heading.strip().lower()).replace(' ', '-')
+    count = used_anchors.get(anchor, 0)
+    used_anchors[anchor] = count + 1
+    return anchor if count == 0 else f"{anchor}-{count}"
+
+def heading_at(lines, index):
+    # Returns (level, heading text, lines used) if a heading starts at lines[index], else None
+    atx_match = ATX_HEADING.match(lines[index])
+    if atx_match:
+        return len(atx_match.group(1)), (atx_match.group(2) or '').strip(), 1
+    next_line = lines[index + 1] if index + 1 < len(lines) else ''
+    underline = SETEXT_UNDERLINE.match(next_line)
+    starts_paragraph = index == 0 or not lines[index - 1].strip()
+    if underline and lines[index].strip() and starts_paragraph: # 'Title' over '====' or '----'
+        return (1 if underline.group(1)[0] == '=' else 2), lines[index].strip(), 2
+    return None
+
+def split_page(page, text, max_depth):
+    sections = []
+    open_headings = [] # (level, heading) of the current section and its parents
+    anchor, body = None, []
+    used_anchors = {}
+    fence = None
+    lines = text.splitlines()
+
+    def close_section():
+        section_text = '\n'.join(body).strip('\n')
+        if section_text.strip() or open_headings:
+            sections.append({'page': page, 'heading_path': [heading for _, heading in open_headings],
+                             'level': open_headings[-1][0] if open_headings else 0, 'anchor': anchor, 'text': section_text})
+
+    index = 0
+    while index < len(lines):
+        line = lines[index]
+        fence_match = FENCE.match(line)
+        if fence_match: # '#' lines inside fenced code are code, not headings
+            marker = fence_match.group(1)
+            if fence is None:
+                fence = marker
+            elif marker[0] == fence[0] and len(marker) >= len(fence):
+                fence = None
+        heading = heading_at(lines, index) if fence is None and not fence_match else None
+        if heading is not None and heading[0] > max_depth:
+            github_anchor(heading[1], used_anchors) # Not a section of its own, but GitHub counts its anchor for the '-N' suffixes
+        if heading is None or heading[0] > max_depth:
+            body.append(line)
+            index += 1
+            continue
+
+        level, heading_text, used_lines = heading
+        close_section()
+        while open_headings and open_headings[-1][0] >= level:
+            open_headings.pop()
+        open_headings.append((level, heading_text))
+        anchor, body = github_anchor(heading_text, used_anchors), []
+        index += used_lines
+    close_section()
+    return sections
+
+def section_cache_key(page, blob_sha, max_depth):
+    return hashlib.sha256(f"{SECTION_FORMAT_VERSION}\0{max_depth}\0{page}\0{blob_sha}".encode()).hexdigest()
+
+def write_wiki_sections(file_list, output_path, local_wiki_directory, max_depth, reader=None, section_cache=None):
+    # Returns (pages split, pages reused from the section cache)
+    reader = reader or WorkingTree(local_wiki_directory)
+    section_cache = section_cache or SegmentCache(os.path.join(get_cache_root(), 'wiki_sections'))
+    split = reused = 0
+    with open(output_path, 'w', encoding='utf-8') as corpus:
+        for file_name in file_list: # One page in memory at a time
+            page = os.path.splitext(file_name)[0]
+            content, blob_sha = reader.read(file_name)
+            key = section_cache_key(page, blob_sha, max_depth)
+            records = section_cache.load(key)
+            if records is None:
+                records = [json.dumps(section).encode() for section in split_page(page, content.decode('utf-8', errors='replace'), max_depth)]
+                section_cache.store(key, records)
+                split += 1
+            else:
+                reused += 1
+            for record in records:
+                corpus.write(record.decode() + '\n')
+    section_cache.prune()
+    return split, reused
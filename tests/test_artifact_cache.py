@@ -0,0 +1,62 @@
+"""
+File Name: test_artifact_cache.py
+
+Purpose: Checks that the artifact cache keys outputs by everything that went into them: the git tree, the build
+options and, for '--working-tree' builds, untracked listed inputs.
+
+**Instructions:**
+
+1. From the repository root: `python -m pytest -q tests`
+
+Author: Beau Magnum
+
+Date: 2026-10-18
+
+"""
+import os
+import subprocess
+import pytest
+from chronos.artifact_cache import ArtifactCache, get_tree_sha, key_untracked_inputs
+
+def git(repository, *arguments):
+    subprocess.run(["git", "-c", "user.name=test", "-c", "user.email=test@example.com", *arguments], cwd=repository,
+                   check=True, capture_output=True)
+
+@pytest.fixture
+def repository(tmp_path):
+    (tmp_path / 'tracked.py').write_text("pass\n")
+    git(tmp_path, "init", "-q")
+    git(tmp_path, "add", "tracked.py")
+    git(tmp_path, "commit", "-q", "-m", "initial")
+    return tmp_path
+
+def test_untracked_listed_inputs_change_the_key(repository):
+    tree_sha = get_tree_sha(str(repository))
+    assert tree_sha
+    assert key_untracked_inputs(str(repository), tree_sha, ['tracked.py']) == tree_sha
+    (repository / 'new.py').write_text("x = 1\n")
+    first = key_untracked_inputs(str(repository), tree_sha, ['tracked.py', 'new.py'])
+    (repository / 'new.py').write_text("x = 2\n")
+    second = key_untracked_inputs(str(repository), tree_sha, ['tracked.py', './new.py'])
+    assert len({tree_sha, first, second}) == 3
+    assert key_untracked_inputs(str(repository), None, ['new.py']) is None # Local edits: never cached
+
+def test_restore_matches_tree_and_options(tmp_path):
+    cache = ArtifactCache('test', cache_directory=str(tmp_path / 'cache'))
+    artifact = tmp_path / 'output.pdf'
+    artifact.write_bytes(b'%PDF-1.4 one')
+    cache.store('tree', {'backend': 'stream'}, str(artifact))
+    destination = tmp_path / 'restored.pdf'
+    assert not cache.restore('tree', {'backend': 'platypus'}, str(destination))
+    assert not cache.restore('other tree', {'backend': 'stream'}, str(destination))
+    assert cache.restore('tree', {'backend': 'stream'}, str(destination))
+    assert destination.read_bytes() == b'%PDF-1.4 one'
+
+def test_least_recently_used_artifacts_are_evicted(tmp_path):
+    cache = ArtifactCache('test', cache_directory=str(tmp_path / 'cache'), max_bytes=15)
+    artifact = tmp_path / 'output.pdf'
+    artifact.write_bytes(b'0123456789')
+    cache.store('first', {}, str(artifact))
+    os.utime(cache._path(cache._key('first', {})), (1, 1)) # Last used long ago
+    cache.store('second', {}, str(artifact))
+    assert [entry['tree'] for entry in cache.entries()] == ['second']
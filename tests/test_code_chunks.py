@@ -0,0 +1,66 @@
+"""
+File Name: test_code_chunks.py
+
+Purpose: Checks that code is chunked at function and class boundaries (Python) or blank lines outside braces
+(everything else), and that the chunks cover every non-blank line exactly once.
+
+**Instructions:**
+
+1. From the repository root: `python -m pytest -q tests`
+
+Author: Beau Magnum
+
+Date: 2026-10-18
+
+"""
+from chronos.code_chunks import chunk_file, chunk_files
+
+PYTHON = '''import os
+
+@decorated
+def load():
+    return os.environ
+
+class Store:
+    def get(self):
+        return 1
+
+VALUE = load()
+'''
+
+C = '''int first(void) {
+    int a = 1;
+
+    return a;
+}
+
+int second(void) {
+    return 2;
+}
+'''
+
+def covered_lines(chunks):
+    return [line for chunk in chunks for line in range(chunk['start_line'], chunk['end_line'] + 1)]
+
+def test_python_is_chunked_at_functions_and_classes():
+    chunks = chunk_file('store.py', PYTHON)
+    assert [(chunk['kind'], chunk['name']) for chunk in chunks if chunk['kind'] != 'module'] == [('function', 'load'), ('class', 'Store')]
+    function = next(chunk for chunk in chunks if chunk['name'] == 'load')
+    assert function['start_line'] == 3 and function['text'].startswith('@decorated') # Decorators belong to their function
+    assert 'VALUE = load()' in chunks[-1]['text']
+
+def test_invalid_python_falls_back_to_blocks():
+    assert chunk_file('broken.py', "def broken(:\n    pass\n")[0]['kind'] == 'block'
+
+def test_blank_lines_inside_braces_do_not_end_a_block():
+    chunks = chunk_file('main.c', C)
+    assert len(chunks) == 1 # Small blocks are merged up to TARGET_CHUNK_TOKENS
+    assert chunks[0]['start_line'] == 1 and chunks[0]['end_line'] == 9
+
+def test_serial_and_parallel_chunking_agree():
+    files = [('store.py', PYTHON), ('main.c', C)]
+    serial = chunk_files(files, jobs=1)
+    assert chunk_files(files, jobs=2) == serial
+    for (_, text), chunks in zip(files, serial):
+        non_blank = [number for number, line in enumerate(text.splitlines(), start=1) if line.strip()]
+        assert [line for line in covered_lines(chunks) if line in non_blank] == non_blank
@@ -0,0 +1,38 @@
+"""
+File Name: test_codebase_options.py
+
+Purpose: Checks that every codebase backend either honours '--incremental', '--jobs' and '--shard-tokens' or
+rejects them, instead of silently ignoring them.
+
+**Instructions:**
+
+1. From the repository root: `python -m pytest -q tests`
+
+Author: Beau Magnum
+
+Date: 2026-10-18
+
+"""
+import pytest
+from chronos.codebase_converter import CodebaseOptions
+
+@pytest.mark.parametrize('backend', ['platypus', 'markdown', 'text', 'jsonl'])
+@pytest.mark.parametrize('option', [{'incremental': True}, {'shard_tokens': 1000}])
+def test_only_the_stream_backend_takes_the_layout_options(backend, option):
+    with pytest.raises(ValueError, match=backend):
+        CodebaseOptions(backend=backend, **option)
+    assert CodebaseOptions(backend='stream', **option).backend == 'stream'
+
+@pytest.mark.parametrize('backend', ['platypus', 'markdown', 'text'])
+def test_jobs_are_rejected_where_nothing_runs_in_parallel(backend):
+    with pytest.raises(ValueError, match='--jobs'):
+        CodebaseOptions(backend=backend, jobs=4)
+    assert CodebaseOptions(backend=backend, jobs=1).jobs == 1
+
+def test_jsonl_chunks_in_workers():
+    assert CodebaseOptions(backend='jsonl', jobs=4).jobs == 4
+
+def test_stream_only_options_select_the_stream_backend(capsys):
+    assert CodebaseOptions().backend == 'platypus'
+    assert CodebaseOptions(jobs=4).backend == 'stream'
+    assert "'stream' backend instead of 'platypus'" in capsys.readouterr().out
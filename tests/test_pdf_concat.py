@@ -0,0 +1,49 @@
+"""
+File Name: test_pdf_concat.py
+
+Purpose: Checks that merging per-file PDFs keeps every page in order, numbers the pages across the whole output
+and points one bookmark at the first page of every section.
+
+**Instructions:**
+
+1. From the repository root: `python -m pytest -q tests`
+
+Author: Beau Magnum
+
+Date: 2026-10-18
+
+"""
+import re
+import zlib
+from chronos.pdf_concat import PdfPartReader, concatenate_pdfs, read_page_streams
+from chronos.pdf_stream_writer import StreamingPdfWriter
+
+def write_part(path, page_texts):
+    with StreamingPdfWriter(str(path), number_pages=False) as writer:
+        for text in page_texts:
+            writer.add_page(b'BT (%s) Tj ET' % text)
+    return str(path)
+
+def decoded(streams):
+    return [zlib.decompress(stream) if compressed else stream for stream, compressed in streams]
+
+def test_pages_keep_their_order_and_are_numbered_across_parts(tmp_path):
+    first = write_part(tmp_path / 'first.pdf', [b'one', b'two'])
+    second = write_part(tmp_path / 'second.pdf', [b'three'])
+    output = str(tmp_path / 'merged.pdf')
+    assert concatenate_pdfs([(first, 'first.py'), (second, 'second.py')], output) == 3
+    pages = [decoded(streams) for streams in read_page_streams(output)]
+    assert [page[0] for page in pages] == [b'BT (one) Tj ET', b'BT (two) Tj ET', b'BT (three) Tj ET']
+    assert [re.search(rb'\(Page (\d+)\)', page[1]).group(1) for page in pages] == [b'1', b'2', b'3']
+
+def test_bookmarks_point_at_the_first_page_of_each_section(tmp_path):
+    first = write_part(tmp_path / 'first.pdf', [b'one', b'two'])
+    second = write_part(tmp_path / 'second.pdf', [b'three'])
+    output = str(tmp_path / 'merged.pdf')
+    concatenate_pdfs([(first, 'first.py'), (second, 'second.py')], output)
+    reader = PdfPartReader(output)
+    pages_id = int(re.search(rb'/Pages (\d+) 0 R', reader.data).group(1))
+    page_ids = re.findall(rb'(\d+) 0 R', re.search(rb'/Kids \[([^\]]*)\]', reader._object(pages_id)[0]).group(1))
+    bookmarks = [(bytes.fromhex(title.decode()).decode('utf-16'), page_id) # Titles are UTF-16 hex strings
+                 for title, page_id in re.findall(rb'/Title <([0-9A-F]+)>.*?/Dest \[(\d+) 0 R', reader.data)]
+    assert bookmarks == [('first.py', page_ids[0]), ('second.py', page_ids[2])]
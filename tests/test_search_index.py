@@ -0,0 +1,61 @@
+"""
+File Name: test_search_index.py
+
+Purpose: Checks the BM25 ranking of the local search index and that updates only re-index what changed.
+
+**Instructions:**
+
+1. From the repository root: `python -m pytest -q tests`
+
+Author: Beau Magnum
+
+Date: 2026-10-18
+
+"""
+import sqlite3
+from chronos.git_snapshot import WorkingTree
+from chronos.search_index import SearchIndex, STORED_VERSION, code_documents, tokenize
+
+def whole_file(path, text):
+    return [(path, text)]
+
+def write(directory, files):
+    for path, text in files.items():
+        (directory / path).write_text(text)
+
+def test_identifiers_are_indexed_by_their_parts():
+    assert tokenize("get_tree_sha loadAllStructures") == ['get_tree_sha', 'get', 'tree', 'sha', 'loadallstructures', 'load', 'all', 'structures']
+
+def test_query_ranks_the_denser_document_first(tmp_path):
+    write(tmp_path, {'cache.md': "eviction eviction cache", 'notes.md': "eviction of a long list of unrelated words here",
+                     'other.md': "nothing relevant"})
+    with SearchIndex(str(tmp_path / 'index.sqlite')) as index:
+        index.update('wiki', WorkingTree(str(tmp_path)), ['cache.md', 'notes.md', 'other.md'], whole_file)
+        assert [result[2] for result in index.query("eviction")] == ['cache.md', 'notes.md']
+        assert index.query("absent") == []
+
+def test_update_reindexes_changed_files_and_drops_unlisted_ones(tmp_path):
+    write(tmp_path, {'a.md': "alpha", 'b.md': "beta"})
+    reader = WorkingTree(str(tmp_path))
+    with SearchIndex(str(tmp_path / 'index.sqlite')) as index:
+        assert index.update('wiki', reader, ['a.md', 'b.md', 'gone.md'], whole_file) == (2, 0, 0, ['gone.md'])
+        write(tmp_path, {'a.md': "gamma"})
+        assert index.update('wiki', reader, ['a.md'], whole_file) == (1, 0, 1, [])
+        assert index.update('wiki', reader, ['a.md'], whole_file) == (0, 1, 0, [])
+        assert [result[2] for result in index.query("gamma")] == ['a.md']
+        assert index.query("alpha beta") == []
+
+def test_a_different_stored_version_clears_the_index(tmp_path):
+    write(tmp_path, {'a.md': "alpha"})
+    index_path = str(tmp_path / 'index.sqlite')
+    with SearchIndex(index_path) as index:
+        index.update('wiki', WorkingTree(str(tmp_path)), ['a.md'], whole_file)
+    with sqlite3.connect(index_path) as connection: # As if the chunking or sectioning rules had changed since
+        connection.execute("UPDATE meta SET value = '0.0.0' WHERE key = 'version'")
+    with SearchIndex(index_path) as index:
+        assert index.query("alpha") == []
+        assert index.connection.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()[0] == STORED_VERSION
+
+def test_code_documents_point_at_line_ranges():
+    documents = code_documents('a.py', "def first():\n    return 1\n")
+    assert documents[0][0].startswith('lines 1-')
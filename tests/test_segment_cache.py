@@ -0,0 +1,63 @@
+"""
+File Name: test_segment_cache.py
+
+Purpose: Checks that the codebase segment cache only serves complete entries and that `prune()` removes stale
+entries without touching files another run is still writing.
+
+**Instructions:**
+
+1. From the repository root: `python -m pytest -q tests`
+
+Author: Beau Magnum
+
+Date: 2026-10-18
+
+"""
+import os
+import time
+from chronos.segment_cache import SegmentCache
+
+KEY = 'ab' + '0' * 62
+PAGES = [b'BT (page one) Tj ET', b'', b'BT (page three) Tj ET']
+
+def test_store_and_load_round_trip(tmp_path):
+    cache = SegmentCache(str(tmp_path))
+    assert cache.load(KEY) is None
+    cache.store(KEY, PAGES)
+    assert cache.load(KEY) == PAGES
+    assert (cache.hits, cache.misses) == (1, 1)
+
+def test_truncated_or_overlong_entries_are_misses(tmp_path):
+    cache = SegmentCache(str(tmp_path))
+    cache.store(KEY, PAGES)
+    path = cache._path(KEY)
+    with open(path, 'rb') as file:
+        content = file.read()
+    for damaged in (content[:-1], content + b'x', b'not json\n' + content):
+        with open(path, 'wb') as file:
+            file.write(damaged)
+        assert cache.load(KEY) is None
+
+def test_prune_removes_old_entries_and_keeps_temporary_files(tmp_path):
+    cache = SegmentCache(str(tmp_path))
+    cache.store(KEY, PAGES)
+    old = time.time() - 10 * 86400
+    os.utime(cache._path(KEY), (old, old))
+    temporary_path = os.path.join(os.path.dirname(cache._path(KEY)), 'writing.tmp')
+    with open(temporary_path, 'wb') as file:
+        file.write(b'partial')
+    os.utime(temporary_path, (old, old))
+    cache.prune(max_age_days=30)
+    assert cache.load(KEY) == PAGES
+    os.utime(cache._path(KEY), (old, old))
+    cache.prune(max_age_days=1)
+    assert not os.path.exists(cache._path(KEY))
+    assert os.path.exists(temporary_path)
+
+def test_prune_with_zero_days_empties_the_cache(tmp_path, monkeypatch):
+    monkeypatch.setenv('CHRONOS_SEGMENT_CACHE_MAX_AGE_DAYS', '365')
+    cache = SegmentCache(str(tmp_path))
+    cache.store(KEY, PAGES)
+    os.utime(cache._path(KEY), (time.time() - 1, time.time() - 1))
+    cache.prune(max_age_days=0)
+    assert cache.load(KEY) is None
@@ -0,0 +1,49 @@
+"""
+File Name: test_sharding.py
+
+Purpose: Checks that the shard planner keeps codeBase-list.md order, stays within the token budget and balances
+the requested number of shards.
+
+**Instructions:**
+
+1. From the repository root: `python -m pytest -q tests`
+
+Author: Beau Magnum
+
+Date: 2026-10-18
+
+"""
+from chronos.sharding import ShardPiece, plan_shards, split_file
+
+def pieces(*tokens):
+    return [ShardPiece(f"file{index}.py", count) for index, count in enumerate(tokens)]
+
+def flatten(shards):
+    return [piece for shard in shards for piece in shard]
+
+def test_shards_stay_within_the_budget_and_keep_the_order():
+    listed = pieces(40, 30, 50, 20, 60)
+    shards = plan_shards(listed, token_budget=100)
+    assert flatten(shards) == listed
+    assert all(sum(piece.tokens for piece in shard) <= 100 for shard in shards)
+    assert len(shards) == 3
+
+def test_requested_shard_count_is_balanced():
+    shards = plan_shards(pieces(10, 10, 10, 10, 10, 10), token_budget=1000, shard_count=3)
+    assert [sum(piece.tokens for piece in shard) for shard in shards] == [20, 20, 20]
+
+def test_more_shards_than_pieces_gives_one_piece_per_shard():
+    listed = pieces(10, 20)
+    assert plan_shards(listed, token_budget=1000, shard_count=5) == [[listed[0]], [listed[1]]]
+    assert plan_shards([], token_budget=1000) == [[]]
+
+def test_a_piece_over_the_budget_gets_a_shard_of_its_own():
+    listed = pieces(10, 500, 10)
+    assert plan_shards(listed, token_budget=100) == [[listed[0]], [listed[1]], [listed[2]]]
+
+def test_split_file_cuts_at_lines_within_the_budget():
+    text = ''.join(f"line {number:04d}\n" for number in range(1, 101)) # 10 characters per line
+    assert split_file('small.py', 'x = 1\n', 100) == [ShardPiece('small.py', 2)]
+    parts = split_file('big.py', text, token_budget=50) # 20 lines per piece
+    assert [(part.start_line, part.end_line) for part in parts] == [(1, 20), (21, 40), (41, 60), (61, 80), (81, 100)]
+    assert all(part.tokens <= 50 for part in parts)
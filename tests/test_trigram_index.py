@@ -0,0 +1,61 @@
+"""
+File Name: test_trigram_index.py
+
+Purpose: Checks that the trigram prefilter never hides a match the regex finds, and that `search()` reports lines
+the way 'grep -n' would.
+
+**Instructions:**
+
+1. From the repository root: `python -m pytest -q tests`
+
+Author: Beau Magnum
+
+Date: 2026-10-18
+
+"""
+import re
+import pytest
+from chronos.git_snapshot import WorkingTree
+from chronos.trigram_index import TrigramIndex, required_trigrams
+
+FILES = {
+    'a.py': "import os\n\ndef load_all():\n    return os.environ  # ſtr\n",
+    'b.py': "x = 1\r\ny = load_all()\r\n",
+    'c.py': "first\x0csame line\nsecond\n",
+}
+
+@pytest.fixture
+def index(tmp_path):
+    for path, text in FILES.items():
+        (tmp_path / path).write_bytes(text.encode())
+    with TrigramIndex(str(tmp_path / 'trigrams.sqlite')) as trigram_index:
+        trigram_index.index_commit('commit', WorkingTree(str(tmp_path)), list(FILES) + ['deleted.py'])
+        yield trigram_index
+
+def search(index, pattern, flags=0):
+    return list(index.search('commit', pattern, flags))
+
+def test_required_trigrams_come_from_literal_runs():
+    assert required_trigrams(r'load_all\w+\(') == {'loa', 'oad', 'ad_', 'd_a', '_al', 'all'}
+    assert required_trigrams(r'a.b') == set() # No literal run of three characters: every file is searched
+    assert required_trigrams(r'(?:abc)?xyz') == {'xyz'} # An optional group is not required
+
+def test_anchored_patterns_match_every_line(index):
+    assert search(index, r'^def \w+') == [('a.py', 3, 'def load_all():')]
+    assert search(index, r'load_all\(\)$') == [('b.py', 2, 'y = load_all()')]
+
+def test_line_numbers_count_newlines_only(index):
+    assert search(index, 'second') == [('c.py', 2, 'second')]
+
+def test_ignore_case_uses_case_folding(index):
+    assert search(index, 'STR', re.IGNORECASE) == [('a.py', 4, '    return os.environ  # ſtr')]
+    assert search(index, 'STR') == []
+
+def test_matches_spanning_lines_are_reported(index):
+    assert search(index, r'os\n\ndef') == [('a.py', 1, 'os\n\ndef')]
+
+def test_missing_listed_files_are_skipped(tmp_path):
+    (tmp_path / 'a.py').write_text("pass\n")
+    with TrigramIndex(str(tmp_path / 'trigrams.sqlite')) as trigram_index:
+        assert trigram_index.index_commit('commit', WorkingTree(str(tmp_path)), ['a.py', 'gone.py']) == (1, 0, ['gone.py'])
+        assert trigram_index.index_commit('commit', WorkingTree(str(tmp_path)), ['a.py']) == (0, 1, [])